@@ -1,7 +1,8 @@
 import { useState } from "react";
 import apiClient from "../../services/apiClient";
+import { waitForIngestJob } from "../../services/ingestJobService";
 
-const ColumnMapping = ({ data, onSuccess }) => {
+const ColumnMapping = ({ data, onSuccess, onProgress = () => {} }) => {
   const [requiredMapping, setRequiredMapping] = useState({});
   const [optionalMapping, setOptionalMapping] = useState({});
   const [loading, setLoading] = useState(false);
@@ -25,15 +26,18 @@ const ColumnMapping = ({ data, onSuccess }) => {
         },
       );
 
-      onSuccess(response.data.cleaning_report);
+      const report = await waitForIngestJob(response.data.job_id, onProgress);
+
+      onSuccess(report);
     } catch (error) {
       console.error("Mapping Error:", error);
+      onProgress(null);
 
       if (error.response) {
         console.error("Backend Error:", error.response.data);
         alert(error.response.data.message || "Mapping failed");
       } else {
-        alert("Mapping failed");
+        alert(error.message || "Mapping failed");
       }
     } finally {
       setLoading(false);
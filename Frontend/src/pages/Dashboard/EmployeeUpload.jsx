@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import axios from "axios";
 import ColumnMapping from "./ColumnMapping";
+import { waitForIngestJob } from "../../services/ingestJobService";
 import uploadCloud from "../../assets/icons/upload.png";
 import { useNavigate } from "react-router-dom";
 
@@ -13,6 +14,7 @@ const EmployeeUpload = ({ onUploadSuccess = () => {} }) => {
   const [dragActive, setDragActive] = useState(false);
   const [availableCharts, setAvailableCharts] = useState([]);
   const [selectedCharts, setSelectedCharts] = useState([]);
+  const [progress, setProgress] = useState(null);
 
   useEffect(() => {
     if (cleaningReport) {
@@ -45,8 +47,16 @@ const EmployeeUpload = ({ onUploadSuccess = () => {} }) => {
 
       setResponseData(res.data);
 
+      // Identical file was cleaned before: reuse its report
       if (res.data.cleaning_report) {
         setCleaningReport(res.data.cleaning_report);
+      }
+
+      // Saved mapping matched: cleaning runs in the background
+      if (res.data.job_id) {
+        const report = await waitForIngestJob(res.data.job_id, setProgress);
+        setProgress(null);
+        setCleaningReport(report);
 
         if (onUploadSuccess) {
           onUploadSuccess();
@@ -54,7 +64,8 @@ const EmployeeUpload = ({ onUploadSuccess = () => {} }) => {
       }
     } catch (error) {
       console.error(error);
-      alert("Upload failed");
+      setProgress(null);
+      alert(error.response ? "Upload failed" : error.message);
     } finally {
       setLoading(false);
     }
@@ -160,7 +171,9 @@ const EmployeeUpload = ({ onUploadSuccess = () => {} }) => {
       {responseData?.message === "Column mapping required" && (
         <ColumnMapping
           data={responseData}
+          onProgress={setProgress}
           onSuccess={(report) => {
+            setProgress(null);
             setCleaningReport(report);
             setResponseData(null);
             onUploadSuccess();
@@ -169,6 +182,26 @@ const EmployeeUpload = ({ onUploadSuccess = () => {} }) => {
         />
       )}
 
+      {/* Live Cleaning Progress */}
+      {progress?.stage === "queued" && (
+        <div style={{ marginTop: "20px" }}>
+          <h3>Queued</h3>
+          <p>Waiting for a worker to pick up the file...</p>
+        </div>
+      )}
+
+      {progress && progress.stage !== "queued" && (
+        <div style={{ marginTop: "20px" }}>
+          <h3>Processing ({progress.stage})</h3>
+          <p>
+            Rows parsed: {progress.rows_parsed} · Duplicates removed:{" "}
+            {progress.duplicates_removed} · Invalid rows removed:{" "}
+            {progress.invalid_rows_removed} · Rows inserted:{" "}
+            {progress.rows_inserted} · {progress.rows_per_second} rows/s
+          </p>
+        </div>
+      )}
+
       {/* Cleaning Report */}
       {cleaningReport && (
         <div style={{ marginTop: "20px" }}>
@@ -0,0 +1,101 @@
+import apiClient from "./apiClient";
+
+// Parse "event: x\ndata: {...}" blocks out of a text/event-stream chunk
+const parseEvents = (buffer) => {
+  const blocks = buffer.split("\n\n");
+  const rest = blocks.pop();
+
+  const events = blocks
+    .map((block) => {
+      let event = "message";
+      let data = "";
+
+      block.split("\n").forEach((line) => {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        if (line.startsWith("data: ")) data += line.slice(6);
+      });
+
+      return data ? { event, payload: JSON.parse(data) } : null;
+    })
+    .filter(Boolean);
+
+  return { events, rest };
+};
+
+// A job no worker has claimed by then is reported instead of awaited
+const QUEUED_TIMEOUT_MS = 2 * 60 * 1000;
+
+// Each stream lasts up to 15 minutes server-side before it asks for a reconnect
+const MAX_RECONNECTS = 8;
+
+// WAIT FOR A QUEUED INGEST JOB (upload / map-columns return 202 + job_id)
+// Streams live progress over SSE; fetch is used instead of EventSource
+// because the JWT travels in the Authorization header.
+// Resolves with the cleaning report, rejects if the job failed, was never
+// picked up by a worker, or outlived every reconnect.
+export const waitForIngestJob = async (jobId, onProgress = () => {}) => {
+  const queuedDeadline = Date.now() + QUEUED_TIMEOUT_MS;
+  let status = null;
+
+  for (let attempt = 0; attempt <= MAX_RECONNECTS; attempt++) {
+    const response = await fetch(
+      `${apiClient.defaults.baseURL}/employee/jobs/${jobId}/events`,
+      {
+        headers: {
+          Authorization: `Bearer ${localStorage.getItem("token")}`,
+        },
+      },
+    );
+
+    if (!response.ok) {
+      throw new Error("Could not follow cleaning progress");
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const { events, rest } = parseEvents(buffer);
+      buffer = rest;
+
+      for (const { event, payload } of events) {
+        status = payload.status;
+
+        if (status === "queued") {
+          // No worker has claimed the job yet
+          onProgress({ ...payload.progress, stage: "queued" });
+        } else if (payload.progress) {
+          onProgress(payload.progress);
+        }
+
+        if (event === "done") {
+          if (payload.status === "succeeded") {
+            return payload.result;
+          }
+          throw new Error(payload.error || "Cleaning failed");
+        }
+
+        if (event === "deleted") {
+          throw new Error("The uploaded file was deleted");
+        }
+      }
+
+      // Unchanged snapshots arrive as keep-alives, so check on every read
+      if (status === "queued" && Date.now() > queuedDeadline) {
+        await reader.cancel();
+        throw new Error(
+          "Your file is queued, but no worker is available to process it. Please try again later.",
+        );
+      }
+    }
+
+    // Stream timed out server-side: reconnect
+  }
+
+  throw new Error("Cleaning is taking too long. Check the file list later.");
+};
@@ -2,7 +2,7 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 
 from config import Config
-from extensions import db, jwt, migrate
+from extensions import db, jwt, migrate, chart_cache, nlp_cache
 
 # 🔹 Blueprints
 from routes.auth_routes import auth_bp
@@ -10,6 +10,18 @@ from routes.admin_routes import admin_bp
 from routes.company_routes import company_bp
 from routes.employee_routes import employee_bp
 
+# 🔹 CLI Commands
+from services.ingest_worker import ingest_worker_command
+from services.sales_rollup_service import rebuild_sales_rollup_command
+from services.summary_counter_service import rebuild_summary_counters_command
+
+# 🔹 Reference data (roles, company status)
+from services.reference_data_service import reference_data
+from services.value_dictionary_service import value_dictionary
+
+# 🔹 NLP intent matcher (keyword table from config)
+from utils.nlp_utils import configure_intent_matcher
+
 
 def create_app():
     app = Flask(__name__)
@@ -30,6 +42,16 @@ def create_app():
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    chart_cache.init_app(app)
+    nlp_cache.init_app(app)
+
+    # Roles + company status, warmed once per process
+    reference_data.init_app(app)
+
+    # Product / category / state / city names per company, loaded on use
+    value_dictionary.init_app(app)
+
+    configure_intent_matcher(app)
 
     # --------------------------------------------------
     # Register Blueprints
@@ -39,6 +61,13 @@ def create_app():
     app.register_blueprint(company_bp)
     app.register_blueprint(employee_bp)
 
+    # --------------------------------------------------
+    # CLI Commands
+    # --------------------------------------------------
+    app.cli.add_command(ingest_worker_command)
+    app.cli.add_command(rebuild_sales_rollup_command)
+    app.cli.add_command(rebuild_summary_counters_command)
+
     # --------------------------------------------------
     # JWT Error Handlers
     # --------------------------------------------------
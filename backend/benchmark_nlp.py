@@ -0,0 +1,107 @@
+import sys
+import time
+import random
+import argparse
+
+from utils.nlp_utils import (
+    INTENT_KEYWORDS,
+    IntentMatcher,
+    load_intent_keywords,
+    preprocess_query
+)
+
+# Target throughput for intent detection (preprocess + match)
+TARGET_QUERIES_PER_SECOND = 10000
+
+SAMPLE_QUERIES = [
+    "What is my total revenue in 2024?",
+    "how many orders did we get in 2023",
+    "top 10 selling products this year",
+    "show sales by state",
+    "which payment method is used most",
+    "total earnings 2022",
+    "best product by revenue",
+    "state wise sales for 2024",
+    "payment distribution",
+    "hello there"
+]
+
+
+# =====================================================
+# 1. KEYWORD TABLE (OPTIONALLY BLOWN UP WITH SYNONYMS)
+# =====================================================
+
+def expanded_keywords(keywords, synonyms_per_intent):
+    """
+    The table plus `synonyms_per_intent` made-up phrases per intent,
+    to see how matching scales with hundreds of phrases.
+    """
+
+    expanded = {}
+
+    for intent, phrases in keywords.items():
+        phrases = list(phrases)
+        phrases += [
+            f"{intent.replace('_', ' ')} synonym {i}"
+            for i in range(synonyms_per_intent)
+        ]
+        expanded[intent] = phrases
+
+    return expanded
+
+
+# =====================================================
+# 2. TIME detect_intent
+# =====================================================
+
+def run_benchmark(matcher, queries, rounds):
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        for query in queries:
+            matcher.match(preprocess_query(query))
+
+    elapsed = time.perf_counter() - start
+
+    return rounds * len(queries) / elapsed
+
+
+def main(keywords_file=None, synonyms=0, rounds=5000, seed=0):
+    keywords = load_intent_keywords(keywords_file) if keywords_file else INTENT_KEYWORDS
+    keywords = expanded_keywords(keywords, synonyms)
+
+    phrase_count = sum(len(phrases) for phrases in keywords.values())
+
+    matcher = IntentMatcher(keywords)
+
+    queries = list(SAMPLE_QUERIES)
+    random.Random(seed).shuffle(queries)
+
+    # Warm-up
+    run_benchmark(matcher, queries, 100)
+
+    rate = run_benchmark(matcher, queries, rounds)
+
+    print("⚡ NLP intent detection benchmark")
+    print(f"   > {phrase_count} phrases, {rounds * len(queries)} queries")
+    print(f"   > {rate:,.0f} queries/s (target {TARGET_QUERIES_PER_SECOND:,})")
+
+    if rate < TARGET_QUERIES_PER_SECOND:
+        print("❌ Below target.")
+        return 1
+
+    print("✅ OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure NLP intent detection throughput."
+    )
+    parser.add_argument("--keywords-file", default=None)
+    parser.add_argument("--synonyms", type=int, default=0,
+                        help="Extra generated phrases per intent.")
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    sys.exit(main(args.keywords_file, args.synonyms, args.rounds))
@@ -0,0 +1,197 @@
+import sys
+import argparse
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from extensions import db
+from models import Role, User, UploadedFile
+
+# Tables that must never be read with a full scan
+CHECKED_TABLES = ["sales_data", "sales_rollup"]
+
+ALL_CHARTS = [
+    "revenue_over_time",
+    "sales_volume_over_time",
+    "online_vs_offline",
+    "top_10_products",
+    "sales_by_state",
+    "category_performance",
+    "payment_mode_distribution"
+]
+
+CHART_FILTERS = [
+    {},
+    {"type": "year", "year": 2024},
+    {"type": "month", "year": 2024, "month": 3},
+    {"type": "date_range", "start_date": "2024-01-01", "end_date": "2024-06-30"},
+    {"type": "date_range", "start_date": "2024-01-15", "end_date": "2024-02-10"}
+]
+
+NLP_QUESTIONS = [
+    "total revenue",
+    "total revenue 2024",
+    "how many orders in 2024",
+    "top selling products 2024",
+    "sales by state",
+    "payment mode distribution 2024"
+]
+
+
+# =====================================================
+# 1. RUN THE ROUTES, CAPTURE THEIR SQL
+# =====================================================
+
+def capture_queries(app, employee):
+    captured = {}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        text = statement.lower()
+
+        if not text.lstrip().startswith("select"):
+            return
+
+        if any(table in text for table in CHECKED_TABLES):
+            captured.setdefault(statement, parameters)
+
+    token = create_access_token(
+        identity=employee.email,
+        additional_claims={
+            "user_id": employee.id,
+            "role": "Employee",
+            "company_id": employee.company_id
+        }
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client = app.test_client()
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    try:
+        client.get("/employee/dashboard", headers=headers)
+        client.get("/employee/available-charts", headers=headers)
+
+        for chart_filter in CHART_FILTERS:
+            for start in range(0, len(ALL_CHARTS), 3):
+                client.post("/employee/generate-charts", headers=headers, json={
+                    "charts": ALL_CHARTS[start:start + 3],
+                    "filter": chart_filter
+                })
+
+        for question in NLP_QUESTIONS:
+            client.post("/employee/nlp-query", headers=headers, json={
+                "query": question
+            })
+
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    return captured
+
+
+# =====================================================
+# 2. EXPLAIN EACH QUERY
+# =====================================================
+
+def full_scans(conn, statement, parameters):
+    """
+    Names of checked tables the plan reads with a full scan.
+    """
+
+    dialect = conn.dialect.name
+    scanned = []
+
+    if dialect in ("mysql", "mariadb"):
+        for row in conn.exec_driver_sql("EXPLAIN " + statement, parameters).mappings():
+            if row["table"] in CHECKED_TABLES and row["type"] == "ALL":
+                scanned.append(row["table"])
+
+    elif dialect == "postgresql":
+        # Tiny test tables make seq scans "cheaper": ask whether an
+        # index path exists at all
+        conn.exec_driver_sql("SET enable_seqscan = off")
+        for (line,) in conn.exec_driver_sql("EXPLAIN " + statement, parameters):
+            for table in CHECKED_TABLES:
+                if f"Seq Scan on {table}" in line:
+                    scanned.append(table)
+
+    elif dialect == "sqlite":
+        for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+            detail = row[-1]
+            for table in CHECKED_TABLES:
+                if detail.startswith(f"SCAN {table}") and "INDEX" not in detail:
+                    scanned.append(table)
+
+    else:
+        raise RuntimeError(f"EXPLAIN check not supported on {dialect}")
+
+    return scanned
+
+
+def check_query_plans(employee_email=None):
+    app = create_app()
+
+    with app.app_context():
+        print("🔎 Checking analytics query plans...")
+
+        employee_role = Role.query.filter_by(name="Employee").first()
+
+        query = User.query.filter_by(role_id=employee_role.id)
+
+        if employee_email:
+            query = query.filter_by(email=employee_email)
+        else:
+            query = query.filter(
+                User.id.in_(db.session.query(UploadedFile.uploaded_by))
+            )
+
+        employee = query.first()
+
+        if not employee:
+            print("Error: no employee with uploaded data found.")
+            return 1
+
+        print(f"   > Employee: {employee.email}")
+
+        captured = capture_queries(app, employee)
+
+        failures = 0
+        unexplained = 0
+
+        with db.engine.connect() as conn:
+            for statement, parameters in captured.items():
+                summary = " ".join(statement.split())[:110]
+
+                try:
+                    scanned = full_scans(conn, statement, parameters)
+                except Exception as e:
+                    # A query whose plan cannot be read is not a passing one
+                    conn.rollback()
+                    unexplained += 1
+                    print(f"   ❌ EXPLAIN failed ({e.__class__.__name__}): {summary}")
+                    continue
+
+                if scanned:
+                    failures += 1
+                    print(f"   ❌ FULL SCAN on {', '.join(scanned)}: {summary}")
+                else:
+                    print(f"   ✅ {summary}")
+
+        print(
+            f"{len(captured)} queries checked, {failures} full scan(s), "
+            f"{unexplained} EXPLAIN failure(s)."
+        )
+
+        return 1 if failures or unexplained else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Assert that employee analytics queries use indexes."
+    )
+    parser.add_argument("--employee-email", default=None)
+    args = parser.parse_args()
+
+    sys.exit(check_query_plans(args.employee_email))
@@ -15,6 +15,58 @@ class Config:
     JWT_HEADER_NAME = "Authorization"
     JWT_HEADER_TYPE = "Bearer"
 
+    # Rows per executemany batch when storing cleaned sales data
+    INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 5000))
+
+    # Rows read per chunk while cleaning (0 = whole file at once)
+    CLEANING_CHUNK_SIZE = int(os.getenv('CLEANING_CHUNK_SIZE', 50000))
+
+    # Rows per record batch in the Arrow parse cache of raw uploads
+    PARSE_CACHE_CHUNK_SIZE = int(os.getenv('PARSE_CACHE_CHUNK_SIZE', 50000))
+
+    # Cleaned output: parquet (typed, compressed) or csv
+    CLEANED_FILE_FORMAT = os.getenv('CLEANED_FILE_FORMAT', 'parquet')
+    PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'zstd')
+
+    # Background ingest queue (flask ingest-worker)
+    INGEST_LEASE_SECONDS = int(os.getenv('INGEST_LEASE_SECONDS', 300))
+    INGEST_HEARTBEAT_SECONDS = int(os.getenv('INGEST_HEARTBEAT_SECONDS', 30))
+    INGEST_POLL_SECONDS = float(os.getenv('INGEST_POLL_SECONDS', 2))
+    INGEST_MAX_ATTEMPTS = int(os.getenv('INGEST_MAX_ATTEMPTS', 3))
+
+    # Ingest progress (published by workers, streamed over SSE)
+    INGEST_PROGRESS_SECONDS = float(os.getenv('INGEST_PROGRESS_SECONDS', 1))
+    INGEST_EVENTS_POLL_SECONDS = float(os.getenv('INGEST_EVENTS_POLL_SECONDS', 1))
+    INGEST_EVENTS_MAX_SECONDS = int(os.getenv('INGEST_EVENTS_MAX_SECONDS', 900))
+
+    # Chart result cache: memory (per process), redis (shared) or none
+    CHART_CACHE_BACKEND = os.getenv('CHART_CACHE_BACKEND', 'memory')
+    CHART_CACHE_TTL = int(os.getenv('CHART_CACHE_TTL', 300))
+    CHART_CACHE_MAX_ENTRIES = int(os.getenv('CHART_CACHE_MAX_ENTRIES', 1024))
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+    # NLP answer cache (same backends as the chart cache)
+    NLP_CACHE_BACKEND = os.getenv('NLP_CACHE_BACKEND', 'memory')
+    NLP_CACHE_TTL = int(os.getenv('NLP_CACHE_TTL', 300))
+    NLP_CACHE_MAX_ENTRIES = int(os.getenv('NLP_CACHE_MAX_ENTRIES', 4096))
+
+    # Questions accepted by one POST /employee/nlp-query/batch
+    NLP_BATCH_MAX_QUERIES = int(os.getenv('NLP_BATCH_MAX_QUERIES', 20))
+
+    # Role / company-status cache. memory: other workers may serve a
+    # company's status for up to REFERENCE_CACHE_TTL seconds after it
+    # was suspended or recovered; redis: a shared version key applies
+    # the change in every worker on its next request
+    REFERENCE_CACHE_BACKEND = os.getenv('REFERENCE_CACHE_BACKEND', 'memory')
+    REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', 60))
+
+    # Seconds before a process re-checks a company's value dictionary
+    # (autocomplete / NLP name resolution) for values ingested elsewhere
+    VALUE_DICTIONARY_TTL = int(os.getenv('VALUE_DICTIONARY_TTL', 60))
+
+    # NLP intent keyword table (JSON: intent -> phrases); built-in if unset
+    NLP_INTENT_KEYWORDS_FILE = os.getenv('NLP_INTENT_KEYWORDS_FILE')
+
 
     # Ensure upload directory exists
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
\ No newline at end of file
@@ -2,6 +2,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
 
+from utils.result_cache import ResultCache
+
 db = SQLAlchemy()
 jwt = JWTManager()
 migrate = Migrate()
+chart_cache = ResultCache("chart")
+nlp_cache = ResultCache("nlp")
@@ -0,0 +1,30 @@
+"""add users.data_version
+
+Per-employee counter bumped whenever the employee's stored sales data
+changes (ingest, file delete); chart results are cached against it.
+
+Revision ID: 3f6a1c9e52b7
+Revises: d24c35d94eea
+Create Date: 2026-10-18 12:20:41.508113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6a1c9e52b7'
+down_revision = 'd24c35d94eea'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column(
+        'data_version', sa.Integer(), nullable=False, server_default='0'
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('data_version')
@@ -0,0 +1,72 @@
+"""add sales_data.order_month
+
+Stores the calendar month of order_date as an integer YYYYMM, filled
+for existing rows here and at ingest afterwards, and widens the date
+indexes so month grouping is answered from the index.
+
+Revision ID: 458565e90a71
+Revises: 67150d86b86f
+Create Date: 2026-10-18 11:03:27.918344
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '458565e90a71'
+down_revision = '67150d86b86f'
+branch_labels = None
+depends_on = None
+
+
+# YYYYMM of order_date, per dialect
+ORDER_MONTH_SQL = {
+    'mysql': "EXTRACT(YEAR_MONTH FROM order_date)",
+    'mariadb': "EXTRACT(YEAR_MONTH FROM order_date)",
+    'postgresql': (
+        "CAST(EXTRACT(YEAR FROM order_date) * 100 "
+        "+ EXTRACT(MONTH FROM order_date) AS INTEGER)"
+    ),
+    'sqlite': "CAST(strftime('%Y%m', order_date) AS INTEGER)",
+}
+
+OLD_INDEXES = {
+    'ix_sales_data_file_date': ['file_id', 'order_date', 'total_amount', 'quantity'],
+    'ix_sales_data_file_channel': ['file_id', 'sales_channel', 'order_date', 'total_amount'],
+}
+
+NEW_INDEXES = {
+    'ix_sales_data_file_date': ['file_id', 'order_date', 'order_month', 'total_amount', 'quantity'],
+    'ix_sales_data_file_channel': ['file_id', 'sales_channel', 'order_date', 'order_month', 'total_amount'],
+}
+
+
+def _replace_indexes(indexes):
+    existing = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('sales_data')}
+
+    for name, columns in indexes.items():
+        if name in existing:
+            op.drop_index(name, table_name='sales_data')
+        op.create_index(name, 'sales_data', columns)
+
+
+def upgrade():
+    op.add_column('sales_data', sa.Column('order_month', sa.Integer(), nullable=True))
+
+    dialect = op.get_bind().dialect.name
+    op.execute(f"UPDATE sales_data SET order_month = {ORDER_MONTH_SQL[dialect]}")
+
+    with op.batch_alter_table('sales_data') as batch_op:
+        batch_op.alter_column('order_month',
+                              existing_type=sa.Integer(),
+                              nullable=False)
+
+    _replace_indexes(NEW_INDEXES)
+
+
+def downgrade():
+    _replace_indexes(OLD_INDEXES)
+
+    with op.batch_alter_table('sales_data') as batch_op:
+        batch_op.drop_column('order_month')
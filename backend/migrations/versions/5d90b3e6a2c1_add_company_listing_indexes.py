@@ -0,0 +1,36 @@
+"""add admin company listing indexes
+
+Indexes for the keyset-paginated admin company list: registration date
+on companies, uploads / rows stored per scope on summary_counters.
+
+Revision ID: 5d90b3e6a2c1
+Revises: c71e09a4d3f8
+Create Date: 2026-10-18 14:22:37.119846
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d90b3e6a2c1'
+down_revision = 'c71e09a4d3f8'
+branch_labels = None
+depends_on = None
+
+
+# name → (table, columns)
+INDEXES = {
+    'ix_companies_created': ('companies', ['created_at', 'id']),
+    'ix_summary_counters_uploads': ('summary_counters', ['scope', 'uploads', 'scope_id']),
+    'ix_summary_counters_rows': ('summary_counters', ['scope', 'rows_stored', 'scope_id']),
+}
+
+
+def upgrade():
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, (table, columns) in INDEXES.items():
+        op.drop_index(name, table_name=table)
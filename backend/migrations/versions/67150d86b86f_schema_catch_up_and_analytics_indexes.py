@@ -0,0 +1,288 @@
+"""schema catch-up and analytics indexes
+
+Brings a database created from 09b47522413f (or by db.create_all()
+at any point since) in line with the current models, then adds the
+composite indexes used by the chart, dashboard and NLP queries.
+
+Every step checks the live schema first, so the revision is safe on
+both kinds of database. A create_all() database without an
+alembic_version table should be stamped first:
+
+    flask db stamp 09b47522413f
+    flask db upgrade
+
+Revision ID: 67150d86b86f
+Revises: 09b47522413f
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '67150d86b86f'
+down_revision = '09b47522413f'
+branch_labels = None
+depends_on = None
+
+
+# name → (table, columns)
+ANALYTICS_INDEXES = {
+    'ix_sales_data_file_date': (
+        'sales_data', ['file_id', 'order_date', 'total_amount', 'quantity']
+    ),
+    'ix_sales_data_company_date': (
+        'sales_data', ['company_id', 'order_date', 'total_amount']
+    ),
+    'ix_sales_data_file_channel': (
+        'sales_data', ['file_id', 'sales_channel', 'order_date', 'total_amount']
+    ),
+    'ix_sales_data_file_product': (
+        'sales_data', ['file_id', 'product_name', 'total_amount']
+    ),
+    'ix_sales_data_file_state': (
+        'sales_data', ['file_id', 'state', 'total_amount']
+    ),
+    'ix_sales_data_file_category': (
+        'sales_data', ['file_id', 'category', 'total_amount']
+    ),
+    'ix_sales_data_file_payment': (
+        'sales_data', ['file_id', 'payment_mode']
+    ),
+    'ix_uploaded_files_company_hash': (
+        'uploaded_files', ['company_id', 'content_hash']
+    ),
+    'ix_uploaded_files_uploader': (
+        'uploaded_files', ['uploaded_by', 'uploaded_at']
+    ),
+    'ix_users_company_role': (
+        'users', ['company_id', 'role_id']
+    ),
+}
+
+
+# -----------------------------------------------------
+# Live schema helpers
+# -----------------------------------------------------
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _has_table(table):
+    return _inspector().has_table(table)
+
+
+def _columns(table):
+    return {c['name'] for c in _inspector().get_columns(table)}
+
+
+def _indexes(table):
+    inspector = _inspector()
+    names = {i['name'] for i in inspector.get_indexes(table)}
+    names |= {u['name'] for u in inspector.get_unique_constraints(table)}
+    return names
+
+
+def _add_columns(table, *columns):
+    existing = _columns(table)
+
+    for column in columns:
+        if column.name not in existing:
+            op.add_column(table, column)
+
+
+# -----------------------------------------------------
+# Current table definitions
+# -----------------------------------------------------
+
+def _create_sales_data():
+    op.create_table('sales_data',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('order_id', sa.String(length=100), nullable=False),
+    sa.Column('order_date', sa.DateTime(), nullable=False),
+    sa.Column('product_id', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Float(), nullable=False),
+    sa.Column('payment_mode', sa.String(length=50), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('sales_channel', sa.String(length=50), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('file_id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    # Named: MySQL foreign key names are unique per database and the
+    # legacy table keeps its auto-generated ones
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], name='fk_sales_data_company_id'),
+    sa.ForeignKeyConstraint(['file_id'], ['uploaded_files.id'], name='fk_sales_data_file_id'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('order_id', 'company_id', name='unique_order_per_company')
+    )
+
+
+def _create_missing_tables():
+    if not _has_table('otp_verifications'):
+        op.create_table('otp_verifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('otp_hash', sa.String(length=256), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('company_name', sa.String(length=100), nullable=False),
+        sa.Column('industry', sa.String(length=100), nullable=False),
+        sa.Column('manager_name', sa.String(length=80), nullable=False),
+        sa.Column('password_hash', sa.String(length=256), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_otp_verifications_email', 'otp_verifications', ['email'])
+
+    if not _has_table('column_mappings'):
+        op.create_table('column_mappings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('mapping_json', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id')
+        )
+
+    if not _has_table('audit_logs'):
+        op.create_table('audit_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if not _has_table('ingest_jobs'):
+        op.create_table('ingest_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('uploaded_file_id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.Column('job_type', sa.String(length=20), nullable=False, server_default='ingest'),
+        sa.Column('column_mapping', sa.JSON(), nullable=True),
+        sa.Column('save_mapping', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('lease_owner', sa.String(length=100), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['uploaded_file_id'], ['uploaded_files.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_ingest_jobs_created_by', 'ingest_jobs', ['created_by'])
+        op.create_index('ix_ingest_jobs_status_lease', 'ingest_jobs', ['status', 'lease_expires_at'])
+
+    if not _has_table('sales_rollup'):
+        op.create_table('sales_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('file_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('sales_channel', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('state', sa.String(length=100), nullable=False),
+        sa.Column('product_name', sa.String(length=100), nullable=False),
+        sa.Column('payment_mode', sa.String(length=50), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('quantity', sa.BigInteger(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+        sa.ForeignKeyConstraint(['file_id'], ['uploaded_files.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'file_id', 'month', 'sales_channel', 'category',
+            'state', 'product_name', 'payment_mode',
+            name='uq_sales_rollup_cell'
+        )
+        )
+        op.create_index('ix_sales_rollup_company_month', 'sales_rollup', ['company_id', 'month'])
+
+
+def upgrade():
+    # -------------------------------------------------
+    # companies / users
+    # -------------------------------------------------
+    _add_columns('companies',
+        sa.Column('industry', sa.String(length=100), nullable=False, server_default=''),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('verified_at', sa.DateTime(), nullable=True)
+    )
+
+    _add_columns('users',
+        sa.Column('is_verified', sa.Boolean(), nullable=False, server_default=sa.false())
+    )
+
+    # -------------------------------------------------
+    # uploaded_files
+    # -------------------------------------------------
+    if 'upload_timestamp' in _columns('uploaded_files'):
+        op.alter_column('uploaded_files', 'upload_timestamp',
+                        new_column_name='uploaded_at',
+                        existing_type=sa.DateTime(),
+                        existing_nullable=True)
+
+    _add_columns('uploaded_files',
+        sa.Column('file_type', sa.String(length=20), nullable=False, server_default='csv'),
+        sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+        sa.Column('cleaned_file_path', sa.String(length=255), nullable=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('cleaning_report', sa.JSON(), nullable=True)
+    )
+
+    # -------------------------------------------------
+    # sales_data: the 09b47522413f table (product_name /
+    # amount / sale_date) cannot be converted in place,
+    # keep its rows aside as sales_data_legacy
+    # -------------------------------------------------
+    sales_columns = _columns('sales_data')
+
+    if 'order_id' not in sales_columns and 'amount' in sales_columns:
+        op.rename_table('sales_data', 'sales_data_legacy')
+        _create_sales_data()
+
+    _create_missing_tables()
+
+    # -------------------------------------------------
+    # ingest_jobs created before parse-cache jobs existed
+    # -------------------------------------------------
+    _add_columns('ingest_jobs',
+        sa.Column('job_type', sa.String(length=20), nullable=False, server_default='ingest')
+    )
+
+    with op.batch_alter_table('ingest_jobs') as batch_op:
+        batch_op.alter_column('column_mapping',
+                              existing_type=sa.JSON(),
+                              nullable=True)
+
+    # -------------------------------------------------
+    # Analytics indexes
+    # -------------------------------------------------
+    for name, (table, columns) in ANALYTICS_INDEXES.items():
+        if name not in _indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    # Only the indexes are reverted: dropping the caught-up columns
+    # and tables would lose data the current code depends on
+    for name, (table, columns) in reversed(list(ANALYTICS_INDEXES.items())):
+        if name in _indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,123 @@
+"""add uploaded_by to sales_data and sales_rollup
+
+Copies uploaded_files.uploaded_by onto every stored sales row and
+rollup cell (filled at ingest from now on), and re-keys the employee
+analytics indexes on it so employee scoped queries filter on one
+indexed column instead of a file id IN-list.
+
+Revision ID: 8b2d47e0c915
+Revises: 3f6a1c9e52b7
+Create Date: 2026-10-18 12:58:10.274406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d47e0c915'
+down_revision = '3f6a1c9e52b7'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['sales_data', 'sales_rollup']
+
+# name → (table, columns)
+FILE_INDEXES = {
+    'ix_sales_data_file_date': (
+        'sales_data', ['file_id', 'order_date', 'order_month', 'total_amount', 'quantity']
+    ),
+    'ix_sales_data_file_channel': (
+        'sales_data', ['file_id', 'sales_channel', 'order_date', 'order_month', 'total_amount']
+    ),
+    'ix_sales_data_file_product': (
+        'sales_data', ['file_id', 'product_name', 'total_amount']
+    ),
+    'ix_sales_data_file_state': (
+        'sales_data', ['file_id', 'state', 'total_amount']
+    ),
+    'ix_sales_data_file_category': (
+        'sales_data', ['file_id', 'category', 'total_amount']
+    ),
+    'ix_sales_data_file_payment': (
+        'sales_data', ['file_id', 'payment_mode']
+    ),
+}
+
+UPLOADER_INDEXES = {
+    'ix_sales_data_uploader_date': (
+        'sales_data', ['uploaded_by', 'order_date', 'order_month', 'total_amount', 'quantity']
+    ),
+    'ix_sales_data_uploader_channel': (
+        'sales_data', ['uploaded_by', 'sales_channel', 'order_date', 'order_month', 'total_amount']
+    ),
+    'ix_sales_data_uploader_product': (
+        'sales_data', ['uploaded_by', 'product_name', 'total_amount']
+    ),
+    'ix_sales_data_uploader_state': (
+        'sales_data', ['uploaded_by', 'state', 'total_amount']
+    ),
+    'ix_sales_data_uploader_category': (
+        'sales_data', ['uploaded_by', 'category', 'total_amount']
+    ),
+    'ix_sales_data_uploader_payment': (
+        'sales_data', ['uploaded_by', 'payment_mode']
+    ),
+    # Per-file deletes / rollup rebuilds (and MySQL's file_id FK)
+    'ix_sales_data_file': (
+        'sales_data', ['file_id']
+    ),
+    'ix_sales_rollup_uploader_month': (
+        'sales_rollup', ['uploaded_by', 'month']
+    ),
+}
+
+
+def _existing_indexes(table):
+    return {i['name'] for i in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _create_indexes(indexes):
+    for name, (table, columns) in indexes.items():
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def _drop_indexes(indexes):
+    for name, (table, columns) in indexes.items():
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('uploaded_by', sa.Integer(), nullable=True))
+
+        op.execute(
+            f"UPDATE {table} SET uploaded_by = ("
+            f"SELECT f.uploaded_by FROM uploaded_files f "
+            f"WHERE f.id = {table}.file_id)"
+        )
+
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('uploaded_by',
+                                  existing_type=sa.Integer(),
+                                  nullable=False)
+            batch_op.create_foreign_key(
+                f'fk_{table}_uploaded_by', 'users', ['uploaded_by'], ['id']
+            )
+
+    # New indexes first: MySQL keeps file_id's FK on an index
+    _create_indexes(UPLOADER_INDEXES)
+    _drop_indexes(FILE_INDEXES)
+
+
+def downgrade():
+    _create_indexes(FILE_INDEXES)
+    _drop_indexes(UPLOADER_INDEXES)
+
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_uploaded_by', type_='foreignkey')
+            batch_op.drop_column('uploaded_by')
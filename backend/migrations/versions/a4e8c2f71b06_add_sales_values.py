@@ -0,0 +1,68 @@
+"""add sales_values
+
+Distinct product / category / state / city values per company with
+their row counts, kept up to date by ingest and file deletes. Existing
+sales rows are counted once here.
+
+Revision ID: a4e8c2f71b06
+Revises: 5d90b3e6a2c1
+Create Date: 2026-10-18 18:02:37.514208
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e8c2f71b06'
+down_revision = '5d90b3e6a2c1'
+branch_labels = None
+depends_on = None
+
+
+DIMENSIONS = ['product_name', 'category', 'state', 'city']
+
+sales = sa.table(
+    'sales_data',
+    sa.column('company_id'),
+    *[sa.column(dimension) for dimension in DIMENSIONS]
+)
+
+
+def _backfill(values):
+    columns = [values.c.company_id, values.c.dimension, values.c.value, values.c.row_count]
+
+    for dimension in DIMENSIONS:
+        column = sales.c[dimension]
+
+        query = (
+            sa.select(
+                sales.c.company_id,
+                sa.literal(dimension),
+                column,
+                sa.func.count()
+            )
+            .where(column.isnot(None), column != 'Unknown')
+            .group_by(sales.c.company_id, column)
+        )
+
+        op.execute(values.insert().from_select(columns, query))
+
+
+def upgrade():
+    values = op.create_table('sales_values',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('company_id', 'dimension', 'value', name='uq_sales_values_value')
+    )
+
+    _backfill(values)
+
+
+def downgrade():
+    op.drop_table('sales_values')
@@ -0,0 +1,83 @@
+"""key sales_values by uploader
+
+Dictionary values are counted per uploading employee, like every other
+employee-facing aggregate, so autocomplete and NLP name resolution
+never surface a co-worker's products or cities. The table only holds
+counts derived from sales_data: it is rebuilt and recounted here.
+
+Revision ID: b6f19d3c8e27
+Revises: a4e8c2f71b06
+Create Date: 2026-10-18 19:24:06.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6f19d3c8e27'
+down_revision = 'a4e8c2f71b06'
+branch_labels = None
+depends_on = None
+
+
+DIMENSIONS = ['product_name', 'category', 'state', 'city']
+
+sales = sa.table(
+    'sales_data',
+    sa.column('company_id'),
+    sa.column('uploaded_by'),
+    *[sa.column(dimension) for dimension in DIMENSIONS]
+)
+
+
+def _backfill(values, keys):
+    columns = [values.c[key] for key in keys] + [values.c.dimension, values.c.value, values.c.row_count]
+    groups = [sales.c[key] for key in keys]
+
+    for dimension in DIMENSIONS:
+        column = sales.c[dimension]
+
+        query = (
+            sa.select(*groups, sa.literal(dimension), column, sa.func.count())
+            .where(column.isnot(None), column != 'Unknown')
+            .group_by(*groups, column)
+        )
+
+        op.execute(values.insert().from_select(columns, query))
+
+
+def upgrade():
+    op.drop_table('sales_values')
+
+    values = op.create_table('sales_values',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('uploaded_by', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('uploaded_by', 'dimension', 'value', name='uq_sales_values_value')
+    )
+
+    _backfill(values, ['company_id', 'uploaded_by'])
+
+
+def downgrade():
+    op.drop_table('sales_values')
+
+    values = op.create_table('sales_values',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('row_count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('company_id', 'dimension', 'value', name='uq_sales_values_value')
+    )
+
+    _backfill(values, ['company_id'])
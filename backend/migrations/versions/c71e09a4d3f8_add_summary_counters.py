@@ -0,0 +1,138 @@
+"""add summary_counters
+
+One row of dashboard counters per scope (platform, company, employee),
+maintained by the write paths from now on. Existing data is counted
+once here.
+
+Revision ID: c71e09a4d3f8
+Revises: 8b2d47e0c915
+Create Date: 2026-10-18 13:41:52.660317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71e09a4d3f8'
+down_revision = '8b2d47e0c915'
+branch_labels = None
+depends_on = None
+
+
+COUNTER_COLUMNS = [
+    'companies', 'active_companies', 'users', 'employees',
+    'uploads', 'cleaned_files', 'rows_stored', 'revenue', 'last_upload_at'
+]
+
+companies = sa.table('companies', sa.column('id'), sa.column('is_active'))
+roles = sa.table('roles', sa.column('id'), sa.column('name'))
+users = sa.table('users', sa.column('id'), sa.column('company_id'), sa.column('role_id'))
+files = sa.table(
+    'uploaded_files',
+    sa.column('id'), sa.column('company_id'), sa.column('uploaded_by'),
+    sa.column('uploaded_at'), sa.column('cleaned_file_path'), sa.column('rows_stored')
+)
+sales = sa.table(
+    'sales_data',
+    sa.column('company_id'), sa.column('uploaded_by'), sa.column('total_amount')
+)
+
+
+def _count(table, *where):
+    return sa.select(sa.func.count()).select_from(table).where(*where).scalar_subquery()
+
+
+def _file_totals(*where):
+    return [
+        _count(files, *where),
+        _count(files, files.c.cleaned_file_path.isnot(None), *where),
+        sa.select(sa.func.coalesce(sa.func.sum(files.c.rows_stored), 0))
+        .where(*where).scalar_subquery(),
+        sa.select(sa.func.max(files.c.uploaded_at)).where(*where).scalar_subquery(),
+    ]
+
+
+def _revenue(*where):
+    return (
+        sa.select(sa.func.coalesce(sa.func.sum(sales.c.total_amount), 0))
+        .where(*where).scalar_subquery()
+    )
+
+
+def _backfill(counters):
+    employee_role = (
+        sa.select(roles.c.id).where(roles.c.name == 'Employee').scalar_subquery()
+    )
+
+    uploads, cleaned, rows, last_upload = _file_totals(sa.true())
+
+    platform = sa.select(
+        sa.literal('platform'),
+        sa.literal(0),
+        _count(companies, sa.true()),
+        _count(companies, companies.c.is_active.is_(True)),
+        _count(users, sa.true()),
+        _count(users, users.c.role_id == employee_role),
+        uploads, cleaned, rows,
+        _revenue(sa.true()),
+        last_upload
+    )
+
+    uploads, cleaned, rows, last_upload = _file_totals(files.c.company_id == companies.c.id)
+
+    per_company = sa.select(
+        sa.literal('company'),
+        companies.c.id,
+        sa.literal(0),
+        sa.literal(0),
+        _count(users, users.c.company_id == companies.c.id),
+        _count(users, users.c.company_id == companies.c.id, users.c.role_id == employee_role),
+        uploads, cleaned, rows,
+        _revenue(sales.c.company_id == companies.c.id),
+        last_upload
+    )
+
+    uploads, cleaned, rows, last_upload = _file_totals(files.c.uploaded_by == users.c.id)
+
+    per_employee = sa.select(
+        sa.literal('employee'),
+        users.c.id,
+        sa.literal(0),
+        sa.literal(0),
+        sa.literal(0),
+        sa.literal(0),
+        uploads, cleaned, rows,
+        _revenue(sales.c.uploaded_by == users.c.id),
+        last_upload
+    ).where(users.c.role_id == employee_role)
+
+    columns = [counters.c.scope, counters.c.scope_id] + [counters.c[c] for c in COUNTER_COLUMNS]
+
+    for query in (platform, per_company, per_employee):
+        op.execute(counters.insert().from_select(columns, query))
+
+
+def upgrade():
+    counters = op.create_table('summary_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('scope_id', sa.Integer(), nullable=False),
+    sa.Column('companies', sa.Integer(), nullable=False),
+    sa.Column('active_companies', sa.Integer(), nullable=False),
+    sa.Column('users', sa.Integer(), nullable=False),
+    sa.Column('employees', sa.Integer(), nullable=False),
+    sa.Column('uploads', sa.Integer(), nullable=False),
+    sa.Column('cleaned_files', sa.Integer(), nullable=False),
+    sa.Column('rows_stored', sa.BigInteger(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('last_upload_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('scope', 'scope_id', name='uq_summary_counters_scope')
+    )
+
+    _backfill(counters)
+
+
+def downgrade():
+    op.drop_table('summary_counters')
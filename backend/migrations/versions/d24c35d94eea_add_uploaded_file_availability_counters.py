@@ -0,0 +1,54 @@
+"""add uploaded_files chart availability counters
+
+Per-file stored-row count and counts of rows with a real value in
+sales_channel / product_name / state / category, maintained at ingest.
+Existing files are counted once from sales_data here.
+
+Revision ID: d24c35d94eea
+Revises: 458565e90a71
+Create Date: 2026-10-18 11:47:05.331906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd24c35d94eea'
+down_revision = '458565e90a71'
+branch_labels = None
+depends_on = None
+
+
+# counter → sales_data column it counts (None: every row)
+COUNTERS = {
+    'rows_stored': None,
+    'known_channel_rows': 'sales_channel',
+    'known_product_rows': 'product_name',
+    'known_state_rows': 'state',
+    'known_category_rows': 'category',
+}
+
+
+def upgrade():
+    for counter in COUNTERS:
+        op.add_column('uploaded_files', sa.Column(
+            counter, sa.Integer(), nullable=False, server_default='0'
+        ))
+
+    for counter, column in COUNTERS.items():
+        condition = ''
+        if column:
+            condition = f" AND s.{column} IS NOT NULL AND s.{column} <> 'Unknown'"
+
+        op.execute(
+            f"UPDATE uploaded_files SET {counter} = ("
+            f"SELECT COUNT(*) FROM sales_data s "
+            f"WHERE s.file_id = uploaded_files.id{condition})"
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('uploaded_files') as batch_op:
+        for counter in reversed(list(COUNTERS)):
+            batch_op.drop_column(counter)
@@ -3,6 +3,10 @@ from .company import Company
 from .user import User
 from .uploaded_file import UploadedFile
 from .sales_data import SalesData
+from .sales_rollup import SalesRollup
+from .summary_counter import SummaryCounter
+from .sales_value import SalesValue
 from .otp_verification import OTPVerification
 from .column_mapping import ColumnMapping
 from .audit_logs import AuditLog
+from .ingest_job import IngestJob
@@ -4,6 +4,11 @@ from datetime import datetime
 class Company(db.Model):
     __tablename__ = 'companies'
 
+    # Admin company listing sorted by registration date (keyset pages)
+    __table_args__ = (
+        db.Index('ix_companies_created', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     # Core details
@@ -0,0 +1,118 @@
+from extensions import db
+from datetime import datetime
+from sqlalchemy.dialects.mysql import JSON
+
+
+class IngestJob(db.Model):
+    __tablename__ = "ingest_jobs"
+
+    # Workers claim the oldest claimable job by status + lease expiry
+    __table_args__ = (
+        db.Index(
+            "ix_ingest_jobs_status_lease",
+            "status",
+            "lease_expires_at"
+        ),
+    )
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    TYPE_INGEST = "ingest"
+    TYPE_PARSE_CACHE = "parse_cache"
+
+    # ---------------------------------------------------
+    # Primary Key
+    # ---------------------------------------------------
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ---------------------------------------------------
+    # What to ingest
+    # ---------------------------------------------------
+    uploaded_file_id = db.Column(
+        db.Integer,
+        db.ForeignKey("uploaded_files.id"),
+        nullable=False
+    )
+
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey("companies.id"),
+        nullable=False
+    )
+
+    created_by = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id"),
+        nullable=False,
+        index=True
+    )
+
+    # ingest: clean + store with column_mapping
+    # parse_cache: parse the raw CSV into the Arrow parse cache
+    job_type = db.Column(
+        db.String(20),
+        default=TYPE_INGEST,
+        nullable=False
+    )
+
+    column_mapping = db.Column(JSON, nullable=True)
+
+    # Save column_mapping as the company template once the job succeeds
+    save_mapping = db.Column(db.Boolean, default=False, nullable=False)
+
+    # ---------------------------------------------------
+    # Queue State
+    # ---------------------------------------------------
+    status = db.Column(
+        db.String(20),
+        default=STATUS_QUEUED,
+        nullable=False
+    )
+
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+
+    # Lease: the worker owning the job must heartbeat before it expires,
+    # otherwise another worker may reclaim the job
+    lease_owner = db.Column(db.String(100), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    # Latest IngestProgress snapshot published by the worker
+    progress = db.Column(JSON, nullable=True)
+
+    # ---------------------------------------------------
+    # Outcome
+    # ---------------------------------------------------
+    result = db.Column(JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    # ---------------------------------------------------
+    # Relationships
+    # ---------------------------------------------------
+    uploaded_file = db.relationship("UploadedFile")
+
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "uploaded_file_id": self.uploaded_file_id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "attempts": self.attempts,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
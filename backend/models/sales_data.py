@@ -2,6 +2,12 @@ from extensions import db
 from datetime import datetime
 
 
+def _order_month(context):
+    # YYYYMM of order_date for inserts that do not set it explicitly
+    order_date = context.get_current_parameters()["order_date"]
+    return order_date.year * 100 + order_date.month
+
+
 class SalesData(db.Model):
     __tablename__ = 'sales_data'
 
@@ -12,6 +18,41 @@ class SalesData(db.Model):
             'company_id',
             name='unique_order_per_company'
         ),
+
+        # 📊 Analytics access paths: employee queries filter by
+        # uploaded_by, company queries by company_id; trailing columns
+        # make the chart / dashboard / NLP aggregates index-only
+        db.Index(
+            'ix_sales_data_uploader_date',
+            'uploaded_by', 'order_date', 'order_month', 'total_amount', 'quantity'
+        ),
+        db.Index(
+            'ix_sales_data_company_date',
+            'company_id', 'order_date', 'total_amount'
+        ),
+        db.Index(
+            'ix_sales_data_uploader_channel',
+            'uploaded_by', 'sales_channel', 'order_date', 'order_month', 'total_amount'
+        ),
+        db.Index(
+            'ix_sales_data_uploader_product',
+            'uploaded_by', 'product_name', 'total_amount'
+        ),
+        db.Index(
+            'ix_sales_data_uploader_state',
+            'uploaded_by', 'state', 'total_amount'
+        ),
+        db.Index(
+            'ix_sales_data_uploader_category',
+            'uploaded_by', 'category', 'total_amount'
+        ),
+        db.Index(
+            'ix_sales_data_uploader_payment',
+            'uploaded_by', 'payment_mode'
+        ),
+
+        # Per-file deletes / rollup rebuilds
+        db.Index('ix_sales_data_file', 'file_id'),
     )
 
     # ---------------------------------------------------
@@ -25,6 +66,10 @@ class SalesData(db.Model):
     order_id = db.Column(db.String(100), nullable=False)
     order_date = db.Column(db.DateTime, nullable=False)
 
+    # Calendar month of order_date as YYYYMM (e.g. 202403):
+    # portable month grouping without date functions on order_date
+    order_month = db.Column(db.Integer, nullable=False, default=_order_month)
+
     product_id = db.Column(db.String(100), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     unit_price = db.Column(db.Float, nullable=False)
@@ -58,6 +103,14 @@ class SalesData(db.Model):
         nullable=False
     )
 
+    # Copied from uploaded_files.uploaded_by at ingest, so employee
+    # scoped queries need no file id list
+    uploaded_by = db.Column(
+        db.Integer,
+        db.ForeignKey('users.id'),
+        nullable=False
+    )
+
     created_at = db.Column(
         db.DateTime,
         default=datetime.utcnow
@@ -0,0 +1,84 @@
+from extensions import db
+
+
+class SalesRollup(db.Model):
+    __tablename__ = 'sales_rollup'
+
+    # 📦 One row per (file, month, dimension combination);
+    # ingest adds each chunk's totals onto the matching cell
+    __table_args__ = (
+        db.UniqueConstraint(
+            'file_id',
+            'month',
+            'sales_channel',
+            'category',
+            'state',
+            'product_name',
+            'payment_mode',
+            name='uq_sales_rollup_cell'
+        ),
+        db.Index(
+            'ix_sales_rollup_company_month',
+            'company_id',
+            'month'
+        ),
+        db.Index(
+            'ix_sales_rollup_uploader_month',
+            'uploaded_by',
+            'month'
+        ),
+    )
+
+    # ---------------------------------------------------
+    # Primary Key
+    # ---------------------------------------------------
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ---------------------------------------------------
+    # Keys
+    # ---------------------------------------------------
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey('companies.id'),
+        nullable=False
+    )
+
+    file_id = db.Column(
+        db.Integer,
+        db.ForeignKey('uploaded_files.id'),
+        nullable=False
+    )
+
+    # uploaded_files.uploaded_by of file_id (employee scoped reads)
+    uploaded_by = db.Column(
+        db.Integer,
+        db.ForeignKey('users.id'),
+        nullable=False
+    )
+
+    # Calendar month of order_date as YYYYMM (e.g. 202403)
+    month = db.Column(db.Integer, nullable=False)
+
+    # ---------------------------------------------------
+    # Dimensions (cleaning fills missing values with "Unknown")
+    # ---------------------------------------------------
+    sales_channel = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+    state = db.Column(db.String(100), nullable=False)
+    product_name = db.Column(db.String(100), nullable=False)
+    payment_mode = db.Column(db.String(50), nullable=False)
+
+    # ---------------------------------------------------
+    # Measures
+    # ---------------------------------------------------
+    total_amount = db.Column(db.Float, nullable=False, default=0)
+    quantity = db.Column(db.BigInteger, nullable=False, default=0)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # ---------------------------------------------------
+    # Relationships
+    # ---------------------------------------------------
+    source_file = db.relationship(
+        'UploadedFile',
+        back_populates='sales_rollups'
+    )
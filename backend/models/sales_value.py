@@ -0,0 +1,49 @@
+from extensions import db
+
+
+class SalesValue(db.Model):
+    __tablename__ = 'sales_values'
+
+    DIMENSIONS = ['product_name', 'category', 'state', 'city']
+
+    # 📖 Distinct dimension values per uploading employee with the
+    # number of stored rows carrying them; ingest adds each chunk's
+    # counts, file deletes take them off again
+    __table_args__ = (
+        db.UniqueConstraint(
+            'uploaded_by',
+            'dimension',
+            'value',
+            name='uq_sales_values_value'
+        ),
+    )
+
+    # ---------------------------------------------------
+    # Primary Key
+    # ---------------------------------------------------
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ---------------------------------------------------
+    # Keys
+    # ---------------------------------------------------
+    company_id = db.Column(
+        db.Integer,
+        db.ForeignKey('companies.id'),
+        nullable=False
+    )
+
+    uploaded_by = db.Column(
+        db.Integer,
+        db.ForeignKey('users.id'),
+        nullable=False
+    )
+
+    # sales_data column the value comes from (one of DIMENSIONS)
+    dimension = db.Column(db.String(20), nullable=False)
+
+    value = db.Column(db.String(100), nullable=False)
+
+    # ---------------------------------------------------
+    # Measures
+    # ---------------------------------------------------
+    row_count = db.Column(db.BigInteger, nullable=False, default=0)
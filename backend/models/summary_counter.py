@@ -0,0 +1,59 @@
+from extensions import db
+
+
+class SummaryCounter(db.Model):
+    __tablename__ = 'summary_counters'
+
+    SCOPE_PLATFORM = 'platform'
+    SCOPE_COMPANY = 'company'
+    SCOPE_EMPLOYEE = 'employee'
+
+    # 📊 One row per scope (platform / company / employee), kept up to
+    # date by the ingest, file-delete and user-management paths so the
+    # dashboards read a single row
+    __table_args__ = (
+        db.UniqueConstraint(
+            'scope',
+            'scope_id',
+            name='uq_summary_counters_scope'
+        ),
+        # Admin company listing: keyset-paginated sorts per scope
+        db.Index(
+            'ix_summary_counters_uploads',
+            'scope',
+            'uploads',
+            'scope_id'
+        ),
+        db.Index(
+            'ix_summary_counters_rows',
+            'scope',
+            'rows_stored',
+            'scope_id'
+        ),
+    )
+
+    # ---------------------------------------------------
+    # Primary Key
+    # ---------------------------------------------------
+    id = db.Column(db.Integer, primary_key=True)
+
+    # ---------------------------------------------------
+    # Scope (scope_id: 0 for platform, else company / user id)
+    # ---------------------------------------------------
+    scope = db.Column(db.String(20), nullable=False)
+    scope_id = db.Column(db.Integer, nullable=False, default=0)
+
+    # ---------------------------------------------------
+    # Counters
+    # ---------------------------------------------------
+    companies = db.Column(db.Integer, nullable=False, default=0)
+    active_companies = db.Column(db.Integer, nullable=False, default=0)
+    users = db.Column(db.Integer, nullable=False, default=0)
+    employees = db.Column(db.Integer, nullable=False, default=0)
+
+    uploads = db.Column(db.Integer, nullable=False, default=0)
+    cleaned_files = db.Column(db.Integer, nullable=False, default=0)
+    rows_stored = db.Column(db.BigInteger, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    last_upload_at = db.Column(db.DateTime, nullable=True)
@@ -1,13 +1,29 @@
 from extensions import db
 from datetime import datetime
+from sqlalchemy.dialects.mysql import JSON
 
 class UploadedFile(db.Model):
     __tablename__ = 'uploaded_files'
 
+    # 🔁 Re-uploads of identical bytes are looked up per company (and uploader)
+    __table_args__ = (
+        db.Index(
+            'ix_uploaded_files_company_hash',
+            'company_id',
+            'content_hash'
+        ),
+        # Employee dashboard: uploads per employee + latest upload
+        db.Index(
+            'ix_uploaded_files_uploader',
+            'uploaded_by',
+            'uploaded_at'
+        ),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     filename = db.Column(db.String(255), nullable=False)
-    file_path = db.Column(db.String(500), nullable=False)
+    file_path = db.Column(db.String(512), nullable=False)
     file_type = db.Column(db.String(20), nullable=False)  # csv / pdf
 
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -15,6 +31,18 @@ class UploadedFile(db.Model):
     uploaded_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=False)   
     cleaned_file_path = db.Column(db.String(255), nullable=True)
+
+    # SHA-256 of the raw upload + report of the run that cleaned it
+    content_hash = db.Column(db.String(64), nullable=True)
+    cleaning_report = db.Column(JSON, nullable=True)
+
+    # 📊 Chart availability, counted while the file is ingested:
+    # rows stored + rows with a real (not "Unknown") value per column
+    rows_stored = db.Column(db.Integer, default=0, nullable=False)
+    known_channel_rows = db.Column(db.Integer, default=0, nullable=False)
+    known_product_rows = db.Column(db.Integer, default=0, nullable=False)
+    known_state_rows = db.Column(db.Integer, default=0, nullable=False)
+    known_category_rows = db.Column(db.Integer, default=0, nullable=False)
     
     # 🔥 THIS IS THE KEY FIX
     sales_data = db.relationship(
@@ -23,6 +51,12 @@ class UploadedFile(db.Model):
         cascade='all, delete-orphan'
     )
 
+    sales_rollups = db.relationship(
+        'SalesRollup',
+        back_populates='source_file',
+        cascade='all, delete-orphan'
+    )
+
     uploader = db.relationship('User', back_populates='uploaded_files')
     company = db.relationship('Company', back_populates='files')
 
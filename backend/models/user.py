@@ -5,6 +5,11 @@ from datetime import datetime
 class User(db.Model):
     __tablename__ = 'users'
 
+    # Manager / employee lookups within a company
+    __table_args__ = (
+        db.Index('ix_users_company_role', 'company_id', 'role_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -14,6 +19,9 @@ class User(db.Model):
     role_id = db.Column(db.Integer, db.ForeignKey('roles.id'), nullable=False)
     company_id = db.Column(db.Integer, db.ForeignKey('companies.id'), nullable=True)
 
+    # 🔁 Bumped when this user's stored sales data changes (cache key part)
+    data_version = db.Column(db.Integer, default=0, nullable=False)
+
     # Relationships
     role = db.relationship('Role', back_populates='users')
     company = db.relationship('Company', back_populates='users')
@@ -1,10 +1,13 @@
 from flask import Blueprint, jsonify, request
-from extensions import db
-from sqlalchemy import func, asc, desc
-from models import Company, User, SalesData, UploadedFile, Role
+from extensions import db, chart_cache, nlp_cache
+from sqlalchemy import func, asc, desc, tuple_
+from models import Company, SummaryCounter
 from utils.decorators import admin_required
+from utils.pagination import encode_cursor, decode_cursor
 from models import AuditLog
 from services.audit_service import log_event
+from services.summary_counter_service import add_to_summary_counters, get_summary_counters
+from services.reference_data_service import reference_data
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -29,35 +32,18 @@ def dashboard():
     Platform level real-time statistics
     """
     try:
-        total_registered_companies = Company.query.count()
-
-        total_active_companies = Company.query.filter_by(
-            is_active=True
-        ).count()
-
-        total_suspended_companies = Company.query.filter_by(
-            is_active=False
-        ).count()
-
-        total_users = User.query.count()
-
-        total_files_uploaded = UploadedFile.query.count()
-
-        total_cleaned_files_generated = UploadedFile.query.filter(
-            UploadedFile.cleaned_file_path.isnot(None)
-        ).count()
-
-        total_rows_stored = SalesData.query.count()
+        # One summary_counters row, kept current by the write paths
+        summary = get_summary_counters(SummaryCounter.SCOPE_PLATFORM)
 
         return jsonify({
             "platform_overview": {
-                "total_registered_companies": total_registered_companies,
-                "total_active_companies": total_active_companies,
-                "total_suspended_companies": total_suspended_companies,
-                "total_users_in_system": total_users,
-                "total_files_uploaded": total_files_uploaded,
-                "total_rows_stored": total_rows_stored,
-                "total_cleaned_files_generated": total_cleaned_files_generated
+                "total_registered_companies": summary["companies"],
+                "total_active_companies": summary["active_companies"],
+                "total_suspended_companies": summary["companies"] - summary["active_companies"],
+                "total_users_in_system": summary["users"],
+                "total_files_uploaded": summary["uploads"],
+                "total_rows_stored": summary["rows_stored"],
+                "total_cleaned_files_generated": summary["cleaned_files"]
             }
         }), 200
 
@@ -77,9 +63,12 @@ def get_companies():
     try:
         # ----------------------------
         # Pagination (Safe Defaults)
+        # ?cursor= (from next_cursor) pages by keyset; ?page= is
+        # still accepted and pages by offset
         # ----------------------------
         page = request.args.get('page', default=1, type=int)
         limit = request.args.get('limit', default=5, type=int)
+        cursor = request.args.get('cursor', type=str)
 
         if page < 1:
             page = 1
@@ -98,7 +87,9 @@ def get_companies():
         order = request.args.get('order', default='desc')
 
         # ----------------------------
-        # Base Query (NO ROLE JOIN)
+        # Base Query
+        # One summary_counters row per company: no fan-out join,
+        # uploads / data volume are stored counters
         # ----------------------------
         base_query = db.session.query(
             Company.id.label("company_id"),
@@ -106,24 +97,22 @@ def get_companies():
             Company.industry,
             Company.created_at.label("registration_date"),
             Company.is_active,
-            func.count(func.distinct(UploadedFile.id)).label("uploads"),
-            func.count(func.distinct(SalesData.id)).label("data_volume")
-        ).outerjoin(
-            UploadedFile,
-            UploadedFile.company_id == Company.id
-        ).outerjoin(
-            SalesData,
-            SalesData.company_id == Company.id
-        ).group_by(
-            Company.id
+            SummaryCounter.uploads.label("uploads"),
+            SummaryCounter.rows_stored.label("data_volume")
+        ).join(
+            SummaryCounter,
+            (SummaryCounter.scope == SummaryCounter.SCOPE_COMPANY)
+            & (SummaryCounter.scope_id == Company.id)
         )
 
+        filters = []
+
         # ----------------------------
         # Search
         # ----------------------------
         if search:
             search_pattern = f"%{search}%"
-            base_query = base_query.filter(
+            filters.append(
                 Company.name.ilike(search_pattern) |
                 Company.industry.ilike(search_pattern)
             )
@@ -133,51 +122,83 @@ def get_companies():
         # ----------------------------
         if status:
             if status.lower() == "active":
-                base_query = base_query.filter(Company.is_active.is_(True))
+                filters.append(Company.is_active.is_(True))
             elif status.lower() == "suspended":
-                base_query = base_query.filter(Company.is_active.is_(False))
+                filters.append(Company.is_active.is_(False))
+
+        base_query = base_query.filter(*filters)
 
         # ----------------------------
-        # Total Records (SAFE COUNT)
-        # Count companies separately (important)
+        # Total Records
+        # Platform counters unless a search narrows the list
         # ----------------------------
-        count_query = db.session.query(func.count(Company.id))
-
         if search:
-            count_query = count_query.filter(
-                Company.name.ilike(search_pattern) |
-                Company.industry.ilike(search_pattern)
-            )
+            total_records = db.session.query(
+                func.count(Company.id)
+            ).filter(*filters).scalar()
+        else:
+            platform = get_summary_counters(SummaryCounter.SCOPE_PLATFORM)
+            total_records = platform["companies"]
 
-        if status:
-            if status.lower() == "active":
-                count_query = count_query.filter(Company.is_active.is_(True))
-            elif status.lower() == "suspended":
-                count_query = count_query.filter(Company.is_active.is_(False))
+            if status and status.lower() == "active":
+                total_records = platform["active_companies"]
+            elif status and status.lower() == "suspended":
+                total_records = platform["companies"] - platform["active_companies"]
 
-        total_records = count_query.scalar()
         total_pages = (total_records + limit - 1) // limit
 
         # ----------------------------
         # Sorting (Whitelist Only)
+        # (sort column, tie-breaker) match an index each
         # ----------------------------
         sort_fields = {
-            "registration_date": Company.created_at,
-            "uploads": func.count(func.distinct(UploadedFile.id)),
-            "data_volume": func.count(func.distinct(SalesData.id))
+            "registration_date": (Company.created_at, Company.id),
+            "uploads": (SummaryCounter.uploads, SummaryCounter.scope_id),
+            "data_volume": (SummaryCounter.rows_stored, SummaryCounter.scope_id)
         }
 
-        sort_column = sort_fields.get(sort_by, Company.created_at)
+        sort_key = sort_by if sort_by in sort_fields else "registration_date"
+        sort_column, tie_breaker = sort_fields[sort_key]
+        ascending = order.lower() == "asc"
 
-        if order.lower() == "asc":
-            base_query = base_query.order_by(asc(sort_column))
+        if ascending:
+            base_query = base_query.order_by(asc(sort_column), asc(tie_breaker))
         else:
-            base_query = base_query.order_by(desc(sort_column))
+            base_query = base_query.order_by(desc(sort_column), desc(tie_breaker))
 
         # ----------------------------
         # Apply Pagination
         # ----------------------------
-        companies = base_query.offset(offset).limit(limit).all()
+        if cursor:
+            try:
+                last_value, last_id = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            after = tuple_(sort_column, tie_breaker)
+
+            if ascending:
+                base_query = base_query.filter(after > tuple_(last_value, last_id))
+            else:
+                base_query = base_query.filter(after < tuple_(last_value, last_id))
+        else:
+            base_query = base_query.offset(offset)
+
+        # One extra row tells whether another page follows
+        companies = base_query.limit(limit + 1).all()
+
+        has_next = len(companies) > limit
+        companies = companies[:limit]
+
+        next_cursor = None
+        if has_next:
+            last = companies[-1]
+            sort_values = {
+                "registration_date": last.registration_date,
+                "uploads": last.uploads,
+                "data_volume": last.data_volume
+            }
+            next_cursor = encode_cursor(sort_values[sort_key], last.company_id)
 
         # ----------------------------
         # Format Response
@@ -198,12 +219,13 @@ def get_companies():
         return jsonify({
             "companies": company_list,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "per_page": limit,
                 "total_records": total_records,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
+                "has_next": has_next,
+                "has_prev": bool(cursor) or page > 1,
+                "next_cursor": next_cursor
             }
         }), 200
 
@@ -229,8 +251,11 @@ def suspend_company(company_id):
             return jsonify({"message": "Company already suspended"}), 200
 
         company.is_active = False
+        add_to_summary_counters(active_companies=-1)
         db.session.commit()
 
+        reference_data.invalidate_company(company_id)
+
         log_event(
             "SUSPEND",
             f"Admin suspended company {company.name}"
@@ -262,8 +287,11 @@ def recover_company(company_id):
             return jsonify({"message": "Company already active"}), 200
 
         company.is_active = True
+        add_to_summary_counters(active_companies=1)
         db.session.commit()
 
+        reference_data.invalidate_company(company_id)
+
         log_event(
             "RECOVER",
             f"Admin recovered company {company.name}"
@@ -311,3 +339,15 @@ def get_audit_logs():
             "error": "Failed to fetch audit logs",
             "details": str(e)
         }), 500
+
+
+# ==========================================================
+# 6️⃣ RESULT CACHE STATS (THIS WORKER PROCESS)
+# ==========================================================
+@admin_bp.route('/cache-stats', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    return jsonify({
+        "chart_cache": chart_cache.stats(),
+        "nlp_cache": nlp_cache.stats()
+    }), 200
@@ -5,8 +5,14 @@ import random, hashlib
 
 from werkzeug.security import generate_password_hash   # ✅ FIX
 from extensions import db
-from models import Company, User, Role, OTPVerification, SalesData, UploadedFile
+from models import Company, User, OTPVerification, SummaryCounter
 from utils.decorators import role_required
+from services.reference_data_service import reference_data
+from services.summary_counter_service import (
+    add_to_summary_counters,
+    drop_summary_counters,
+    get_summary_counters
+)
 
 company_bp = Blueprint('company', __name__, url_prefix='/company')
 
@@ -49,7 +55,7 @@ def dashboard():
     claims = get_jwt()
     company_id = claims.get('company_id')
 
-    company = Company.query.get(company_id)
+    company = reference_data.company(company_id)
     if not company:
         return jsonify({"error": "Company not found"}), 404
 
@@ -57,43 +63,11 @@ def dashboard():
     # SECTION 1 — Company Overview
     # -----------------------------
 
-    # Total Employees (exclude manager)
-    employee_role = Role.query.filter_by(name="Employee").first()
+    employee_role_id = reference_data.role_id("Employee")
 
-    total_employees = User.query.filter_by(
-        company_id=company_id,
-        role_id=employee_role.id
-    ).count()
-
-    # Total Uploads
-    total_uploads = UploadedFile.query.filter_by(
-        company_id=company_id
-    ).count()
-
-    # Total Cleaned Files
-    total_cleaned_files = UploadedFile.query.filter(
-        UploadedFile.company_id == company_id,
-        UploadedFile.cleaned_file_path.isnot(None)
-    ).count()
-
-    # Total Rows Stored
-    total_rows_stored = SalesData.query.filter_by(
-        company_id=company_id
-    ).count()
-
-    # Total Revenue
-    total_revenue = db.session.query(
-        db.func.coalesce(db.func.sum(SalesData.total_amount), 0)
-    ).filter(
-        SalesData.company_id == company_id
-    ).scalar()
-
-    # Last Upload Date
-    last_upload = db.session.query(
-        db.func.max(UploadedFile.uploaded_at)
-    ).filter(
-        UploadedFile.company_id == company_id
-    ).scalar()
+    # Employees (exclude manager), uploads, rows, revenue, last upload:
+    # one summary_counters row
+    summary = get_summary_counters(SummaryCounter.SCOPE_COMPANY, company_id)
 
     # -----------------------------
     # SECTION 2 — Employee Activity
@@ -103,12 +77,15 @@ def dashboard():
         db.session.query(
             User.id,
             User.username,
-            db.func.count(UploadedFile.id).label("upload_count")
+            db.func.coalesce(SummaryCounter.uploads, 0).label("upload_count")
+        )
+        .outerjoin(
+            SummaryCounter,
+            (SummaryCounter.scope == SummaryCounter.SCOPE_EMPLOYEE)
+            & (SummaryCounter.scope_id == User.id)
         )
-        .join(UploadedFile, UploadedFile.uploaded_by == User.id, isouter=True)
         .filter(User.company_id == company_id)
-        .filter(User.role_id == employee_role.id)
-        .group_by(User.id)
+        .filter(User.role_id == employee_role_id)
         .all()
     )
 
@@ -129,12 +106,12 @@ def dashboard():
         "company_overview": {
             "company_name": company.name,
             "industry": company.industry,
-            "total_employees": total_employees,
-            "total_uploads": total_uploads,
-            "total_cleaned_files": total_cleaned_files,
-            "total_rows_stored": total_rows_stored,
-            "total_revenue": float(total_revenue),
-            "last_upload_date": last_upload
+            "total_employees": summary["employees"],
+            "total_uploads": summary["uploads"],
+            "total_cleaned_files": summary["cleaned_files"],
+            "total_rows_stored": summary["rows_stored"],
+            "total_revenue": float(summary["revenue"]),
+            "last_upload_date": summary["last_upload_at"]
         },
         "employee_activity": employee_activity_data
     }), 200
@@ -214,19 +191,21 @@ def verify_otp():
     db.session.add(company)
     db.session.flush()
 
-    manager_role = Role.query.filter_by(name="Company Manager").first()
-
     manager = User(
         username=otp_entry.manager_name,
         email=email,
         password_hash=otp_entry.password_hash,  # ✅ already correct now
-        role_id=manager_role.id,
+        role_id=reference_data.role_id("Company Manager"),
         company_id=company.id,
         is_verified=True
     )
 
     db.session.add(manager)
     db.session.delete(otp_entry)
+
+    add_to_summary_counters(companies=1, active_companies=1)
+    add_to_summary_counters(company_id=company.id, users=1)
+
     db.session.commit()
 
     return jsonify({
@@ -257,18 +236,17 @@ def add_employee():
     ).first():
         return jsonify({"error": "Employee already exists"}), 400
 
-    employee_role = Role.query.filter_by(name="Employee").first()
-
     employee = User(
         username=username,
         email=email,
-        role_id=employee_role.id,
+        role_id=reference_data.role_id("Employee"),
         company_id=company_id,
         is_verified=True
     )
     employee.set_password(password)
 
     db.session.add(employee)
+    add_to_summary_counters(company_id=company_id, users=1, employees=1)
     db.session.commit()
 
     return jsonify({"message": "Employee added", "employee": employee.to_dict()}), 201
@@ -281,11 +259,9 @@ def list_employees():
     claims = get_jwt()
     company_id = claims.get('company_id')
 
-    employee_role = Role.query.filter_by(name="Employee").first()
-
     employees = User.query.filter_by(
         company_id=company_id,
-        role_id=employee_role.id
+        role_id=reference_data.role_id("Employee")
     ).order_by(User.created_at.desc()).all()
 
     return jsonify({
@@ -319,10 +295,14 @@ def remove_employee(employee_id):
     if employee.company_id != company_id:
         return jsonify({"error": "Employee does not belong to your company"}), 403
 
-    if employee.role.name != "Employee":
+    if reference_data.role_name(employee.role_id) != "Employee":
         return jsonify({"error": "Only employees can be removed"}), 403
 
     db.session.delete(employee)
+
+    add_to_summary_counters(company_id=company_id, users=-1, employees=-1)
+    drop_summary_counters(SummaryCounter.SCOPE_EMPLOYEE, employee_id)
+
     db.session.commit()
 
     return jsonify({"message": "Employee removed successfully"}), 200
\ No newline at end of file
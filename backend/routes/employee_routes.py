@@ -1,24 +1,24 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, url_for, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt
 from werkzeug.utils import secure_filename
-from services.nlp_services import process_nlp_query
+from services.nlp_services import process_nlp_batch, process_nlp_query
 
 import os
+import json
+import time
 import uuid
 import pandas as pd
-from datetime import datetime
-from sqlalchemy import func
 
-from extensions import db
+from extensions import db, chart_cache
 
 # Models
 from models import (
-    Company,
     User,
-    Role,
     UploadedFile,
     ColumnMapping,
-    SalesData
+    IngestJob,
+    SummaryCounter,
+    SalesValue
 )
 
 # Utilities
@@ -27,7 +27,18 @@ from utils.decorators import role_required
 from utils.column_mapping import auto_map_optional_columns
 
 # Services
-from services.data_cleaning_service import clean_and_store_sales_data
+from services.ingest_queue_service import (
+    enqueue_ingest_job,
+    enqueue_parse_cache_job,
+    find_active_job
+)
+from services.cleaned_file_service import iter_cleaned_csv
+from services.chart_service import build_charts, filter_date_range, CHART_RENDERERS
+from services.file_service import save_upload_with_hash, delete_uploaded_file
+from services.data_version_service import get_data_version
+from services.summary_counter_service import add_to_summary_counters, get_summary_counters
+from services.reference_data_service import reference_data
+from services.value_dictionary_service import value_dictionary
 
 employee_bp = Blueprint("employee", __name__, url_prefix="/employee")
 
@@ -53,6 +64,10 @@ OPTIONAL_LOGICAL_COLUMNS = [
     "city"
 ]
 
+# Autocomplete suggestions per request (default / cap)
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
 
 # ==========================================================
 # 👤 EMPLOYEE DASHBOARD
@@ -71,61 +86,20 @@ def employee_dashboard():
         # Company + Manager Details
         # --------------------------------------------------
 
-        company = Company.query.get(company_id)
+        company = reference_data.company(company_id)
         if not company:
             return jsonify({"error": "Company not found"}), 404
 
-        manager_role = Role.query.filter_by(name="Company Manager").first()
-
         manager = User.query.filter_by(
             company_id=company_id,
-            role_id=manager_role.id
+            role_id=reference_data.role_id("Company Manager")
         ).first()
 
         # --------------------------------------------------
-        # Employee Files
+        # Uploads / Rows / Revenue (summary counters, one row)
         # --------------------------------------------------
 
-        employee_files = UploadedFile.query.filter_by(
-            uploaded_by=employee_id
-        ).all()
-
-        file_ids = [f.id for f in employee_files]
-
-        total_uploads = len(employee_files)
-
-        total_cleaned_files = UploadedFile.query.filter(
-            UploadedFile.uploaded_by == employee_id,
-            UploadedFile.cleaned_file_path.isnot(None)
-        ).count()
-
-        # --------------------------------------------------
-        # Sales Data (Only Employee Files)
-        # --------------------------------------------------
-
-        total_rows_inserted = 0
-        total_revenue_generated = 0
-
-        if file_ids:
-            total_rows_inserted = SalesData.query.filter(
-                SalesData.file_id.in_(file_ids)
-            ).count()
-
-            total_revenue_generated = db.session.query(
-                db.func.coalesce(db.func.sum(SalesData.total_amount), 0)
-            ).filter(
-                SalesData.file_id.in_(file_ids)
-            ).scalar()
-
-        # --------------------------------------------------
-        # Last Upload Date
-        # --------------------------------------------------
-
-        last_upload = db.session.query(
-            db.func.max(UploadedFile.uploaded_at)
-        ).filter(
-            UploadedFile.uploaded_by == employee_id
-        ).scalar()
+        summary = get_summary_counters(SummaryCounter.SCOPE_EMPLOYEE, employee_id)
 
         # --------------------------------------------------
         # Final Response
@@ -137,11 +111,11 @@ def employee_dashboard():
                 "manager_name": manager.username if manager else None,
                 "manager_email": manager.email if manager else None,
 
-                "total_uploads": total_uploads,
-                "total_cleaned_files": total_cleaned_files,
-                "total_rows_inserted": total_rows_inserted,
-                "total_revenue_generated": float(total_revenue_generated),
-                "last_upload_date": last_upload
+                "total_uploads": summary["uploads"],
+                "total_cleaned_files": summary["cleaned_files"],
+                "total_rows_inserted": summary["rows_stored"],
+                "total_revenue_generated": float(summary["revenue"]),
+                "last_upload_date": summary["last_upload_at"]
             }
         }), 200
 
@@ -178,7 +152,7 @@ def upload_file():
         return jsonify({"error": "Employee not linked to company"}), 400
 
     # 🔥 NEW: Check if company is active
-    company = Company.query.get(company_id)
+    company = reference_data.company(company_id)
     if not company or not company.is_active:
         return jsonify({
             "error": "Company is suspended. Uploads are blocked."
@@ -198,17 +172,47 @@ def upload_file():
     os.makedirs(upload_dir, exist_ok=True)
 
     file_path = os.path.join(upload_dir, unique_filename)
-    file.save(file_path)
+    content_hash = save_upload_with_hash(file, file_path)
+
+    # ---------------------------
+    # Identical file already cleaned by this employee?
+    # (Charts are per uploader: a co-worker's copy would show them nothing)
+    # ---------------------------
+    previous_upload = UploadedFile.query.filter(
+        UploadedFile.company_id == company_id,
+        UploadedFile.uploaded_by == user_id,
+        UploadedFile.content_hash == content_hash,
+        UploadedFile.cleaned_file_path.isnot(None)
+    ).order_by(UploadedFile.id.desc()).first()
+
+    if previous_upload and previous_upload.cleaning_report:
+        os.remove(file_path)
+
+        return jsonify({
+            "message": "Identical file already processed",
+            "duplicate_of": previous_upload.id,
+            "cleaning_report": previous_upload.cleaning_report
+        }), 200
 
     uploaded_file = UploadedFile(
         filename=original_filename,
         file_path=file_path,
         file_type=ext,
         uploaded_by=user_id,
-        company_id=company_id
+        company_id=company_id,
+        content_hash=content_hash
     )
 
     db.session.add(uploaded_file)
+    db.session.flush()
+
+    add_to_summary_counters(
+        company_id=company_id,
+        employee_id=user_id,
+        last_upload_at=uploaded_file.uploaded_at,
+        uploads=1
+    )
+
     db.session.commit()
 
     # ---------------------------
@@ -238,24 +242,27 @@ def upload_file():
             actual_col in detected_columns
             for actual_col in saved_mapping.values()
         ):
-            result, status = clean_and_store_sales_data(
-                file_path=file_path,
-                company_id=company_id,
-                uploaded_file_id=uploaded_file.id,
+            job = enqueue_ingest_job(
+                uploaded_file=uploaded_file,
+                created_by=user_id,
                 column_mapping=saved_mapping
             )
 
-            if status == 201:
-                return jsonify({
-                    "message": "File auto-processed using saved mapping",
-                    "cleaning_report": result
-                }), 201
+            return jsonify({
+                "message": "File queued for processing using saved mapping",
+                "uploaded_file_id": uploaded_file.id,
+                "job_id": job.id,
+                "status_url": url_for("employee.get_ingest_job", job_id=job.id)
+            }), 202
 
     system_optional_mapping = auto_map_optional_columns(
         detected_columns=detected_columns,
         optional_columns=OPTIONAL_LOGICAL_COLUMNS
     )
 
+    # Parse the CSV in the background while the user maps columns
+    enqueue_parse_cache_job(uploaded_file, created_by=user_id)
+
     return jsonify({
         "message": "Column mapping required",
         "uploaded_file_id": uploaded_file.id,
@@ -298,7 +305,7 @@ def map_columns_and_process():
     company_id = claims.get("company_id")
 
     # 🔥 NEW: Check if company is active
-    company = Company.query.get(company_id)
+    company = reference_data.company(company_id)
     if not company or not company.is_active:
         return jsonify({
             "error": "Company is suspended. Operation not allowed."
@@ -321,38 +328,190 @@ def map_columns_and_process():
         **required_mapping
     }
 
-    result, status = clean_and_store_sales_data(
-        file_path=uploaded_file.file_path,
-        company_id=company_id,
-        uploaded_file_id=uploaded_file.id,
-        column_mapping=final_column_mapping
-    )
+    # One ingest per file at a time: concurrent jobs would interleave
+    # their rows and credit each other's aggregates
+    active_job = find_active_job(uploaded_file.id, job_type=IngestJob.TYPE_INGEST)
 
-    if status != 201:
+    if active_job:
         return jsonify({
-            "message": "CSV uploaded but cleaning failed",
-            "error": result
-        }), status
+            "error": "File is already being processed",
+            "job_id": active_job.id,
+            "status_url": url_for("employee.get_ingest_job", job_id=active_job.id)
+        }), 409
+
+    # Cleaning runs in `flask ingest-worker`; the mapping is saved as
+    # the company template once the job succeeds
+    job = enqueue_ingest_job(
+        uploaded_file=uploaded_file,
+        created_by=claims.get("user_id"),
+        column_mapping=final_column_mapping,
+        save_mapping=True
+    )
 
-    existing_mapping = ColumnMapping.query.filter_by(
-        company_id=company_id
-    ).first()
+    return jsonify({
+        "message": "CSV queued for cleaning",
+        "uploaded_file_id": uploaded_file.id,
+        "job_id": job.id,
+        "status_url": url_for("employee.get_ingest_job", job_id=job.id)
+    }), 202
 
-    if existing_mapping:
-        existing_mapping.mapping_json = final_column_mapping
-    else:
-        new_mapping = ColumnMapping(
-            company_id=company_id,
-            mapping_json=final_column_mapping
-        )
-        db.session.add(new_mapping)
 
-    db.session.commit()
+# ==========================================================
+# PHASE 3️⃣ – INGEST JOB STATUS
+# ==========================================================
+@employee_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+@role_required(["Employee"])
+def get_ingest_job(job_id):
+
+    claims = get_jwt()
+    employee_id = claims.get("user_id")
+
+    job = IngestJob.query.get(job_id)
+
+    if not job or job.created_by != employee_id:
+        return jsonify({"error": "Job not found"}), 404
 
     return jsonify({
-        "message": "CSV cleaned, stored & mapping saved successfully",
-        "cleaning_report": result
-    }), 201
+        "job": job.to_dict()
+    }), 200
+
+
+# ==========================================================
+# 📡 LIVE INGEST PROGRESS (SERVER-SENT EVENTS)
+# ==========================================================
+@employee_bp.route("/jobs/<int:job_id>/events", methods=["GET"])
+@jwt_required()
+@role_required(["Employee"])
+def stream_ingest_job(job_id):
+
+    claims = get_jwt()
+    employee_id = claims.get("user_id")
+
+    job = IngestJob.query.get(job_id)
+
+    if not job or job.created_by != employee_id:
+        return jsonify({"error": "Job not found"}), 404
+
+    poll_seconds = current_app.config.get("INGEST_EVENTS_POLL_SECONDS", 1)
+    max_seconds = current_app.config.get("INGEST_EVENTS_MAX_SECONDS", 900)
+
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+    def generate():
+        # Workers publish progress onto the job row; each poll ends the
+        # transaction first so a fresh snapshot is read
+        deadline = time.monotonic() + max_seconds
+        last_payload = None
+
+        while True:
+            db.session.rollback()
+            current = db.session.get(IngestJob, job_id, populate_existing=True)
+
+            # The file (and its jobs) was deleted while streaming
+            if current is None:
+                yield sse("deleted", {"status": "deleted"})
+                return
+
+            payload = {
+                "status": current.status,
+                "progress": current.progress
+            }
+
+            if current.is_finished():
+                payload["result"] = current.result
+                payload["error"] = current.error
+                yield sse("done", payload)
+                return
+
+            if payload != last_payload:
+                last_payload = payload
+                yield sse("progress", payload)
+            else:
+                yield ": keep-alive\n\n"
+
+            if time.monotonic() > deadline:
+                # Client reconnects and resumes from the latest snapshot
+                yield sse("timeout", payload)
+                return
+
+            time.sleep(poll_seconds)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+# ==========================================================
+# 📄 CLEANED FILE – CSV EXPORT ON DEMAND
+# ==========================================================
+@employee_bp.route("/files/<int:file_id>/cleaned.csv", methods=["GET"])
+@jwt_required()
+@role_required(["Employee"])
+def export_cleaned_csv(file_id):
+
+    claims = get_jwt()
+    employee_id = claims.get("user_id")
+
+    uploaded_file = UploadedFile.query.get(file_id)
+
+    if not uploaded_file or uploaded_file.uploaded_by != employee_id:
+        return jsonify({"error": "Uploaded file not found"}), 404
+
+    cleaned_path = uploaded_file.cleaned_file_path
+
+    if not cleaned_path or not os.path.exists(cleaned_path):
+        return jsonify({"error": "Cleaned file not available"}), 404
+
+    return Response(
+        stream_with_context(iter_cleaned_csv(cleaned_path)),
+        mimetype="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename=cleaned_{file_id}.csv"
+        }
+    )
+
+
+# ==========================================================
+# 🗑️ DELETE UPLOADED FILE (+ ITS SALES DATA)
+# ==========================================================
+@employee_bp.route("/files/<int:file_id>", methods=["DELETE"])
+@jwt_required()
+@role_required(["Employee"])
+def delete_file(file_id):
+
+    claims = get_jwt()
+    employee_id = claims.get("user_id")
+
+    uploaded_file = UploadedFile.query.get(file_id)
+
+    if not uploaded_file or uploaded_file.uploaded_by != employee_id:
+        return jsonify({"error": "Uploaded file not found"}), 404
+
+    active_job = find_active_job(file_id)
+
+    if active_job:
+        return jsonify({
+            "error": "File is still being processed",
+            "job_id": active_job.id
+        }), 409
+
+    try:
+        result, status = delete_uploaded_file(uploaded_file)
+        return jsonify(result), status
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "error": "File delete failed",
+            "details": str(e)
+        }), 500
+
 
 # ==========================================================
 # 📊 AVAILABLE CHARTS (STRICT VALIDATION)
@@ -365,26 +524,31 @@ def get_available_charts():
         claims = get_jwt()
         employee_id = claims.get("user_id")
 
-        # Step 1: Get employee file IDs
-        employee_files = UploadedFile.query.filter_by(
-            uploaded_by=employee_id
-        ).all()
+        # Per-file counters filled at ingest: no sales_data scans
+        (
+            total_files,
+            total_rows,
+            valid_channel_count,
+            valid_product_count,
+            valid_state_count,
+            valid_category_count
+        ) = db.session.query(
+            db.func.count(UploadedFile.id),
+            db.func.coalesce(db.func.sum(UploadedFile.rows_stored), 0),
+            db.func.coalesce(db.func.sum(UploadedFile.known_channel_rows), 0),
+            db.func.coalesce(db.func.sum(UploadedFile.known_product_rows), 0),
+            db.func.coalesce(db.func.sum(UploadedFile.known_state_rows), 0),
+            db.func.coalesce(db.func.sum(UploadedFile.known_category_rows), 0)
+        ).filter(
+            UploadedFile.uploaded_by == employee_id
+        ).one()
 
-        if not employee_files:
+        if total_files == 0:
             return jsonify({
                 "available_charts": [],
                 "message": "No uploaded files found."
             }), 200
 
-        file_ids = [f.id for f in employee_files]
-
-        # Step 2: Base query for employee sales data
-        base_query = SalesData.query.filter(
-            SalesData.file_id.in_(file_ids)
-        )
-
-        total_rows = base_query.count()
-
         if total_rows == 0:
             return jsonify({
                 "available_charts": [],
@@ -406,44 +570,24 @@ def get_available_charts():
         # --------------------------------------------------
         # 3️⃣ Online vs Offline (validate sales_channel)
         # --------------------------------------------------
-        valid_channel_count = base_query.filter(
-            SalesData.sales_channel.isnot(None),
-            SalesData.sales_channel != "Unknown"
-        ).count()
-
         if valid_channel_count > 0:
             available_charts.append("online_vs_offline")
 
         # --------------------------------------------------
         # 4️⃣ Top 10 Products (validate product_name)
         # --------------------------------------------------
-        valid_product_count = base_query.filter(
-            SalesData.product_name.isnot(None),
-            SalesData.product_name != "Unknown"
-        ).count()
-
         if valid_product_count > 0:
             available_charts.append("top_10_products")
 
         # --------------------------------------------------
         # 5️⃣ Sales by State (validate state)
         # --------------------------------------------------
-        valid_state_count = base_query.filter(
-            SalesData.state.isnot(None),
-            SalesData.state != "Unknown"
-        ).count()
-
         if valid_state_count > 0:
             available_charts.append("sales_by_state")
 
         # --------------------------------------------------
         # 6️⃣ Category Performance (validate category)
         # --------------------------------------------------
-        valid_category_count = base_query.filter(
-            SalesData.category.isnot(None),
-            SalesData.category != "Unknown"
-        ).count()
-
         if valid_category_count > 0:
             available_charts.append("category_performance")
 
@@ -485,232 +629,47 @@ def generate_charts():
         claims = get_jwt()
         employee_id = claims.get("user_id")
 
-        # Get employee file IDs
-        employee_files = UploadedFile.query.filter_by(
-            uploaded_by=employee_id
-        ).all()
-
-        if not employee_files:
-            return jsonify({"error": "No uploaded files found"}), 400
-
-        file_ids = [f.id for f in employee_files]
+        # Cached per employee + data version: any ingest / delete
+        # bumps the version, so stale results are never served.
+        # Malformed filters raise here, before the cache is touched.
+        start, end = filter_date_range(filter_data)
 
-        base_query = SalesData.query.filter(
-            SalesData.file_id.in_(file_ids)
+        cache_key = chart_cache.make_key(
+            employee_id,
+            get_data_version(employee_id),
+            sorted(set(charts) & set(CHART_RENDERERS)),
+            [start, end]
         )
 
-        # -----------------------------
-        # Apply Filters
-        # -----------------------------
-        filter_type = filter_data.get("type")
-
-        if filter_type == "year":
-            year = filter_data.get("year")
-            base_query = base_query.filter(
-                func.extract("year", SalesData.order_date) == year
-            )
-
-        elif filter_type == "month":
-            year = filter_data.get("year")
-            month = filter_data.get("month")
-            base_query = base_query.filter(
-                func.extract("year", SalesData.order_date) == year,
-                func.extract("month", SalesData.order_date) == month
-            )
-
-        elif filter_type == "date_range":
-            start_date = datetime.strptime(filter_data.get("start_date"), "%Y-%m-%d")
-            end_date = datetime.strptime(filter_data.get("end_date"), "%Y-%m-%d")
-            base_query = base_query.filter(
-                SalesData.order_date.between(start_date, end_date)
-            )
-
-        response_data = {}
-
-        # =====================================================
-        # 1️⃣ Revenue Over Time
-        # =====================================================
-        if "revenue_over_time" in charts:
-            results = (
-                base_query.with_entities(
-                    func.date_format(SalesData.order_date, "%Y-%m").label("month"),
-                    func.sum(SalesData.total_amount)
-                )
-                .group_by("month")
-                .order_by("month")
-                .all()
-            )
-
-            labels = [r[0] for r in results]
-            values = [float(r[1]) for r in results]
-
-            response_data["revenue_over_time"] = {
-                "labels": labels,
-                "data": values
-            }
-
-        # =====================================================
-        # 2️⃣ Sales Volume Over Time
-        # =====================================================
-        if "sales_volume_over_time" in charts:
-            results = (
-                base_query.with_entities(
-                    func.date_format(SalesData.order_date, "%Y-%m").label("month"),
-                    func.sum(SalesData.quantity)
-                )
-                .group_by("month")
-                .order_by("month")
-                .all()
-            )
-
-            labels = [r[0] for r in results]
-            values = [int(r[1]) for r in results]
-
-            response_data["sales_volume_over_time"] = {
-                "labels": labels,
-                "data": values
-            }
-
-        # =====================================================
-        # 3️⃣ Online vs Offline (Timeline)
-        # =====================================================
-        if "online_vs_offline" in charts:
-            results = (
-                base_query.with_entities(
-                    func.date_format(SalesData.order_date, "%Y-%m").label("month"),
-                    SalesData.sales_channel,
-                    func.sum(SalesData.total_amount)
-                )
-                .filter(
-                    SalesData.sales_channel.isnot(None),
-                    SalesData.sales_channel != "Unknown"
-                )
-                .group_by("month", SalesData.sales_channel)
-                .order_by("month")
-                .all()
-            )
-
-            data_map = {}
-
-            for month, channel, value in results:
-                if month not in data_map:
-                    data_map[month] = {}
-                data_map[month][channel] = float(value)
-
-            labels = sorted(data_map.keys())
-
-            online_data = [data_map[m].get("Online", 0) for m in labels]
-            offline_data = [data_map[m].get("Offline", 0) for m in labels]
-
-            response_data["online_vs_offline"] = {
-                "labels": labels,
-                "datasets": [
-                    {"label": "Online", "data": online_data},
-                    {"label": "Offline", "data": offline_data}
-                ]
-            }
-
-        # =====================================================
-        # 4️⃣ Top 10 Products
-        # =====================================================
-        if "top_10_products" in charts:
-            results = (
-                base_query.with_entities(
-                    SalesData.product_name,
-                    func.sum(SalesData.total_amount)
-                )
-                .filter(
-                    SalesData.product_name.isnot(None),
-                    SalesData.product_name != "Unknown"
-                )
-                .group_by(SalesData.product_name)
-                .order_by(func.sum(SalesData.total_amount).desc())
-                .limit(10)
-                .all()
-            )
-
-            labels = [r[0] for r in results]
-            values = [float(r[1]) for r in results]
-
-            response_data["top_10_products"] = {
-                "labels": labels,
-                "data": values
-            }
-
-        # =====================================================
-        # 5️⃣ Sales by State
-        # =====================================================
-        if "sales_by_state" in charts:
-            results = (
-                base_query.with_entities(
-                    SalesData.state,
-                    func.sum(SalesData.total_amount)
-                )
-                .filter(
-                    SalesData.state.isnot(None),
-                    SalesData.state != "Unknown"
-                )
-                .group_by(SalesData.state)
-                .all()
-            )
+        response_data = chart_cache.get(cache_key)
 
-            labels = [r[0] for r in results]
-            values = [float(r[1]) for r in results]
-
-            response_data["sales_by_state"] = {
-                "labels": labels,
-                "data": values
-            }
-
-        # =====================================================
-        # 6️⃣ Category Performance
-        # =====================================================
-        if "category_performance" in charts:
-            results = (
-                base_query.with_entities(
-                    SalesData.category,
-                    func.sum(SalesData.total_amount)
-                )
-                .filter(
-                    SalesData.category.isnot(None),
-                    SalesData.category != "Unknown"
-                )
-                .group_by(SalesData.category)
-                .all()
-            )
-
-            labels = [r[0] for r in results]
-            values = [float(r[1]) for r in results]
+        if response_data is not None:
+            return jsonify({
+                "charts": response_data
+            }), 200, {"X-Cache": "HIT"}
 
-            response_data["category_performance"] = {
-                "labels": labels,
-                "data": values
-            }
+        has_files = db.session.query(
+            UploadedFile.query.filter_by(uploaded_by=employee_id).exists()
+        ).scalar()
 
-        # =====================================================
-        # 7️⃣ Payment Mode Distribution
-        # =====================================================
-        if "payment_mode_distribution" in charts:
-            results = (
-                base_query.with_entities(
-                    SalesData.payment_mode,
-                    func.count(SalesData.order_id)
-                )
-                .group_by(SalesData.payment_mode)
-                .all()
-            )
+        if not has_files:
+            return jsonify({"error": "No uploaded files found"}), 400
 
-            labels = [r[0] for r in results]
-            values = [int(r[1]) for r in results]
+        # Whole-month filters read the monthly rollup,
+        # other date ranges aggregate the raw rows
+        response_data = build_charts(employee_id, charts, filter_data)
 
-            response_data["payment_mode_distribution"] = {
-                "labels": labels,
-                "data": values
-            }
+        chart_cache.set(cache_key, response_data)
 
         return jsonify({
             "charts": response_data
-        }), 200
+        }), 200, {"X-Cache": "MISS"}
+
+    except ValueError as e:
+        return jsonify({
+            "error": "Invalid chart filter",
+            "details": str(e)
+        }), 400
 
     except Exception as e:
         return jsonify({
@@ -759,4 +718,116 @@ def nlp_query():
         return jsonify({
             "error": "Failed to process NLP query",
             "details": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+# ==========================================================
+# 🤖 NLP QUERY BATCH (SEVERAL QUESTIONS, SHARED DATA PASS)
+# ==========================================================
+@employee_bp.route("/nlp-query/batch", methods=["POST"])
+@jwt_required()
+@role_required(["Employee"])
+def nlp_query_batch():
+    try:
+        data = request.get_json()
+
+        if not data or not isinstance(data.get("queries"), list):
+            return jsonify({
+                "error": "queries must be a list of questions"
+            }), 400
+
+        queries = data["queries"]
+
+        if not queries:
+            return jsonify({
+                "error": "queries cannot be empty"
+            }), 400
+
+        max_queries = current_app.config.get("NLP_BATCH_MAX_QUERIES", 20)
+
+        if len(queries) > max_queries:
+            return jsonify({
+                "error": f"At most {max_queries} queries per batch"
+            }), 400
+
+        if not all(isinstance(query, str) and query.strip() for query in queries):
+            return jsonify({
+                "error": "Queries cannot be empty"
+            }), 400
+
+        queries = [query.strip() for query in queries]
+
+        # Get employee details from JWT
+        claims = get_jwt()
+        employee_id = claims.get("user_id")
+
+        # Call NLP service (answers come back in question order)
+        results = process_nlp_batch(
+            queries=queries,
+            employee_id=employee_id
+        )
+
+        return jsonify({
+            "results": [
+                {"query": query, "response": result}
+                for query, result in zip(queries, results)
+            ]
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to process NLP queries",
+            "details": str(e)
+        }), 500
+
+
+# ==========================================================
+# 🔎 AUTOCOMPLETE (PRODUCT / CATEGORY / STATE / CITY NAMES)
+# ==========================================================
+@employee_bp.route("/autocomplete", methods=["GET"])
+@jwt_required()
+@role_required(["Employee"])
+def autocomplete():
+    prefix = request.args.get("q", "").strip()
+    dimension = request.args.get("dimension")
+
+    if not prefix:
+        return jsonify({
+            "error": "q is required"
+        }), 400
+
+    if dimension is not None and dimension not in SalesValue.DIMENSIONS:
+        return jsonify({
+            "error": "Invalid dimension",
+            "allowed": SalesValue.DIMENSIONS
+        }), 400
+
+    try:
+        limit = int(request.args.get("limit", AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        return jsonify({
+            "error": "limit must be an integer"
+        }), 400
+
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+    # Only the employee's own values, like the charts they can open
+    index = value_dictionary.index(get_jwt().get("user_id"))
+
+    # Names starting with the typed text first, then close misspellings
+    matches = index.complete(prefix, dimension, limit)
+
+    if len(matches) < limit:
+        seen = {(match[0], match[1]) for match in matches}
+        matches += [
+            match for match in index.similar(prefix, dimension, limit)
+            if (match[0], match[1]) not in seen
+        ][:limit - len(matches)]
+
+    return jsonify({
+        "query": prefix,
+        "suggestions": [
+            {"dimension": match_dimension, "value": value}
+            for match_dimension, value, _ in matches
+        ]
+    }), 200
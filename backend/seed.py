@@ -2,6 +2,7 @@ import sys
 from app import create_app
 from extensions import db
 from models import Role, User
+from services.summary_counter_service import add_to_summary_counters
 
 def seed_database():
     app = create_app()
@@ -54,6 +55,7 @@ def seed_database():
                 new_admin.set_password("AdminPass123!") # Change this in production
                 
                 db.session.add(new_admin)
+                add_to_summary_counters(users=1)
                 try:
                     db.session.commit()
                     print(f"   > Admin User created: {admin_email} (Password: AdminPass123!)")
@@ -1,8 +1,10 @@
-from models import User, Role, Company
+from models import User
 from extensions import db
 from flask_jwt_extended import create_access_token
 from werkzeug.security import check_password_hash
 from services.audit_service import log_event
+from services.summary_counter_service import add_to_summary_counters
+from services.reference_data_service import reference_data
 
 def register_user(data):
     if not data:
@@ -26,15 +28,15 @@ def register_user(data):
         return {"error": "User already exists"}, 400
 
     # Validate role
-    role = Role.query.filter_by(name=role_name).first()
-    if not role:
+    role_id = reference_data.role_id(role_name)
+    if not role_id:
         return {"error": "Invalid role specified"}, 400
 
     # Company validation
-    if role.name in ['Company Manager', 'Employee'] and not company_id:
+    if role_name in ['Company Manager', 'Employee'] and not company_id:
         return {"error": "Company ID required for this role"}, 400
 
-    if role.name == 'Admin':
+    if role_name == 'Admin':
         company_id = None  # Admins don't belong to a company
 
     # Password validation
@@ -45,12 +47,17 @@ def register_user(data):
     new_user = User(
         username=username,
         email=email,
-        role_id=role.id,
+        role_id=role_id,
         company_id=company_id
     )
     new_user.set_password(password)
 
     db.session.add(new_user)
+    add_to_summary_counters(
+        company_id=company_id,
+        users=1,
+        employees=1 if role_name == 'Employee' else 0
+    )
     db.session.commit()
 
     return {"message": "User registered successfully"}, 201
@@ -77,20 +84,24 @@ def login_user(data):
     # 🔐 Company-level account restrictions
     # --------------------------------------------------
 
+    role_name = reference_data.role_name(user.role_id)
+
     if user.company_id is not None:
 
-        if not user.company:
+        company = reference_data.company(user.company_id)
+
+        if not company:
             log_event("LOGIN_BLOCKED", f"User {email} attempted login but company not found")
             return {"error": "Company not found"}, 403
 
-        if not user.company.is_active:
+        if not company.is_active:
             log_event(
                 "LOGIN_BLOCKED",
-                f"Login blocked for {email} (Company suspended: {user.company.name})"
+                f"Login blocked for {email} (Company suspended: {company.name})"
             )
             return {"error": "Company is suspended. Contact admin."}, 403
 
-        if user.role.name == "Company Manager":
+        if role_name == "Company Manager":
             if not user.is_verified:
                 log_event(
                     "LOGIN_BLOCKED",
@@ -106,17 +117,17 @@ def login_user(data):
         identity=user.email,
         additional_claims={
             "user_id": user.id,
-            "role": user.role.name,
+            "role": role_name,
             "company_id": user.company_id
         }
     )
 
     log_event(
         "LOGIN_SUCCESS",
-        f"User {email} logged in successfully (Role: {user.role.name})"
+        f"User {email} logged in successfully (Role: {role_name})"
     )
 
     return {
         "token": access_token,
-        "role": user.role.name
+        "role": role_name
     }, 200
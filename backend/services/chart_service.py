@@ -0,0 +1,561 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    Integer,
+    String,
+    cast,
+    func,
+    literal,
+    null,
+    select,
+    tuple_,
+    union_all
+)
+
+from extensions import db
+from models import SalesData, SalesRollup
+
+
+# =====================================================
+# FILTER → DATE RANGE / MONTH SPAN
+# =====================================================
+
+ALL_MONTHS = (None, None)
+
+
+def month_label(month):
+    # 202403 → "2024-03"
+    return f"{month // 100:04d}-{month % 100:02d}"
+
+
+def _month_start(year, month):
+    return datetime(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+def filter_date_range(filter_data):
+    """
+    Half-open [start, end) datetimes for a chart filter, so order_date
+    is compared as a plain indexed column (no extract() around it).
+    Returns ALL_MONTHS when there is no filter; raises ValueError
+    for malformed filter values.
+    """
+
+    filter_type = filter_data.get("type")
+
+    try:
+        if filter_type == "year":
+            year = int(filter_data.get("year"))
+            return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+        if filter_type == "month":
+            year = int(filter_data.get("year"))
+            month = int(filter_data.get("month"))
+
+            if not 1 <= month <= 12:
+                raise ValueError(f"month out of range: {month}")
+
+            return _month_start(year, month), _month_start(year, month + 1)
+
+        if filter_type == "date_range":
+            start_date = datetime.strptime(filter_data.get("start_date"), "%Y-%m-%d")
+            end_date = datetime.strptime(filter_data.get("end_date"), "%Y-%m-%d")
+            # end_date is inclusive: the whole end day counts
+            return start_date, end_date + timedelta(days=1)
+
+    except TypeError as e:
+        raise ValueError(str(e))
+
+    return ALL_MONTHS
+
+
+def rollup_month_span(filter_data):
+    """
+    (first_month, last_month) as YYYYMM when the filter covers whole
+    calendar months, ALL_MONTHS when there is no filter, and None when
+    the filter cuts through a month (raw rows are needed then).
+    """
+
+    start, end = filter_date_range(filter_data)
+
+    if start is None:
+        return ALL_MONTHS
+
+    if start.day != 1 or end.day != 1:
+        return None
+
+    last = end - timedelta(days=1)
+
+    return (
+        start.year * 100 + start.month,
+        last.year * 100 + last.month
+    )
+
+
+# =====================================================
+# CHART SOURCES (RAW ROWS / MONTHLY ROLLUP)
+# =====================================================
+
+class RawChartSource:
+    """
+    Aggregates straight from sales_data rows.
+    """
+
+    name = "sales_data"
+
+    def __init__(self, uploaded_by, filter_data):
+        query = SalesData.query.filter(
+            SalesData.uploaded_by == uploaded_by
+        )
+
+        start, end = filter_date_range(filter_data)
+
+        if start is not None:
+            query = query.filter(
+                SalesData.order_date >= start,
+                SalesData.order_date < end
+            )
+
+        self.query = query
+
+        self.month = SalesData.order_month
+        self.revenue = func.sum(SalesData.total_amount)
+        self.volume = func.sum(SalesData.quantity)
+        # order_id is NOT NULL: count(*) keeps the payment index covering
+        self.orders = func.count()
+
+    def column(self, name):
+        return getattr(SalesData, name)
+
+
+class RollupChartSource:
+    """
+    Aggregates from sales_rollup (one row per file / month / dimensions),
+    for filters made of whole months.
+    """
+
+    name = "sales_rollup"
+
+    def __init__(self, uploaded_by, month_span):
+        query = SalesRollup.query.filter(
+            SalesRollup.uploaded_by == uploaded_by
+        )
+
+        first_month, last_month = month_span
+
+        if first_month is not None:
+            query = query.filter(SalesRollup.month >= first_month)
+
+        if last_month is not None:
+            query = query.filter(SalesRollup.month <= last_month)
+
+        self.query = query
+
+        self.month = SalesRollup.month
+        self.revenue = func.sum(SalesRollup.total_amount)
+        self.volume = func.sum(SalesRollup.quantity)
+        self.orders = func.sum(SalesRollup.order_count)
+
+    def column(self, name):
+        return getattr(SalesRollup, name)
+
+
+def chart_source(uploaded_by, filter_data):
+    month_span = rollup_month_span(filter_data)
+
+    if month_span is None:
+        return RawChartSource(uploaded_by, filter_data)
+
+    return RollupChartSource(uploaded_by, month_span)
+
+
+# =====================================================
+# QUERY PLANNER
+# =====================================================
+
+# What each chart groups by, and the measure it plots
+CHART_SPECS = {
+    "revenue_over_time": (("month",), "revenue"),
+    "sales_volume_over_time": (("month",), "volume"),
+    "online_vs_offline": (("month", "sales_channel"), "revenue"),
+    "top_10_products": (("product_name",), "revenue"),
+    "sales_by_state": (("state",), "revenue"),
+    "category_performance": (("category",), "revenue"),
+    "payment_mode_distribution": (("payment_mode",), "orders")
+}
+
+# Charts that leave out missing / "Unknown" values of a dimension
+KNOWN_VALUES_ONLY = {
+    "online_vs_offline": "sales_channel",
+    "top_10_products": "product_name",
+    "sales_by_state": "state",
+    "category_performance": "category"
+}
+
+MEASURES = ["revenue", "volume", "orders"]
+
+MEASURE_TYPES = {
+    "revenue": Float,
+    "volume": BigInteger,
+    "orders": BigInteger
+}
+
+# Grouping by one of these on top costs a handful of extra rows, so a
+# chart grouped by a subset (revenue per month) is folded into the
+# wider grouping (revenue per month and channel) and re-summed here
+LOW_CARDINALITY_DIMENSIONS = {"sales_channel", "payment_mode"}
+
+TOP_PRODUCTS_LIMIT = 10
+
+
+class ChartQueryPlan:
+    """
+    The groupings to fetch for a chart set and, per grouping, the
+    measures needed. `chart_groupings` tells each chart which fetched
+    grouping it is rendered from.
+    """
+
+    def __init__(self, charts):
+        specs = {
+            chart: spec
+            for chart, spec in CHART_SPECS.items()
+            if chart in charts
+        }
+
+        wanted = {grouping for grouping, _ in specs.values()}
+
+        self.chart_groupings = {
+            chart: self._fold(grouping, wanted)
+            for chart, (grouping, _) in specs.items()
+        }
+
+        self.groupings = {}
+
+        for chart, (_, measure) in specs.items():
+            grouping = self.chart_groupings[chart]
+            self.groupings.setdefault(grouping, set()).add(measure)
+
+        # Per grouping: a dimension whose unknown values no reader needs
+        # (filtered in SQL), and a LIMIT when top products is the only reader
+        self.known_only = {}
+        self.limits = {}
+
+        for grouping in self.groupings:
+            readers = [c for c, g in self.chart_groupings.items() if g == grouping]
+            dimensions = {KNOWN_VALUES_ONLY.get(chart) for chart in readers}
+
+            if len(dimensions) == 1 and None not in dimensions:
+                self.known_only[grouping] = dimensions.pop()
+
+            if readers == ["top_10_products"]:
+                self.limits[grouping] = TOP_PRODUCTS_LIMIT
+
+    @staticmethod
+    def _fold(grouping, wanted):
+        wider = [
+            other for other in wanted
+            if set(grouping) < set(other)
+            and set(other) - set(grouping) <= LOW_CARDINALITY_DIMENSIONS
+        ]
+
+        if not wider:
+            return grouping
+
+        return min(wider, key=len)
+
+
+def _grouping_expression(source, name):
+    if name == "month":
+        return source.month
+
+    return source.column(name)
+
+
+def _known_filter(source, name):
+    if name is None:
+        return []
+
+    column = source.column(name)
+    return [column.isnot(None), column != "Unknown"]
+
+
+def _measure_expressions(source, measures):
+    return [
+        (
+            getattr(source, measure)
+            if measure in measures
+            else cast(null(), MEASURE_TYPES[measure])
+        ).label(measure)
+        for measure in MEASURES
+    ]
+
+
+def _fetch_union(source, plan):
+    """
+    One statement: a UNION ALL of one GROUP BY per grouping, each able
+    to use the covering index for its dimension.
+    """
+
+    groupings = list(plan.groupings)
+    selects = []
+
+    for grouping_id, grouping in enumerate(groupings):
+        month = (
+            source.month if "month" in grouping
+            else cast(null(), Integer)
+        )
+
+        dimensions = [name for name in grouping if name != "month"]
+        dimension = (
+            source.column(dimensions[0]) if dimensions
+            else cast(null(), String)
+        )
+
+        stmt = (
+            source.query.with_entities(
+                literal(grouping_id).label("grouping_id"),
+                month.label("month"),
+                dimension.label("dimension"),
+                *_measure_expressions(source, plan.groupings[grouping])
+            )
+            .filter(*_known_filter(source, plan.known_only.get(grouping)))
+            .group_by(*[_grouping_expression(source, name) for name in grouping])
+            .statement
+        )
+
+        limit = plan.limits.get(grouping)
+
+        if limit:
+            ranked = stmt.order_by(source.revenue.desc()).limit(limit).subquery()
+            stmt = select(*ranked.c)
+
+        selects.append(stmt)
+
+    statement = selects[0] if len(selects) == 1 else union_all(*selects)
+
+    results = {grouping: [] for grouping in groupings}
+
+    for row in db.session.execute(statement):
+        grouping = groupings[row.grouping_id]
+
+        key = tuple(
+            row.month if name == "month" else row.dimension
+            for name in grouping
+        )
+
+        results[grouping].append((key, row.revenue, row.volume, row.orders))
+
+    return results
+
+
+def _fetch_grouping_sets(source, plan):
+    """
+    One statement, one scan: GROUP BY GROUPING SETS over every grouping,
+    GROUPING() tells the sets apart.
+    """
+
+    groupings = list(plan.groupings)
+
+    names = []
+    for grouping in groupings:
+        for name in grouping:
+            if name not in names:
+                names.append(name)
+
+    expressions = {name: _grouping_expression(source, name) for name in names}
+
+    measures = set().union(*plan.groupings.values())
+
+    statement = source.query.with_entities(
+        *[expressions[name].label(name) for name in names],
+        *[func.grouping(expressions[name]).label(f"grouping_{name}") for name in names],
+        *_measure_expressions(source, measures)
+    ).group_by(
+        func.grouping_sets(*[
+            tuple_(*[expressions[name] for name in grouping])
+            for grouping in groupings
+        ])
+    )
+
+    by_columns = {frozenset(grouping): grouping for grouping in groupings}
+    results = {grouping: [] for grouping in groupings}
+
+    for row in statement.all():
+        row = row._mapping
+
+        active = frozenset(
+            name for name in names
+            if row[f"grouping_{name}"] == 0
+        )
+        grouping = by_columns[active]
+
+        key = tuple(row[name] for name in grouping)
+
+        results[grouping].append((key, row["revenue"], row["volume"], row["orders"]))
+
+    return results
+
+
+def fetch_chart_rows(source, plan):
+    """
+    Aggregated rows per planned grouping: [(key, revenue, volume, orders)].
+    """
+
+    if len(plan.groupings) > 1 and db.engine.dialect.name == "postgresql":
+        return _fetch_grouping_sets(source, plan)
+
+    return _fetch_union(source, plan)
+
+
+def _regroup(rows, grouping, target):
+    """
+    Re-sum rows fetched for `grouping` down to the narrower `target`.
+    """
+
+    if grouping == target:
+        return rows
+
+    positions = [grouping.index(name) for name in target]
+    merged = {}
+
+    for key, *measures in rows:
+        new_key = tuple(key[i] for i in positions)
+        totals = merged.setdefault(new_key, [None] * len(measures))
+
+        for i, value in enumerate(measures):
+            if value is not None:
+                totals[i] = value if totals[i] is None else totals[i] + value
+
+    return [(key, *totals) for key, totals in merged.items()]
+
+
+# =====================================================
+# CHART RENDERERS (same JSON shapes as before)
+# =====================================================
+
+def _known(value):
+    return value is not None and value != "Unknown"
+
+
+def revenue_over_time(rows):
+    rows = sorted(rows, key=lambda r: r[0])
+
+    return {
+        "labels": [month_label(key[0]) for key, *_ in rows],
+        "data": [float(revenue) for _, revenue, _, _ in rows]
+    }
+
+
+def sales_volume_over_time(rows):
+    rows = sorted(rows, key=lambda r: r[0])
+
+    return {
+        "labels": [month_label(key[0]) for key, *_ in rows],
+        "data": [int(volume) for _, _, volume, _ in rows]
+    }
+
+
+def online_vs_offline(rows):
+    data_map = {}
+
+    for (month, channel), revenue, _, _ in rows:
+        if not _known(channel):
+            continue
+
+        month = month_label(month)
+        if month not in data_map:
+            data_map[month] = {}
+        data_map[month][channel] = float(revenue)
+
+    labels = sorted(data_map.keys())
+
+    online_data = [data_map[m].get("Online", 0) for m in labels]
+    offline_data = [data_map[m].get("Offline", 0) for m in labels]
+
+    return {
+        "labels": labels,
+        "datasets": [
+            {"label": "Online", "data": online_data},
+            {"label": "Offline", "data": offline_data}
+        ]
+    }
+
+
+def top_10_products(rows):
+    rows = sorted(
+        (row for row in rows if _known(row[0][0])),
+        key=lambda r: r[1],
+        reverse=True
+    )[:TOP_PRODUCTS_LIMIT]
+
+    return {
+        "labels": [key[0] for key, *_ in rows],
+        "data": [float(revenue) for _, revenue, _, _ in rows]
+    }
+
+
+def _revenue_by(rows):
+    rows = [row for row in rows if _known(row[0][0])]
+
+    return {
+        "labels": [key[0] for key, *_ in rows],
+        "data": [float(revenue) for _, revenue, _, _ in rows]
+    }
+
+
+def sales_by_state(rows):
+    return _revenue_by(rows)
+
+
+def category_performance(rows):
+    return _revenue_by(rows)
+
+
+def payment_mode_distribution(rows):
+    return {
+        "labels": [key[0] for key, *_ in rows],
+        "data": [int(orders) for _, _, _, orders in rows]
+    }
+
+
+CHART_RENDERERS = {
+    "revenue_over_time": revenue_over_time,
+    "sales_volume_over_time": sales_volume_over_time,
+    "online_vs_offline": online_vs_offline,
+    "top_10_products": top_10_products,
+    "sales_by_state": sales_by_state,
+    "category_performance": category_performance,
+    "payment_mode_distribution": payment_mode_distribution
+}
+
+
+def build_charts(uploaded_by, charts, filter_data):
+    """
+    Chart payloads for `charts` over the data uploaded by employee
+    `uploaded_by`, keyed by chart name. Whole-month
+    filters are answered from sales_rollup, anything else from the
+    raw sales_data rows; all charts share one planned statement.
+    Unknown chart names are ignored.
+    """
+
+    source = chart_source(uploaded_by, filter_data)
+    plan = ChartQueryPlan(charts)
+
+    if not plan.groupings:
+        return {}
+
+    rows = fetch_chart_rows(source, plan)
+
+    response_data = {}
+
+    for chart, renderer in CHART_RENDERERS.items():
+        if chart not in plan.chart_groupings:
+            continue
+
+        grouping = plan.chart_groupings[chart]
+        target = CHART_SPECS[chart][0]
+
+        response_data[chart] = renderer(_regroup(rows[grouping], grouping, target))
+
+    return response_data
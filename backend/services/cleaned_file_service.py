@@ -0,0 +1,202 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from flask import current_app
+
+
+# =====================================================
+# CLEANED FILE LAYOUT
+# =====================================================
+
+CLEANED_DIR = os.path.join("uploads", "cleaned_files")
+
+# Typed schema for the logical sales columns; any other CSV column is
+# carried along as a nullable string
+CLEANED_SCHEMA_FIELDS = [
+    ("order_id", pa.string()),
+    ("order_date", pa.timestamp("us")),
+    ("product_id", pa.string()),
+    ("quantity", pa.float64()),
+    ("unit_price", pa.float64()),
+    ("total_amount", pa.float64()),
+    ("payment_mode", pa.string()),
+    ("product_name", pa.string()),
+    ("category", pa.string()),
+    ("sales_channel", pa.string()),
+    ("state", pa.string()),
+    ("city", pa.string())
+]
+
+DEFAULT_CLEANED_FILE_FORMAT = "parquet"
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+
+
+def cleaned_file_path(uploaded_file_id, file_format):
+    return os.path.join(CLEANED_DIR, f"cleaned_{uploaded_file_id}.{file_format}")
+
+
+def _as_nullable_text(values):
+    return values.astype(str).where(values.notna(), None)
+
+
+# =====================================================
+# STREAMING WRITER
+# =====================================================
+
+class CleanedFileWriter:
+    """
+    Writes cleaned chunks to uploads/cleaned_files/cleaned_<id>.<fmt>.
+
+    Parquet (default): one row group per chunk, typed columns,
+    compression and column statistics, so readers can load only the
+    columns / row groups they need. CSV is kept for CLEANED_FILE_FORMAT=csv.
+
+    Chunks go to a ".part" file that replaces the cleaned file on
+    close(); abort() (or leaving a `with` block on an exception) closes
+    the writer and removes it, so a failed run never leaves a truncated
+    file behind or clobbers the previous one.
+    """
+
+    def __init__(self, uploaded_file_id, file_format=None):
+        if file_format is None:
+            file_format = current_app.config.get(
+                "CLEANED_FILE_FORMAT",
+                DEFAULT_CLEANED_FILE_FORMAT
+            )
+
+        os.makedirs(CLEANED_DIR, exist_ok=True)
+
+        self.file_format = file_format
+        self.path = cleaned_file_path(uploaded_file_id, file_format)
+        self._partial_path = self.path + ".part"
+
+        self._schema = None
+        self._columns = None
+        self._parquet_writer = None
+        self._csv_header_written = False
+
+    def _build_schema(self, frame):
+        typed = dict(CLEANED_SCHEMA_FIELDS)
+        fields = [pa.field(name, dtype) for name, dtype in CLEANED_SCHEMA_FIELDS]
+
+        for column in frame.columns:
+            if column not in typed:
+                fields.append(pa.field(str(column), pa.string()))
+
+        self._schema = pa.schema(fields)
+        self._columns = [field.name for field in fields]
+
+    def _to_table(self, frame):
+        frame = frame.reindex(columns=self._columns)
+
+        for field in self._schema:
+            column = field.name
+
+            if pa.types.is_string(field.type):
+                frame[column] = _as_nullable_text(frame[column])
+            elif pa.types.is_timestamp(field.type):
+                frame[column] = pd.to_datetime(frame[column])
+            else:
+                frame[column] = pd.to_numeric(frame[column], errors="coerce")
+
+        return pa.Table.from_pandas(
+            frame,
+            schema=self._schema,
+            preserve_index=False,
+            safe=False
+        )
+
+    def write(self, frame):
+        if self._schema is None:
+            self._build_schema(frame)
+
+        if self.file_format == "csv":
+            frame.reindex(columns=self._columns).to_csv(
+                self._partial_path,
+                index=False,
+                mode="a" if self._csv_header_written else "w",
+                header=not self._csv_header_written
+            )
+            self._csv_header_written = True
+            return
+
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(
+                self._partial_path,
+                self._schema,
+                compression=current_app.config.get(
+                    "PARQUET_COMPRESSION",
+                    DEFAULT_PARQUET_COMPRESSION
+                ),
+                write_statistics=True
+            )
+
+        self._parquet_writer.write_table(self._to_table(frame))
+
+    def close(self):
+        # Nothing survived cleaning: still leave an (empty) file behind
+        if self._schema is None:
+            self.write(pd.DataFrame(columns=[name for name, _ in CLEANED_SCHEMA_FIELDS]))
+
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+        os.replace(self._partial_path, self.path)
+
+    def abort(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+        if os.path.exists(self._partial_path):
+            os.remove(self._partial_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+# =====================================================
+# READERS
+# =====================================================
+
+def read_cleaned_file(path, columns=None):
+    """
+    Load a cleaned file; `columns` limits what is read from Parquet.
+    """
+
+    if path.endswith(".csv"):
+        return pd.read_csv(path, usecols=columns)
+
+    return pd.read_parquet(path, columns=columns)
+
+
+def iter_cleaned_csv(path, batch_size=50000):
+    """
+    Yield a cleaned file as CSV text, one record batch at a time,
+    for on-demand exports of Parquet output.
+    """
+
+    if path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line
+        return
+
+    parquet_file = pq.ParquetFile(path)
+    header = True
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield batch.to_pandas().to_csv(index=False, header=header)
+        header = False
+
+    if header:
+        yield ",".join(parquet_file.schema_arrow.names) + "\n"
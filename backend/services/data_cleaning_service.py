@@ -1,14 +1,24 @@
-import os
+import numpy as np
 import pandas as pd
 import re
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from extensions import db
 from models import SalesData, UploadedFile
-from sqlalchemy.exc import IntegrityError
+from services.cleaned_file_service import CleanedFileWriter
+from services.ingest_progress import IngestProgress
+from services.parse_cache_service import iter_parse_cache
+from services.sales_rollup_service import add_to_sales_rollup, month_key
+from services.data_version_service import bump_data_version
+from services.summary_counter_service import add_to_summary_counters
+from services.value_dictionary_service import add_to_value_dictionary
+from utils.sql_helpers import insert_skip_duplicates
 
 
 # =====================================================
-# CLEANING HELPERS (UNCHANGED)
+# CLEANING HELPERS (PER VALUE)
 # =====================================================
 
 def clean_amount(value):
@@ -36,13 +46,297 @@ def clean_sale_date(value):
         return None
 
 
+# =====================================================
+# COLUMN-LEVEL PARSERS (VECTORIZED HELPERS)
+# =====================================================
+
+# Tried in order; the first format that parses the whole sample wins,
+# otherwise the one parsing the most sample values. Day-first formats
+# come before month-first ones, matching clean_sale_date(dayfirst=True).
+DATE_FORMAT_CANDIDATES = [
+    "ISO8601",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+    "%d-%m-%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%d-%m-%y",
+    "%d/%m/%y",
+    "%m/%d/%Y",
+    "%m-%d-%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%d-%b-%Y",
+    "%d-%b-%y",
+    "%b %d %Y",
+    "%B %d %Y"
+]
+
+# A column sniffed as month-first may still hold dates valid both ways
+# ("03/04/2024"): those are read day-first, like clean_sale_date, and
+# only the rest ("12/25/2024") month-first
+DAY_FIRST_COUNTERPARTS = {
+    "%m/%d/%Y": "%d/%m/%Y",
+    "%m-%d-%Y": "%d-%m-%Y",
+    "%m/%d/%Y %H:%M": "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S": "%d/%m/%Y %H:%M:%S"
+}
+
+DATE_SNIFF_SAMPLE_SIZE = 500
+
+
+def parse_amount_column(values):
+    """
+    Column version of clean_amount: one regex replace + to_numeric.
+    """
+    digits = values.astype(str).str.replace(r"[^\d.]", "", regex=True)
+    parsed = pd.to_numeric(digits, errors="coerce").astype("float64")
+    return parsed.where(values.notna())
+
+
+def _date_text(values):
+    text = values.astype(str).str.strip()
+    return text.where(values.notna() & (text != ""))
+
+
+def sniff_date_format(values, sample_size=DATE_SNIFF_SAMPLE_SIZE):
+    """
+    Pick one explicit date format for a column from a sample of its
+    non-empty values. Returns None when nothing in the sample parses.
+    """
+
+    sample = _date_text(values).dropna()
+    sample = sample.drop_duplicates().head(sample_size)
+
+    if sample.empty:
+        return None
+
+    best_format = None
+    best_hits = 0
+
+    for date_format in DATE_FORMAT_CANDIDATES:
+        try:
+            parsed = pd.to_datetime(sample, format=date_format, errors="coerce")
+        except (ValueError, TypeError):
+            continue
+
+        hits = int(parsed.notna().sum())
+
+        if hits > best_hits:
+            best_format = date_format
+            best_hits = hits
+
+        if hits == len(sample):
+            break
+
+    return best_format
+
+
+def _to_naive_utc(parsed):
+    if getattr(parsed.dt, "tz", None) is not None:
+        return parsed.dt.tz_convert(None)
+    return parsed
+
+
+def _parse_with_format(text, date_format):
+    try:
+        return _to_naive_utc(
+            pd.to_datetime(text, format=date_format, errors="coerce")
+        )
+    except (ValueError, TypeError):
+        return pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+
+
+def parse_sale_date_column(values, date_format=None):
+    """
+    Column version of clean_sale_date.
+
+    One vectorized to_datetime with an explicit (sniffed) format; only
+    the values that fail it go through the per-value parser, once per
+    distinct value.
+    """
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return _to_naive_utc(values)
+
+    text = _date_text(values)
+
+    if date_format is None:
+        date_format = sniff_date_format(text)
+
+    if date_format in DAY_FIRST_COUNTERPARTS:
+        parsed = _parse_with_format(text, DAY_FIRST_COUNTERPARTS[date_format])
+        month_first = parsed.isna() & text.notna()
+
+        if month_first.any():
+            parsed = parsed.astype("datetime64[ns]")
+            parsed.loc[month_first] = _parse_with_format(text[month_first], date_format)
+    elif date_format is not None:
+        parsed = _parse_with_format(text, date_format)
+    else:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+
+    failed = parsed.isna() & text.notna()
+
+    if failed.any():
+        fallback = {
+            value: clean_sale_date(value)
+            for value in text[failed].unique()
+        }
+        recovered = pd.to_datetime(
+            text[failed].map(fallback),
+            errors="coerce"
+        )
+        parsed = parsed.astype("datetime64[ns]")
+        parsed.loc[failed] = _to_naive_utc(recovered)
+
+    return parsed
+
+
 # =====================================================
 # PHASE 2️⃣ – CLEAN CSV
 # =====================================================
 
-def clean_sales_csv(file_path, column_mapping):
+DEFAULT_CLEANING_CHUNK_SIZE = 50000
+
+
+class SeenOrderIds:
+    """
+    Compact "seen" set for order_id de-duplication across chunks.
+
+    Stores each normalized order_id itself as fixed-width UTF-8 bytes
+    (about one byte per character, no per-string object) in a few
+    sorted NumPy runs that are merged as they grow, so lookups are a
+    handful of binary searches, memory stays far below a Python set
+    of strings, and two distinct ids can never be taken for one.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(run.size for run in self._runs)
+
+    @staticmethod
+    def encode_ids(order_ids):
+        return np.array(
+            order_ids.astype(str).str.encode("utf-8").tolist(),
+            dtype=bytes
+        )
+
+    def contains(self, ids):
+        mask = np.zeros(ids.size, dtype=bool)
+
+        for run in self._runs:
+            positions = np.searchsorted(run, ids)
+            positions[positions == run.size] = 0
+            mask |= run[positions] == ids
+
+        return mask
+
+    def add(self, ids):
+        if ids.size == 0:
+            return
+
+        self._runs.append(np.unique(ids))
+
+        # Keep run sizes geometric → O(log n) runs to search
+        while (
+            len(self._runs) > 1 and
+            self._runs[-2].size <= 2 * self._runs[-1].size
+        ):
+            newest = self._runs.pop()
+            previous = self._runs.pop()
+            self._runs.append(np.union1d(previous, newest))
+
+
+class CleaningState:
+    """
+    Cross-chunk state while cleaning one file in streaming mode.
+    """
+
+    def __init__(self):
+        self.seen_order_ids = SeenOrderIds()
+        self.date_format = None
+
+
+def empty_cleaning_stats():
+    return {
+        "rows_before": 0,
+        "rows_after": 0,
+        "duplicates_removed": 0,
+        "invalid_rows_removed": 0
+    }
+
+
+def read_raw_chunks(file_path, chunksize=None):
+    """
+    Yield the raw CSV as DataFrames of at most `chunksize` rows.
+    Without a chunksize the whole file is yielded as one frame.
+    `file_path` may also point at an Arrow parse cache of the CSV.
+    """
+
+    if file_path.endswith(".arrow"):
+        yield from iter_parse_cache(file_path, chunksize)
+        return
+
+    if not chunksize:
+        yield pd.read_csv(file_path)
+        return
+
+    with pd.read_csv(file_path, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def recover_numeric_columns(df):
+    """
+    Recover quantity / unit_price / total_amount with column masks:
+
+    - quantity   = total / price   when quantity is missing, price > 0
+    - unit_price = total / qty     when price is missing, qty > 0
+    - total      = qty * price     whenever both are known
+
+    Same arithmetic as the old row-wise recover_numeric, so results
+    are bit-identical, without building a Series per row.
+    """
+
+    qty = pd.to_numeric(df["quantity"], errors="coerce")
+    price = pd.to_numeric(df["unit_price"], errors="coerce")
+    total = pd.to_numeric(df["total_amount"], errors="coerce")
+
+    recover_qty = qty.isna() & price.notna() & total.notna() & (price > 0)
+    recover_price = price.isna() & qty.notna() & total.notna() & (qty > 0)
+
+    # Both rules read the original values: a row can match only one of
+    # them (price known vs missing), so the order does not matter
+    qty = qty.mask(recover_qty, total / price)
+    price = price.mask(recover_price, total / qty)
+
+    known = qty.notna() & price.notna()
+    total = total.mask(known, qty * price)
+
+    df["quantity"] = qty
+    df["unit_price"] = price
+    df["total_amount"] = total
+
+    return df
+
+
+def clean_sales_frame(df, column_mapping, state=None):
+    """
+    Run rename → normalize → dedupe → recover → validate on one frame.
+
+    `state` (CleaningState) carries the order_ids kept by earlier chunks,
+    so the first occurrence across the whole file wins like
+    drop_duplicates, and the date format sniffed from the first chunk.
+    """
 
-    df = pd.read_csv(file_path)
     rows_before = len(df)
 
     # Rename
@@ -57,6 +351,14 @@ def clean_sales_csv(file_path, column_mapping):
     df["order_id"] = df["order_id"].astype(str).str.strip()
     df["order_id"] = df["order_id"].str.replace(r"\.0$", "", regex=True)
 
+    # Normalize product_id the same way: chunks may infer int or float
+    product_ids = df["product_id"]
+    df["product_id"] = (
+        product_ids.astype(str).str.strip()
+        .str.replace(r"\.0$", "", regex=True)
+        .where(product_ids.notna())
+    )
+
     # Ensure optional columns exist
     optional_columns = [
         "product_name",
@@ -73,15 +375,28 @@ def clean_sales_csv(file_path, column_mapping):
     # Drop missing order_id
     df = df.dropna(subset=["order_id"])
 
-    # Deduplicate inside file
+    # Deduplicate inside file (this chunk + every earlier chunk)
     before_duplicates = len(df)
     df = df.drop_duplicates(subset=["order_id"])
+
+    if state is not None:
+        order_ids = SeenOrderIds.encode_ids(df["order_id"])
+        already_seen = state.seen_order_ids.contains(order_ids)
+        df = df[~already_seen]
+        state.seen_order_ids.add(order_ids[~already_seen])
+
     duplicates_removed = before_duplicates - len(df)
 
     # Clean numeric/date
-    df["unit_price"] = df["unit_price"].apply(clean_amount)
+    date_format = None
+    if state is not None:
+        if state.date_format is None:
+            state.date_format = sniff_date_format(df["order_date"])
+        date_format = state.date_format
+
+    df["unit_price"] = parse_amount_column(df["unit_price"])
     df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce")
-    df["order_date"] = df["order_date"].apply(clean_sale_date)
+    df["order_date"] = parse_sale_date_column(df["order_date"], date_format)
 
     if "total_amount" in df.columns:
         df["total_amount"] = pd.to_numeric(df["total_amount"], errors="coerce")
@@ -89,23 +404,7 @@ def clean_sales_csv(file_path, column_mapping):
         df["total_amount"] = None
 
     # Recovery logic
-    def recover_numeric(row):
-        qty = row["quantity"]
-        price = row["unit_price"]
-        total = row["total_amount"]
-
-        if pd.isna(qty) and pd.notna(price) and pd.notna(total) and price > 0:
-            row["quantity"] = total / price
-
-        if pd.isna(price) and pd.notna(qty) and pd.notna(total) and qty > 0:
-            row["unit_price"] = total / qty
-
-        if pd.notna(row["quantity"]) and pd.notna(row["unit_price"]):
-            row["total_amount"] = row["quantity"] * row["unit_price"]
-
-        return row
-
-    df = df.apply(recover_numeric, axis=1)
+    df = recover_numeric_columns(df)
 
     # String normalization
     string_columns = [
@@ -153,82 +452,435 @@ def clean_sales_csv(file_path, column_mapping):
     return df, stats
 
 
+def iter_clean_sales_csv(file_path, column_mapping, stats, chunksize=None):
+    """
+    Streaming mode: read `chunksize` rows at a time, clean each chunk
+    and yield it. Totals are accumulated into `stats` as chunks pass,
+    so peak memory depends on the chunk size, not the file size.
+    """
+
+    state = CleaningState() if chunksize else None
+
+    for raw_chunk in read_raw_chunks(file_path, chunksize):
+        cleaned_chunk, chunk_stats = clean_sales_frame(
+            raw_chunk,
+            column_mapping,
+            state
+        )
+
+        for key, value in chunk_stats.items():
+            stats[key] += value
+
+        yield cleaned_chunk
+
+
+def clean_sales_csv(file_path, column_mapping):
+
+    stats = empty_cleaning_stats()
+
+    frames = list(iter_clean_sales_csv(file_path, column_mapping, stats))
+    df = frames[0]
+
+    return df, stats
+
+
 # =====================================================
-# PHASE 3️⃣ – STORE + SAVE CLEANED CSV
+# PHASE 3️⃣ – BULK INSERT ENGINE
+# =====================================================
+
+DEFAULT_INSERT_BATCH_SIZE = 5000
+DEFAULT_EXISTING_ORDERS_LOOKUP_SIZE = 1000
+
+
+def fetch_existing_order_ids(company_id, order_ids, lookup_size=None):
+    """
+    order_id -> file_id of the company's stored orders among `order_ids`,
+    looked up in IN-batches of `lookup_size` on the (order_id,
+    company_id) unique index.
+    """
+
+    if lookup_size is None:
+        lookup_size = current_app.config.get(
+            "EXISTING_ORDERS_LOOKUP_SIZE",
+            DEFAULT_EXISTING_ORDERS_LOOKUP_SIZE
+        )
+
+    existing = {}
+
+    for start in range(0, len(order_ids), lookup_size):
+        batch = order_ids[start:start + lookup_size]
+
+        existing.update(db.session.execute(
+            select(SalesData.order_id, SalesData.file_id).where(
+                SalesData.company_id == company_id,
+                SalesData.order_id.in_(batch)
+            )
+        ).all())
+
+    return existing
+
+
+def drop_existing_orders(cleaned_df, company_id, uploaded_file_id):
+    """
+    Anti-join a cleaned chunk against the company's stored orders,
+    so rows from earlier uploads never reach the INSERT.
+
+    Rows the same file stored in an earlier attempt of its job (chunks
+    commit one by one, a retried job starts over) are dropped too, but
+    counted apart: they are this file's rows, not duplicates.
+
+    Matching is exact on every dialect. Ids only the collation treats
+    as equal (e.g. MySQL's case-insensitive "A1" / "a1") pass through
+    and are skipped by the INSERT's duplicate-key handling instead.
+    Returns (remaining_df, cross_file_duplicates, stored_earlier).
+    """
+
+    if cleaned_df.empty:
+        return cleaned_df, 0, 0
+
+    order_ids = cleaned_df["order_id"].astype(str)
+
+    existing = fetch_existing_order_ids(
+        company_id,
+        order_ids.unique().tolist()
+    )
+
+    if not existing:
+        return cleaned_df, 0, 0
+
+    known = order_ids.isin(set(existing))
+    own = order_ids.isin([
+        order_id
+        for order_id, file_id in existing.items()
+        if file_id == uploaded_file_id
+    ])
+
+    return (
+        cleaned_df[~known],
+        int((known & ~own).sum()),
+        int((known & own).sum())
+    )
+
+
+# Optional column → UploadedFile counter of rows with a real value
+KNOWN_VALUE_COUNTERS = {
+    "sales_channel": "known_channel_rows",
+    "product_name": "known_product_rows",
+    "state": "known_state_rows",
+    "category": "known_category_rows"
+}
+
+
+def add_file_row_counts(frame, uploaded_file_id):
+    """
+    Add the chunk's stored-row and known-value counts onto the file's
+    availability counters. Runs in the caller's transaction (no commit).
+    """
+
+    if frame.empty:
+        return
+
+    counts = {"rows_stored": len(frame)}
+
+    for column, counter in KNOWN_VALUE_COUNTERS.items():
+        values = frame[column]
+        counts[counter] = int((values.notna() & (values != "Unknown")).sum())
+
+    db.session.execute(
+        update(UploadedFile)
+        .where(UploadedFile.id == uploaded_file_id)
+        .values({
+            counter: getattr(UploadedFile, counter) + count
+            for counter, count in counts.items()
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_sales_records(cleaned_df, company_id, uploaded_file_id, uploaded_by):
+    """
+    Convert a cleaned DataFrame into plain dicts for Core executemany.
+    Column conversions match what the ORM path used to do per row.
+    """
+
+    records_df = pd.DataFrame({
+        "order_id": cleaned_df["order_id"].astype(str),
+        "order_date": pd.to_datetime(cleaned_df["order_date"]),
+        "order_month": month_key(cleaned_df["order_date"]).astype("int64"),
+        "product_id": cleaned_df["product_id"].astype(str),
+        "quantity": cleaned_df["quantity"].astype("int64"),
+        "unit_price": cleaned_df["unit_price"].astype(float),
+        "total_amount": cleaned_df["total_amount"].astype(float),
+        "payment_mode": cleaned_df["payment_mode"],
+        "product_name": cleaned_df.get("product_name"),
+        "category": cleaned_df.get("category"),
+        "sales_channel": cleaned_df.get("sales_channel"),
+        "state": cleaned_df.get("state"),
+        "city": cleaned_df.get("city"),
+    })
+
+    records_df = records_df.astype(object)
+    records_df = records_df.where(pd.notna(records_df), None)
+
+    records = records_df.to_dict("records")
+
+    now = datetime.utcnow()
+
+    for record in records:
+        record["order_date"] = record["order_date"].to_pydatetime()
+        record["company_id"] = company_id
+        record["file_id"] = uploaded_file_id
+        record["uploaded_by"] = uploaded_by
+        record["created_at"] = now
+
+    return records
+
+
+def _last_file_row_id(uploaded_file_id):
+    return db.session.execute(
+        select(func.coalesce(func.max(SalesData.id), 0)).where(
+            SalesData.file_id == uploaded_file_id
+        )
+    ).scalar()
+
+
+def _insert_rows_one_by_one(records):
+    """
+    Fallback for dialects without a native "skip duplicates" insert.
+    """
+    table = SalesData.__table__
+
+    for record in records:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(table), [record])
+        except IntegrityError:
+            continue
+
+
+def bulk_insert_sales_data(records, uploaded_file_id, batch_size=None):
+    """
+    Insert records in batches of `batch_size` using executemany.
+    Known duplicates are dropped beforehand (drop_existing_orders);
+    rows still hitting `unique_order_per_company` (e.g. a concurrent
+    upload, or an order_id the collation treats as equal) are skipped
+    by the DB. Runs in the caller's transaction (no commit).
+
+    Returns the set of order_ids actually inserted, read back from the
+    file's new rows (ix_sales_data_file), so it is exact on every
+    dialect.
+    """
+
+    if batch_size is None:
+        batch_size = current_app.config.get(
+            "INGEST_BATCH_SIZE",
+            DEFAULT_INSERT_BATCH_SIZE
+        )
+
+    table = SalesData.__table__
+
+    stmt = insert_skip_duplicates(
+        table,
+        dialect_name=db.engine.dialect.name,
+        conflict_columns=["order_id", "company_id"]
+    )
+
+    # Only this job writes the file's rows (one active ingest job per
+    # file, see map_columns_and_process): anything above the current
+    # max id was inserted by the batches below
+    last_id = _last_file_row_id(uploaded_file_id)
+
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+
+        if stmt is not None:
+            db.session.execute(stmt, batch)
+        else:
+            _insert_rows_one_by_one(batch)
+
+    return set(db.session.execute(
+        select(SalesData.order_id).where(
+            SalesData.file_id == uploaded_file_id,
+            SalesData.id > last_id
+        )
+    ).scalars())
+
+
+# =====================================================
+# PHASE 4️⃣ – STREAM CLEAN → CLEANED FILE + DB
 # =====================================================
 
 def clean_and_store_sales_data(
     file_path,
     company_id,
     uploaded_file_id,
-    column_mapping
+    column_mapping,
+    progress=None
 ):
+    """
+    `progress` (IngestProgress) receives per-stage counters as chunks
+    are cleaned and inserted.
+    """
+
+    if progress is None:
+        progress = IngestProgress()
+
     try:
-        cleaned_df, stats = clean_sales_csv(
-            file_path=file_path,
-            column_mapping=column_mapping
+        chunksize = current_app.config.get(
+            "CLEANING_CHUNK_SIZE",
+            DEFAULT_CLEANING_CHUNK_SIZE
         )
 
-        # 🔥 SAVE CLEANED CSV (NEW)
-        cleaned_dir = os.path.join("uploads", "cleaned_files")
-        os.makedirs(cleaned_dir, exist_ok=True)
+        # Stamped on every stored row / rollup cell
+        uploaded_by = db.session.execute(
+            select(UploadedFile.uploaded_by)
+            .where(UploadedFile.id == uploaded_file_id)
+        ).scalar_one()
 
-        cleaned_filename = f"cleaned_{uploaded_file_id}.csv"
-        cleaned_path = os.path.join(cleaned_dir, cleaned_filename)
+        stats = empty_cleaning_stats()
+        inserted = 0
+        skipped = 0
+        cross_file_duplicates = 0
+        stored_earlier = 0
+
+        progress.update(stage=IngestProgress.STAGE_CLEANING)
+
+        # Closed (cleaned file in place) after the last chunk; removed
+        # again if any chunk fails
+        with CleanedFileWriter(uploaded_file_id) as cleaned_writer:
+            # Each cleaned chunk is appended to the cleaned file and
+            # inserted before the next one is read
+            for cleaned_chunk in iter_clean_sales_csv(
+                file_path=file_path,
+                column_mapping=column_mapping,
+                stats=stats,
+                chunksize=chunksize
+            ):
+                progress.update(
+                    stage=IngestProgress.STAGE_STORING,
+                    rows_parsed=stats["rows_before"],
+                    duplicates_removed=stats["duplicates_removed"],
+                    invalid_rows_removed=stats["invalid_rows_removed"]
+                )
 
-        cleaned_df.to_csv(cleaned_path, index=False)
+                cleaned_writer.write(cleaned_chunk)
 
-        # Update UploadedFile with cleaned path
-        uploaded_file = UploadedFile.query.get(uploaded_file_id)
-        if uploaded_file:
-            uploaded_file.cleaned_file_path = cleaned_path
-            db.session.commit()
+                new_rows, chunk_known, chunk_stored_earlier = drop_existing_orders(
+                    cleaned_chunk,
+                    company_id=company_id,
+                    uploaded_file_id=uploaded_file_id
+                )
+                cross_file_duplicates += chunk_known
+                stored_earlier += chunk_stored_earlier
 
-        # Insert into DB safely
-        cleaned_df = cleaned_df.where(pd.notna(cleaned_df), None)
+                records = build_sales_records(
+                    new_rows,
+                    company_id=company_id,
+                    uploaded_file_id=uploaded_file_id,
+                    uploaded_by=uploaded_by
+                )
 
-        inserted = 0
+                inserted_ids = bulk_insert_sales_data(
+                    records,
+                    uploaded_file_id=uploaded_file_id
+                )
 
-        for _, row in cleaned_df.iterrows():
-            try:
-                sale = SalesData(
-                    order_id=str(row["order_id"]),
-                    order_date=row["order_date"],
-                    product_id=str(row["product_id"]),
-                    quantity=int(row["quantity"]),
-                    unit_price=float(row["unit_price"]),
-                    total_amount=float(row["total_amount"]),
-                    payment_mode=row["payment_mode"],
-                    product_name=row.get("product_name"),
-                    category=row.get("category"),
-                    sales_channel=row.get("sales_channel"),
-                    state=row.get("state"),
-                    city=row.get("city"),
+                # Aggregates are credited from the rows the DB actually
+                # stored (exact match on the ids read back), never from
+                # rows it skipped
+                stored_rows = new_rows[
+                    new_rows["order_id"].astype(str).isin(inserted_ids)
+                ]
+
+                inserted += len(stored_rows)
+                skipped += len(records) - len(stored_rows)
+
+                # Monthly rollup cells, the uploader's value dictionary, the
+                # file's availability counters and the dashboard summary
+                # counters commit together with the chunk's rows
+                add_to_sales_rollup(
+                    stored_rows,
+                    company_id=company_id,
+                    uploaded_file_id=uploaded_file_id,
+                    uploaded_by=uploaded_by
+                )
+                add_to_value_dictionary(stored_rows, company_id, uploaded_by)
+                add_file_row_counts(stored_rows, uploaded_file_id)
+                add_to_summary_counters(
                     company_id=company_id,
-                    file_id=uploaded_file_id
+                    employee_id=uploaded_by,
+                    rows_stored=len(stored_rows),
+                    revenue=float(stored_rows["total_amount"].sum())
                 )
 
-                db.session.add(sale)
                 db.session.commit()
-                inserted += 1
 
-            except IntegrityError:
-                db.session.rollback()
-                continue
+                progress.update(
+                    stage=IngestProgress.STAGE_CLEANING,
+                    rows_inserted=inserted + stored_earlier
+                )
 
-        stats["new_rows_inserted"] = inserted
-        stats["cleaned_csv_path"] = cleaned_path
+        # Rows committed by earlier attempts of the job (already
+        # credited to the aggregates when they were stored)
+        stats["new_rows_inserted"] = inserted + stored_earlier
+        stats["cross_file_duplicates"] = cross_file_duplicates
+        stats["duplicate_rows_skipped"] = cross_file_duplicates + skipped
+        stats["cleaned_file_path"] = cleaned_writer.path
 
-        return {
+        report = {
             "message": "CSV cleaned, stored & cleaned file saved successfully",
             "stats": stats
-        }, 201
+        }
+
+        # Update UploadedFile with cleaned path + report (re-uploads of
+        # the same bytes are answered from it)
+        # and invalidate the uploader's cached chart results
+        uploaded_file = UploadedFile.query.get(uploaded_file_id)
+        if uploaded_file:
+            if uploaded_file.cleaned_file_path is None:
+                add_to_summary_counters(
+                    company_id=company_id,
+                    employee_id=uploaded_by,
+                    cleaned_files=1
+                )
+
+            uploaded_file.cleaned_file_path = cleaned_writer.path
+            uploaded_file.cleaning_report = report
+            bump_data_version(uploaded_file.uploaded_by)
+            db.session.commit()
+
+        progress.update(
+            stage=IngestProgress.STAGE_COMPLETED,
+            force=True,
+            rows_inserted=inserted + stored_earlier
+        )
+
+        return report, 201
 
     except Exception as e:
         db.session.rollback()
+        _bump_after_partial_ingest(uploaded_file_id)
         return {"error": str(e)}, 500
 
 
+def _bump_after_partial_ingest(uploaded_file_id):
+    # Each chunk commits with its aggregates: a failed run may still
+    # have stored earlier chunks, so cached results for the uploader
+    # are dropped too
+    try:
+        uploaded_by = db.session.execute(
+            select(UploadedFile.uploaded_by)
+            .where(UploadedFile.id == uploaded_file_id)
+        ).scalar()
+
+        if uploaded_by is not None:
+            bump_data_version(uploaded_by)
+            db.session.commit()
+
+    except Exception:
+        db.session.rollback()
+
+
 # ----- last change made for CSV generation.
 
 
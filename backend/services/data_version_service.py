@@ -0,0 +1,28 @@
+from sqlalchemy import select, update
+
+from extensions import db
+from models import User
+
+
+# =====================================================
+# PER-EMPLOYEE DATA VERSION
+# =====================================================
+# Bumped whenever an employee's stored sales rows change (ingest,
+# file delete). Cached results keyed on it go stale by construction.
+
+def get_data_version(user_id):
+    return db.session.execute(
+        select(User.data_version).where(User.id == user_id)
+    ).scalar() or 0
+
+
+def bump_data_version(user_id):
+    """
+    Runs in the caller's transaction (no commit).
+    """
+
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+    )
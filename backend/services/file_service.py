@@ -1,12 +1,90 @@
 import os
 import uuid
+import hashlib
 from werkzeug.utils import secure_filename
 from flask import current_app
+from sqlalchemy import delete, func, select
 from extensions import db
-from models import UploadedFile
+from models import UploadedFile, SalesData, SalesRollup, IngestJob
+from services.data_version_service import bump_data_version
+from services.summary_counter_service import add_to_summary_counters, refresh_last_upload
+from services.value_dictionary_service import remove_file_values
+from services.parse_cache_service import get_parse_cache
 from services.sales_service import process_sales_file
 from utils.validators import allowed_file
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def save_upload_with_hash(file, file_path, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    Write an uploaded FileStorage to `file_path` chunk by chunk,
+    hashing the bytes on the way. Returns the SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+
+    with open(file_path, "wb") as out:
+        while True:
+            chunk = file.stream.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+
+    return digest.hexdigest()
+
+def delete_uploaded_file(uploaded_file):
+    """
+    Remove an uploaded file with everything derived from it: stored
+    sales rows, rollup cells, ingest jobs, and the raw / cleaned /
+    parse-cache files on disk. Bumps the uploader's data version and
+    takes the file out of the summary counters and the uploader's value
+    dictionary.
+    """
+
+    file_id = uploaded_file.id
+    company_id = uploaded_file.company_id
+    uploaded_by = uploaded_file.uploaded_by
+    disk_paths = [
+        uploaded_file.file_path,
+        uploaded_file.cleaned_file_path,
+        get_parse_cache(uploaded_file)
+    ]
+
+    # Revenue the file contributed, from its rollup cells
+    file_revenue = db.session.execute(
+        select(func.coalesce(func.sum(SalesRollup.total_amount), 0))
+        .where(SalesRollup.file_id == file_id)
+    ).scalar()
+
+    add_to_summary_counters(
+        company_id=company_id,
+        employee_id=uploaded_by,
+        uploads=-1,
+        cleaned_files=-1 if uploaded_file.cleaned_file_path else 0,
+        rows_stored=-uploaded_file.rows_stored,
+        revenue=-float(file_revenue)
+    )
+
+    remove_file_values(file_id, uploaded_by)
+
+    # Set-based deletes: the ORM cascade would load every row first
+    db.session.execute(delete(SalesData).where(SalesData.file_id == file_id))
+    db.session.execute(delete(SalesRollup).where(SalesRollup.file_id == file_id))
+    db.session.execute(delete(IngestJob).where(IngestJob.uploaded_file_id == file_id))
+    db.session.execute(delete(UploadedFile).where(UploadedFile.id == file_id))
+
+    refresh_last_upload(company_id, uploaded_by)
+    bump_data_version(uploaded_by)
+
+    db.session.commit()
+
+    for path in disk_paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    return {"message": "File deleted", "file_id": file_id}, 200
+
 def save_and_process_file(file, user_id, company_id):
     if not file or file.filename == '':
         return {"error": "No file selected"}, 400
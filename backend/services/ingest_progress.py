@@ -0,0 +1,69 @@
+import time
+
+
+# =====================================================
+# INGEST PROGRESS HOOKS
+# =====================================================
+
+class IngestProgress:
+    """
+    Running counters for one clean-and-store run.
+
+    The pipeline calls update() as chunks are parsed and inserted; every
+    snapshot is handed to `publish` (at most once per `min_interval`
+    seconds, stage changes and the final snapshot are always published).
+    """
+
+    STAGE_QUEUED = "queued"
+    STAGE_CLEANING = "cleaning"
+    STAGE_STORING = "storing"
+    STAGE_COMPLETED = "completed"
+
+    def __init__(self, publish=None, min_interval=1.0):
+        self.publish = publish
+        self.min_interval = min_interval
+
+        self.stage = self.STAGE_QUEUED
+        self.rows_parsed = 0
+        self.duplicates_removed = 0
+        self.invalid_rows_removed = 0
+        self.rows_inserted = 0
+
+        self._started = time.monotonic()
+        self._last_published = None
+
+    def snapshot(self):
+        elapsed = time.monotonic() - self._started
+
+        return {
+            "stage": self.stage,
+            "rows_parsed": self.rows_parsed,
+            "duplicates_removed": self.duplicates_removed,
+            "invalid_rows_removed": self.invalid_rows_removed,
+            "rows_inserted": self.rows_inserted,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(self.rows_parsed / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+    def update(self, stage=None, force=False, **counters):
+        stage_changed = stage is not None and stage != self.stage
+
+        if stage is not None:
+            self.stage = stage
+
+        for name, value in counters.items():
+            setattr(self, name, value)
+
+        if self.publish is None:
+            return
+
+        now = time.monotonic()
+
+        if (
+            force or
+            stage_changed or
+            self._last_published is None or
+            now - self._last_published >= self.min_interval
+        ):
+            self._last_published = now
+            self.publish(self.snapshot())
@@ -0,0 +1,274 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+
+from extensions import db
+from models import IngestJob, UploadedFile, ColumnMapping
+from services.data_cleaning_service import clean_and_store_sales_data
+from services.parse_cache_service import build_parse_cache, get_parse_cache
+
+
+# =====================================================
+# ENQUEUE
+# =====================================================
+
+def find_active_job(uploaded_file_id, job_type=None):
+    """
+    The file's queued or running job (of `job_type` when given), if any.
+    """
+
+    query = IngestJob.query.filter(
+        IngestJob.uploaded_file_id == uploaded_file_id,
+        IngestJob.status.in_([IngestJob.STATUS_QUEUED, IngestJob.STATUS_RUNNING])
+    )
+
+    if job_type is not None:
+        query = query.filter(IngestJob.job_type == job_type)
+
+    return query.order_by(IngestJob.id).first()
+
+
+def enqueue_ingest_job(uploaded_file, created_by, column_mapping, save_mapping=False):
+    job = IngestJob(
+        uploaded_file_id=uploaded_file.id,
+        company_id=uploaded_file.company_id,
+        created_by=created_by,
+        column_mapping=column_mapping,
+        save_mapping=save_mapping,
+        max_attempts=current_app.config.get("INGEST_MAX_ATTEMPTS", 3)
+    )
+
+    db.session.add(job)
+    db.session.commit()
+
+    return job
+
+
+def enqueue_parse_cache_job(uploaded_file, created_by):
+    job = IngestJob(
+        uploaded_file_id=uploaded_file.id,
+        company_id=uploaded_file.company_id,
+        created_by=created_by,
+        job_type=IngestJob.TYPE_PARSE_CACHE,
+        max_attempts=current_app.config.get("INGEST_MAX_ATTEMPTS", 3)
+    )
+
+    db.session.add(job)
+    db.session.commit()
+
+    return job
+
+
+# =====================================================
+# CLAIM / HEARTBEAT / FINISH (LEASES)
+# =====================================================
+
+def _claimable(now):
+    # Queued jobs, or running jobs whose worker stopped heartbeating
+    return or_(
+        IngestJob.status == IngestJob.STATUS_QUEUED,
+        and_(
+            IngestJob.status == IngestJob.STATUS_RUNNING,
+            IngestJob.lease_expires_at < now
+        )
+    )
+
+
+def claim_next_job(worker_id, lease_seconds):
+    """
+    Atomically take the oldest claimable job for `worker_id`.
+
+    SELECT ... FOR UPDATE SKIP LOCKED lets concurrent workers pass over
+    rows another worker is claiming (MySQL 8 / PostgreSQL). The guarded
+    UPDATE keeps the claim safe on databases without row locks.
+    """
+
+    now = datetime.utcnow()
+
+    job_id = db.session.execute(
+        select(IngestJob.id)
+        .where(_claimable(now))
+        .order_by(IngestJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar()
+
+    if job_id is None:
+        db.session.commit()
+        return None
+
+    claimed = db.session.execute(
+        update(IngestJob)
+        .where(IngestJob.id == job_id, _claimable(now))
+        .values(
+            status=IngestJob.STATUS_RUNNING,
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            heartbeat_at=now,
+            attempts=IngestJob.attempts + 1,
+            started_at=now
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    db.session.commit()
+
+    if claimed != 1:
+        return None
+
+    return db.session.get(IngestJob, job_id, populate_existing=True)
+
+
+def heartbeat_job(job_id, worker_id, lease_seconds, progress=None):
+    """
+    Extend the lease (and store a progress snapshot when given).
+    Returns False when the lease was lost.
+
+    Runs on its own connection and transaction: progress is published
+    mid-pipeline, and committing db.session there would commit the
+    ingest's half-written chunk with it.
+    """
+
+    now = datetime.utcnow()
+
+    values = {
+        "heartbeat_at": now,
+        "lease_expires_at": now + timedelta(seconds=lease_seconds)
+    }
+
+    if progress is not None:
+        values["progress"] = progress
+
+    with db.engine.begin() as connection:
+        extended = connection.execute(
+            update(IngestJob)
+            .where(
+                IngestJob.id == job_id,
+                IngestJob.lease_owner == worker_id,
+                IngestJob.status == IngestJob.STATUS_RUNNING
+            )
+            .values(**values)
+        ).rowcount
+
+    return extended == 1
+
+
+def _finish_job(job_id, worker_id, **values):
+    finished = db.session.execute(
+        update(IngestJob)
+        .where(
+            IngestJob.id == job_id,
+            IngestJob.lease_owner == worker_id
+        )
+        .values(
+            lease_owner=None,
+            lease_expires_at=None,
+            **values
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    db.session.commit()
+
+    return finished == 1
+
+
+def complete_job(job, worker_id, result):
+    return _finish_job(
+        job.id,
+        worker_id,
+        status=IngestJob.STATUS_SUCCEEDED,
+        result=result,
+        error=None,
+        finished_at=datetime.utcnow()
+    )
+
+
+def fail_job(job, worker_id, error, result=None, retry=False):
+    """
+    Requeue the job when `retry` is set and attempts remain,
+    otherwise mark it failed for good.
+    """
+
+    if retry and job.attempts < job.max_attempts:
+        return _finish_job(
+            job.id,
+            worker_id,
+            status=IngestJob.STATUS_QUEUED,
+            error=error
+        )
+
+    return _finish_job(
+        job.id,
+        worker_id,
+        status=IngestJob.STATUS_FAILED,
+        result=result,
+        error=error,
+        finished_at=datetime.utcnow()
+    )
+
+
+# =====================================================
+# JOB EXECUTION
+# =====================================================
+
+def save_company_mapping(company_id, column_mapping):
+    existing_mapping = ColumnMapping.query.filter_by(
+        company_id=company_id
+    ).first()
+
+    if existing_mapping:
+        existing_mapping.mapping_json = column_mapping
+    else:
+        new_mapping = ColumnMapping(
+            company_id=company_id,
+            mapping_json=column_mapping
+        )
+        db.session.add(new_mapping)
+
+    db.session.commit()
+
+
+def run_parse_cache_job(job):
+    uploaded_file = UploadedFile.query.get(job.uploaded_file_id)
+
+    if not uploaded_file:
+        return {"error": "Uploaded file not found"}, 404
+
+    if not uploaded_file.content_hash:
+        return {"error": "Uploaded file has no content hash"}, 400
+
+    return build_parse_cache(uploaded_file), 201
+
+
+def run_ingest_job(job, progress=None):
+    """
+    Run the clean-and-store pipeline for one job.
+    Returns (result, status) like clean_and_store_sales_data.
+    """
+
+    if job.job_type == IngestJob.TYPE_PARSE_CACHE:
+        return run_parse_cache_job(job)
+
+    uploaded_file = UploadedFile.query.get(job.uploaded_file_id)
+
+    if not uploaded_file:
+        return {"error": "Uploaded file not found"}, 404
+
+    # Parsed once after upload: every mapping attempt reads the
+    # typed Arrow copy instead of re-tokenizing the CSV
+    source_path = get_parse_cache(uploaded_file) or uploaded_file.file_path
+
+    result, status = clean_and_store_sales_data(
+        file_path=source_path,
+        company_id=job.company_id,
+        uploaded_file_id=uploaded_file.id,
+        column_mapping=job.column_mapping,
+        progress=progress
+    )
+
+    if status == 201 and job.save_mapping:
+        save_company_mapping(job.company_id, job.column_mapping)
+
+    return result, status
@@ -0,0 +1,180 @@
+import os
+import socket
+import threading
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from extensions import db
+from services.ingest_progress import IngestProgress
+from services.ingest_queue_service import (
+    claim_next_job,
+    heartbeat_job,
+    complete_job,
+    fail_job,
+    run_ingest_job
+)
+
+
+# =====================================================
+# HEARTBEAT THREAD
+# =====================================================
+
+class JobHeartbeat(threading.Thread):
+    """
+    Keeps a claimed job's lease alive while the worker is busy.
+    Runs in its own app context, so it has its own DB session.
+    """
+
+    def __init__(self, app, job_id, worker_id, lease_seconds, interval):
+        super().__init__(daemon=True)
+        self.app = app
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        with self.app.app_context():
+            try:
+                while not self._stop_event.wait(self.interval):
+                    if not heartbeat_job(self.job_id, self.worker_id, self.lease_seconds):
+                        self.app.logger.warning(
+                            "Ingest job %s: lease lost by %s",
+                            self.job_id,
+                            self.worker_id
+                        )
+                        break
+            finally:
+                db.session.remove()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# =====================================================
+# WORKER LOOP
+# =====================================================
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def process_one_job(worker_id):
+    """
+    Claim and run a single job. Returns False when the queue is empty.
+    """
+
+    app = current_app._get_current_object()
+    lease_seconds = app.config.get("INGEST_LEASE_SECONDS", 300)
+    heartbeat_seconds = app.config.get("INGEST_HEARTBEAT_SECONDS", 30)
+
+    job = claim_next_job(worker_id, lease_seconds)
+
+    if job is None:
+        return False
+
+    app.logger.info("Ingest job %s claimed by %s", job.id, worker_id)
+
+    # Reclaimed after its worker died too many times: give up
+    if job.attempts > job.max_attempts:
+        fail_job(job, worker_id, error="Job lease expired too many times")
+        return True
+
+    heartbeat = JobHeartbeat(
+        app,
+        job.id,
+        worker_id,
+        lease_seconds,
+        heartbeat_seconds
+    )
+    heartbeat.start()
+
+    # Progress snapshots go to the job row (read by the SSE endpoint)
+    # and double as lease heartbeats
+    progress = IngestProgress(
+        publish=lambda snapshot: heartbeat_job(
+            job.id,
+            worker_id,
+            lease_seconds,
+            progress=snapshot
+        ),
+        min_interval=app.config.get("INGEST_PROGRESS_SECONDS", 1)
+    )
+
+    try:
+        result, status = run_ingest_job(job, progress=progress)
+
+        if status == 201:
+            complete_job(job, worker_id, result)
+        else:
+            # Cleaning errors are deterministic, retrying will not help
+            fail_job(job, worker_id, error=result.get("error"), result=result)
+
+    except Exception as e:
+        db.session.rollback()
+        fail_job(job, worker_id, error=str(e), retry=True)
+        app.logger.exception("Ingest job %s crashed", job.id)
+
+    finally:
+        heartbeat.stop()
+        db.session.remove()
+
+    return True
+
+
+def run_worker(worker_id, poll_interval, once=False, max_jobs=None):
+    processed = 0
+
+    while max_jobs is None or processed < max_jobs:
+        try:
+            found = process_one_job(worker_id)
+        except Exception:
+            db.session.rollback()
+            current_app.logger.exception("Ingest worker %s: claim failed", worker_id)
+            found = False
+
+        if found:
+            processed += 1
+            continue
+
+        if once:
+            break
+
+        time.sleep(poll_interval)
+
+    return processed
+
+
+# =====================================================
+# CLI:  flask ingest-worker
+# =====================================================
+
+@click.command("ingest-worker")
+@click.option("--worker-id", default=None, help="Lease owner name (default host:pid).")
+@click.option("--poll-interval", type=float, default=None, help="Seconds to sleep when the queue is empty.")
+@click.option("--once", is_flag=True, help="Drain the queue, then exit.")
+@click.option("--max-jobs", type=int, default=None, help="Exit after this many jobs.")
+@with_appcontext
+def ingest_worker_command(worker_id, poll_interval, once, max_jobs):
+    """Process queued CSV ingest jobs. Run as many as you like."""
+
+    worker_id = worker_id or default_worker_id()
+
+    if poll_interval is None:
+        poll_interval = current_app.config.get("INGEST_POLL_SECONDS", 2)
+
+    click.echo(f"Ingest worker {worker_id} started")
+
+    processed = run_worker(
+        worker_id,
+        poll_interval=poll_interval,
+        once=once,
+        max_jobs=max_jobs
+    )
+
+    click.echo(f"Ingest worker {worker_id} stopped after {processed} job(s)")
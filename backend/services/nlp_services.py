@@ -1,9 +1,21 @@
-from sqlalchemy import func, extract
-
-from models import SalesData, UploadedFile
-from extensions import db
+import copy
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, func, or_
+
+from models import UploadedFile
+from extensions import db, nlp_cache
+from services.chart_service import (
+    ALL_MONTHS,
+    RawChartSource,
+    RollupChartSource,
+    rollup_month_span
+)
+from services.data_version_service import get_data_version
+from services.value_dictionary_service import value_dictionary
 
 from utils.nlp_utils import (
+    MAX_VALUE_WORDS,
     preprocess_query,
     detect_intent,
     extract_entities
@@ -11,143 +23,563 @@ from utils.nlp_utils import (
 
 
 # -----------------------------------------------------
-# MAIN NLP PROCESSOR
+# ANSWER CACHE KEY
 # -----------------------------------------------------
 
-def process_nlp_query(query: str, employee_id: int):
+SCOPE_ENTITIES = ["period", "months", "filters", "compare"]
 
-    query = preprocess_query(query)
+# Entities each intent's answer depends on: differently worded
+# questions with the same intent + entities share one cache entry.
+# "top N" names only the top product, so its limit is left out
+INTENT_ENTITIES = {
+    "revenue": SCOPE_ENTITIES,
+    "orders": SCOPE_ENTITIES,
+    "top_products": SCOPE_ENTITIES,
+    "state_sales": SCOPE_ENTITIES,
+    "payment_mode": SCOPE_ENTITIES
+}
 
-    intent = detect_intent(query)
 
-    if not intent:
-        return "I can only answer questions related to your sales data."
+def canonical_entities(intent, entities):
+    return {
+        name: entities[name]
+        for name in INTENT_ENTITIES.get(intent, [])
+        if name in entities
+    }
 
-    entities = extract_entities(query)
 
-    # ----------------------------------------
-    # Get employee files
-    # ----------------------------------------
+UNSUPPORTED_ANSWER = "I can only answer questions related to your sales data."
 
-    employee_files = UploadedFile.query.filter_by(
-        uploaded_by=employee_id
-    ).all()
 
-    if not employee_files:
-        return "No uploaded data found."
+# -----------------------------------------------------
+# NAME RESOLUTION (COMPANY VALUE DICTIONARY)
+# -----------------------------------------------------
 
-    file_ids = [f.id for f in employee_files]
+# Unlabelled words ("revenue in gujrat") must be this close to a stored
+# value; a labelled one ("state guj") may also be a prefix or looser
+TERM_MIN_SIMILARITY = 0.6
+FILTER_MIN_SIMILARITY = 0.4
 
-    base_query = SalesData.query.filter(
-        SalesData.file_id.in_(file_ids)
-    )
 
-    # ----------------------------------------
-    # Apply year filter
-    # ----------------------------------------
+def _term_windows(terms):
+    # Longest runs first: "blue shirt" before "blue", "shirt"
+    for size in range(min(len(terms), MAX_VALUE_WORDS), 0, -1):
+        for start in range(len(terms) - size + 1):
+            yield start, size
+
+
+def _resolve_scope(scope, employee_id):
+    terms = scope.pop("terms", [])
+
+    if employee_id is None:
+        return
+
+    filters = scope.get("filters", {})
 
-    if "year" in entities:
-        base_query = base_query.filter(
-            extract("year", SalesData.order_date) == entities["year"]
+    for column, value in filters.items():
+        match = value_dictionary.resolve(
+            employee_id,
+            value,
+            dimension=column,
+            min_similarity=FILTER_MIN_SIMILARITY
         )
 
-    # ----------------------------------------
-    # INTENT HANDLERS
-    # ----------------------------------------
+        if match:
+            filters[column] = match[1]
 
-    if intent == "revenue":
+    used = set()
 
-        total_revenue = db.session.query(
-            func.coalesce(func.sum(SalesData.total_amount), 0)
-        ).filter(
-            SalesData.file_id.in_(file_ids)
-        ).scalar()
+    for start, size in _term_windows(terms):
+        if used & set(range(start, start + size)):
+            continue
 
-        if "year" in entities:
-            return f"Total revenue in {entities['year']} is {int(total_revenue)}."
+        match = value_dictionary.resolve(
+            employee_id,
+            " ".join(terms[start:start + size]),
+            min_similarity=TERM_MIN_SIMILARITY,
+            prefixes=False
+        )
 
-        return f"Total revenue is {int(total_revenue)}."
+        if match and match[0] not in filters:
+            filters[match[0]] = match[1]
+            used.update(range(start, start + size))
 
+    if filters:
+        scope["filters"] = filters
 
 
-    elif intent == "orders":
+def resolve_entities(entities, employee_id):
+    """
+    Map typed names onto the employee's stored values ("guj" →
+    "Gujarat"), so differently spelled questions share a plan and a
+    cache entry. Leftover terms are dropped either way.
+    """
 
-        total_orders = base_query.count()
+    entities = copy.deepcopy(entities)
 
-        return f"Total number of orders is {total_orders}."
+    if "compare" not in entities:
+        _resolve_scope(entities, employee_id)
+        return entities
 
+    scopes = entities["compare"]
 
+    for scope in scopes:
+        _resolve_scope(scope, employee_id)
 
-    elif intent == "top_products":
+    # A value named on one side only applies to both
+    for index in (0, 1):
+        for column, value in scopes[1 - index].get("filters", {}).items():
+            scopes[index].setdefault("filters", {}).setdefault(column, value)
 
-        limit = entities.get("limit", 5)
+    return entities
 
-        results = (
-            base_query.with_entities(
-                SalesData.product_name,
-                func.sum(SalesData.total_amount)
-            )
-            .filter(
-                SalesData.product_name.isnot(None),
-                SalesData.product_name != "Unknown"
+
+# -----------------------------------------------------
+# QUERY PLAN (SHARED AGGREGATES)
+# -----------------------------------------------------
+
+# Aggregate each intent's answer is rendered from; questions of one
+# batch that need the same aggregate share a single query
+INTENT_AGGREGATES = {
+    "revenue": "totals",
+    "orders": "totals",
+    "top_products": "products",
+    "state_sales": "states",
+    "payment_mode": "payments"
+}
+
+# aggregate → (group by column, chart source measures, skip missing / "Unknown" groups)
+AGGREGATE_QUERIES = {
+    "totals": (None, ["revenue", "orders"], False),
+    "products": ("product_name", ["revenue"], True),
+    "states": ("state", ["revenue"], True),
+    "payments": ("payment_mode", ["orders"], False)
+}
+
+# Columns sales_rollup does not carry: filtering on them needs raw rows
+RAW_ONLY_FILTERS = {"city"}
+
+FILTER_LABELS = {
+    "state": "state",
+    "city": "city",
+    "category": "category",
+    "product_name": "product"
+}
+
+
+def question_scopes(entities):
+    """
+    The slices of data a question reads: one, or two for "compare X vs Y".
+    Each scope may hold a period, month-of-year values and filters.
+    """
+
+    if "compare" in entities:
+        return entities["compare"]
+
+    return [{
+        name: entities[name]
+        for name in ("period", "months", "filters")
+        if name in entities
+    }]
+
+
+def _period_key(scope):
+    period = scope.get("period")
+
+    if period is None:
+        return None
+
+    return period["start"], period["end"]
+
+
+def _month_span(period):
+    return rollup_month_span({
+        "type": "date_range",
+        "start_date": period[0],
+        "end_date": period[1]
+    })
+
+
+def _slice_key(aggregate, scope):
+    """
+    Everything but the period: questions differing only in their period
+    are answered by one query grouped by month.
+    """
+
+    months = tuple(scope["months"]["values"]) if "months" in scope else ()
+    filters = tuple(sorted(scope.get("filters", {}).items()))
+
+    period = _period_key(scope)
+    whole_months = period is None or _month_span(period) is not None
+
+    if whole_months and not RAW_ONLY_FILTERS & dict(filters).keys():
+        source = RollupChartSource.name
+    else:
+        source = RawChartSource.name
+
+    return aggregate, source, months, filters
+
+
+def scope_result_key(aggregate, scope):
+    return _slice_key(aggregate, scope), _period_key(scope)
+
+
+def plan_aggregates(parsed):
+    """
+    Query plan of a batch: slice → period keys it is read for
+    (None = all dates). A slice is (aggregate, source, month-of-year
+    values, filters); sales_rollup serves every slice it can.
+    """
+
+    plan = {}
+
+    for intent, entities in parsed:
+        aggregate = INTENT_AGGREGATES.get(intent)
+
+        if aggregate is None:
+            continue
+
+        for scope in question_scopes(entities):
+            plan.setdefault(_slice_key(aggregate, scope), set()).add(
+                _period_key(scope)
             )
-            .group_by(SalesData.product_name)
-            .order_by(func.sum(SalesData.total_amount).desc())
-            .limit(limit)
-            .all()
+
+    return plan
+
+
+def _period_filter(source, period):
+    if source.name == RollupChartSource.name:
+        first_month, last_month = _month_span(period)
+        return and_(source.month >= first_month, source.month <= last_month)
+
+    # Half-open range on the bare column, so the order_date index is usable
+    start = datetime.fromisoformat(period[0])
+    end = datetime.fromisoformat(period[1]) + timedelta(days=1)
+
+    return and_(
+        source.column("order_date") >= start,
+        source.column("order_date") < end
+    )
+
+
+def _in_period(month, period):
+    if period is None:
+        return True
+
+    first_month, last_month = _month_span(period)
+    return first_month <= month <= last_month
+
+
+def fetch_slice(slice_key, periods, employee_id):
+    """
+    One grouped query for the given periods of a slice.
+
+    Returns {period: {dimension value: [measures]}} (dimension value
+    None for "totals"). Several periods are answered by grouping on the
+    month as well; each period sums the months it covers.
+    """
+
+    aggregate, source_name, months, filters = slice_key
+    dimension, measures, known_only = AGGREGATE_QUERIES[aggregate]
+
+    if source_name == RollupChartSource.name:
+        source = RollupChartSource(employee_id, ALL_MONTHS)
+    else:
+        source = RawChartSource(employee_id, {})
+
+    by_month = len(periods) > 1
+    columns = [source.month] if by_month else []
+
+    if dimension is not None:
+        columns.append(source.column(dimension))
+
+    query = source.query.with_entities(
+        *columns,
+        *[getattr(source, measure) for measure in measures]
+    )
+
+    # Case-insensitive: names the value dictionary could not resolve
+    # stay as typed
+    for column, value in filters:
+        query = query.filter(func.lower(source.column(column)) == value.lower())
+
+    if months:
+        query = query.filter((source.month % 100).in_(months))
+
+    if None not in periods:
+        query = query.filter(or_(*[
+            _period_filter(source, period) for period in sorted(periods)
+        ]))
+
+    if known_only:
+        query = query.filter(
+            source.column(dimension).isnot(None),
+            source.column(dimension) != "Unknown"
         )
 
-        if not results:
-            return "No product sales data available."
+    if columns:
+        query = query.group_by(*columns)
 
-        top_product = results[0]
+    results = {period: {} for period in periods}
 
-        return f"Top product is {top_product[0]} with revenue {int(top_product[1])}."
+    for row in query.all():
+        row = list(row)
+        month = row.pop(0) if by_month else None
+        key = row.pop(0) if dimension is not None else None
 
+        if all(value is None for value in row):
+            continue
 
+        for period in periods:
+            if by_month and not _in_period(month, period):
+                continue
 
-    elif intent == "state_sales":
+            totals = results[period].setdefault(key, [0] * len(measures))
+            for i, value in enumerate(row):
+                totals[i] += value or 0
 
-        results = (
-            base_query.with_entities(
-                SalesData.state,
-                func.sum(SalesData.total_amount)
-            )
-            .filter(
-                SalesData.state.isnot(None),
-                SalesData.state != "Unknown"
-            )
-            .group_by(SalesData.state)
-            .order_by(func.sum(SalesData.total_amount).desc())
-            .all()
+    return results
+
+
+def fetch_plan(plan, employee_id):
+    """
+    Results per (slice, period). Periods of a raw slice that cut
+    through a month cannot share a month grouping and get a query each.
+    """
+
+    results = {}
+
+    for slice_key, periods in plan.items():
+        monthly = {
+            period for period in periods
+            if period is None or _month_span(period) is not None
+        }
+
+        batches = [monthly] if monthly else []
+        batches += [{period} for period in periods - monthly]
+
+        for batch in batches:
+            for period, groups in fetch_slice(slice_key, batch, employee_id).items():
+                results[slice_key, period] = groups
+
+    return results
+
+
+# -----------------------------------------------------
+# RENDER ANSWERS
+# -----------------------------------------------------
+
+def _ranked(groups):
+    # Highest measure first; ties by name so answers are deterministic
+    return sorted(
+        groups.items(),
+        key=lambda item: (-item[1][0], str(item[0]))
+    )
+
+
+def _scope_text(scope):
+    # " in Q1 2024 for state Gujarat", " from January to March 2024"
+    text = ""
+
+    when = scope.get("period") or scope.get("months")
+    if when:
+        label = when["label"]
+        text += f" from {label}" if " to " in label else f" in {label}"
+
+    filters = scope.get("filters", {})
+    if filters:
+        text += " for " + ", ".join(
+            f"{FILTER_LABELS[column]} {value.title() if value.islower() else value}"
+            for column, value in sorted(filters.items())
         )
 
-        if not results:
-            return "No state sales data available."
+    return text
+
+
+def _total(intent, groups):
+    revenue, orders = groups.get(None, [0, 0])
+    return revenue if intent == "revenue" else orders
+
+
+TOTAL_TITLES = {
+    "revenue": "Total revenue",
+    "orders": "Total number of orders"
+}
+
+
+def _render_scope(intent, scope, groups):
+
+    text = _scope_text(scope)
+
+    if intent in TOTAL_TITLES:
+
+        return f"{TOTAL_TITLES[intent]}{text} is {int(_total(intent, groups))}."
+
+    elif intent == "top_products":
+
+        ranked = _ranked(groups)
+
+        if not ranked:
+            return f"No product sales data available{text}."
+
+        name, (revenue,) = ranked[0]
+
+        return f"Top product{text} is {name} with revenue {int(revenue)}."
+
+    elif intent == "state_sales":
 
-        top_state = results[0]
+        ranked = _ranked(groups)
 
-        return f"Highest sales state is {top_state[0]} with revenue {int(top_state[1])}."
+        if not ranked:
+            return f"No state sales data available{text}."
 
+        name, (revenue,) = ranked[0]
 
+        return f"Highest sales state{text} is {name} with revenue {int(revenue)}."
 
     elif intent == "payment_mode":
 
-        results = (
-            base_query.with_entities(
-                SalesData.payment_mode,
-                func.count(SalesData.order_id)
-            )
-            .group_by(SalesData.payment_mode)
-            .order_by(func.count(SalesData.order_id).desc())
-            .all()
+        ranked = _ranked(groups)
+
+        if not ranked:
+            return f"No payment data available{text}."
+
+        name, (transactions,) = ranked[0]
+
+        return f"Most used payment mode{text} is {name} with {int(transactions)} transactions."
+
+    return UNSUPPORTED_ANSWER
+
+
+def render_answer(intent, entities, results):
+
+    aggregate = INTENT_AGGREGATES.get(intent)
+
+    if aggregate is None:
+        return UNSUPPORTED_ANSWER
+
+    scopes = question_scopes(entities)
+    groups = [results[scope_result_key(aggregate, scope)] for scope in scopes]
+
+    if len(scopes) == 1:
+        return _render_scope(intent, scopes[0], groups[0])
+
+    # compare X vs Y
+    if intent in TOTAL_TITLES:
+        first, second = (_total(intent, group) for group in groups)
+
+        change = f" ({(second - first) / first * 100:+.1f}%)" if first else ""
+
+        return (
+            f"{TOTAL_TITLES[intent]}{_scope_text(scopes[0])} is {int(first)} "
+            f"vs {int(second)}{_scope_text(scopes[1])}{change}."
         )
 
-        if not results:
-            return "No payment data available."
+    return " ".join(
+        _render_scope(intent, scope, group)
+        for scope, group in zip(scopes, groups)
+    )
+
+
+# -----------------------------------------------------
+# MAIN NLP PROCESSOR
+# -----------------------------------------------------
+
+def parse_query(query, employee_id=None):
+    """
+    (intent, canonical entities); (None, {}) when no intent matches.
+    Names are resolved against `employee_id`'s value dictionary.
+    """
+
+    intent = detect_intent(preprocess_query(query))
+
+    # Entities read the raw text: dates keep their "-" and "/"
+    entities = extract_entities(query)
+
+    # "compare 2023 vs 2024" alone compares revenue
+    if not intent and "compare" in entities:
+        intent = "revenue"
+
+    if not intent:
+        return None, {}
+
+    entities = resolve_entities(entities, employee_id)
+
+    return intent, canonical_entities(intent, entities)
+
+
+def process_nlp_query(query: str, employee_id: int):
+
+    return process_nlp_batch([query], employee_id)[0]
+
+
+def process_nlp_batch(queries, employee_id):
+    """
+    Answers for several questions, in order.
+
+    All questions are parsed first; cached answers are reused and the
+    rest are rendered from one shared set of aggregate queries.
+    """
+
+    parsed = [parse_query(query, employee_id) for query in queries]
+    answers = [UNSUPPORTED_ANSWER] * len(parsed)
+
+    if not any(intent for intent, _ in parsed):
+        return answers
+
+    # Keyed on the employee's data version: ingest / file delete
+    # bump it, so cached answers never outlive the data
+    data_version = get_data_version(employee_id)
+
+    missing = {}
+
+    for index, (intent, entities) in enumerate(parsed):
+        if intent is None:
+            continue
+
+        cache_key = nlp_cache.make_key(employee_id, intent, entities, data_version)
+        answer = nlp_cache.get(cache_key)
+
+        if answer is None:
+            missing.setdefault(cache_key, []).append(index)
+        else:
+            answers[index] = answer
+
+    if missing:
+        pending = [parsed[indexes[0]] for indexes in missing.values()]
+
+        for (cache_key, indexes), answer in zip(
+            missing.items(),
+            answer_intents(pending, employee_id)
+        ):
+            nlp_cache.set(cache_key, answer)
+
+            for index in indexes:
+                answers[index] = answer
+
+    return answers
+
+
+def answer_intents(parsed, employee_id):
+
+    # ----------------------------------------
+    # Employee's data (sales_data.uploaded_by)
+    # ----------------------------------------
+
+    has_files = db.session.query(
+        UploadedFile.query.filter_by(uploaded_by=employee_id).exists()
+    ).scalar()
+
+    if not has_files:
+        return ["No uploaded data found."] * len(parsed)
+
+    # ----------------------------------------
+    # One query per planned slice, shared by the batch
+    # ----------------------------------------
 
-        mode = results[0]
+    results = fetch_plan(plan_aggregates(parsed), employee_id)
 
-        return f"Most used payment mode is {mode[0]} with {mode[1]} transactions."
-    
-    return "I can only answer questions related to your sales data."
\ No newline at end of file
+    return [
+        render_answer(intent, entities, results)
+        for intent, entities in parsed
+    ]
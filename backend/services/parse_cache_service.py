@@ -0,0 +1,161 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+from flask import current_app
+
+
+# =====================================================
+# PARSE CACHE LAYOUT
+# =====================================================
+
+PARSE_CACHE_DIR = os.path.join("uploads", "parse_cache")
+
+DEFAULT_PARSE_CACHE_CHUNK_SIZE = 50000
+
+
+def parse_cache_path(uploaded_file_id, content_hash):
+    # Keyed by file id + content hash: a cache can never be served
+    # for bytes other than the ones it was parsed from
+    return os.path.join(
+        PARSE_CACHE_DIR,
+        f"parsed_{uploaded_file_id}_{content_hash}.arrow"
+    )
+
+
+def get_parse_cache(uploaded_file):
+    """
+    Path of the ready parse cache for `uploaded_file`, or None.
+    """
+
+    if not uploaded_file.content_hash:
+        return None
+
+    path = parse_cache_path(uploaded_file.id, uploaded_file.content_hash)
+
+    if not os.path.exists(path):
+        return None
+
+    return path
+
+
+# =====================================================
+# BUILD (BACKGROUND JOB)
+# =====================================================
+
+def _column_dtype(kinds):
+    """
+    One dtype per column for the whole file, from the numpy kinds
+    pandas inferred chunk by chunk. Mixed columns stay text.
+    """
+
+    if kinds <= {"i", "u"}:
+        return "int64"
+
+    if kinds <= {"i", "u", "f"}:
+        return "float64"
+
+    if kinds == {"b"}:
+        return "bool"
+
+    return str
+
+
+def build_parse_cache(uploaded_file, chunksize=None):
+    """
+    Parse the raw CSV once into a typed Arrow IPC (Feather v2) file.
+
+    Pass 1 infers a single dtype per column across all chunks, pass 2
+    re-reads with those dtypes and appends one record batch per chunk,
+    so memory stays bounded by the chunk size. The file is written
+    under a temporary name and renamed, readers never see half a cache.
+    """
+
+    if chunksize is None:
+        chunksize = current_app.config.get(
+            "PARSE_CACHE_CHUNK_SIZE",
+            DEFAULT_PARSE_CACHE_CHUNK_SIZE
+        )
+
+    path = parse_cache_path(uploaded_file.id, uploaded_file.content_hash)
+    tmp_path = f"{path}.tmp"
+
+    os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+
+    # ---------- Pass 1: column types ----------
+    kinds = {}
+
+    with pd.read_csv(uploaded_file.file_path, chunksize=chunksize) as reader:
+        for chunk in reader:
+            for column, dtype in chunk.dtypes.items():
+                kinds.setdefault(column, set()).add(dtype.kind)
+
+    dtypes = {column: _column_dtype(k) for column, k in kinds.items()}
+
+    # ---------- Pass 2: typed record batches ----------
+    writer = None
+    rows = 0
+
+    try:
+        with pd.read_csv(
+            uploaded_file.file_path,
+            chunksize=chunksize,
+            dtype=dtypes
+        ) as reader:
+            for chunk in reader:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+
+                if writer is None:
+                    writer = pa.ipc.new_file(tmp_path, table.schema)
+
+                writer.write_table(table)
+                rows += len(chunk)
+
+        if writer is None:
+            # Header-only CSV
+            table = pa.Table.from_pandas(
+                pd.read_csv(uploaded_file.file_path, dtype=str),
+                preserve_index=False
+            )
+            writer = pa.ipc.new_file(tmp_path, table.schema)
+            writer.write_table(table)
+
+        writer.close()
+        writer = None
+
+        os.replace(tmp_path, path)
+
+    finally:
+        if writer is not None:
+            writer.close()
+
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {
+        "message": "Parse cache built",
+        "parse_cache_path": path,
+        "rows": rows,
+        "columns": len(dtypes)
+    }
+
+
+# =====================================================
+# READ
+# =====================================================
+
+def iter_parse_cache(path, chunksize=None):
+    """
+    Yield the cached raw file as DataFrames of at most `chunksize`
+    rows. The file is memory-mapped, only the yielded slice is copied.
+    """
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+        if not chunksize:
+            yield table.to_pandas()
+            return
+
+        for offset in range(0, max(table.num_rows, 1), chunksize):
+            yield table.slice(offset, chunksize).to_pandas()
@@ -0,0 +1,190 @@
+import threading
+import time
+from collections import namedtuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models import Company, Role
+
+
+# =====================================================
+# IN-PROCESS REFERENCE DATA (ROLES, COMPANY STATUS)
+# =====================================================
+
+CompanyRef = namedtuple("CompanyRef", ["id", "name", "industry", "is_active"])
+
+DEFAULT_REFERENCE_CACHE_TTL = 60
+
+
+class ReferenceDataCache:
+    """
+    Role ids / names and company status for the hot paths (login,
+    upload, map-columns, dashboards) without a query per request.
+
+    Roles are seeded once and never change, so they are kept for the
+    process lifetime. Companies expire after REFERENCE_CACHE_TTL
+    seconds, and invalidate_company() drops the entry in this process.
+
+    Other worker processes learn about a suspend / recover through
+    REFERENCE_CACHE_BACKEND:
+      - redis: invalidate_company() bumps a shared per-company version
+        key; every lookup compares it (one Redis GET, no DB query), so
+        the change applies on the next request in every process.
+      - memory: no shared state; other processes may serve the old
+        status for up to REFERENCE_CACHE_TTL seconds.
+    """
+
+    def __init__(self):
+        self.company_ttl = DEFAULT_REFERENCE_CACHE_TTL
+        self.versions = None
+        self._role_ids = {}
+        self._role_names = {}
+        self._companies = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, versions=None):
+        """
+        `versions` overrides the shared version store: anything with
+        Redis' get / incr (redis.Redis, or a local stand-in in tests).
+        """
+
+        self.company_ttl = app.config.get(
+            "REFERENCE_CACHE_TTL",
+            DEFAULT_REFERENCE_CACHE_TTL
+        )
+
+        if versions is None:
+            kind = app.config.get("REFERENCE_CACHE_BACKEND", "memory")
+
+            if kind == "redis":
+                # Optional dependency, only needed for the shared backend
+                import redis
+
+                versions = redis.Redis.from_url(app.config["REDIS_URL"])
+            elif kind != "memory":
+                raise ValueError(f"Unknown REFERENCE_CACHE_BACKEND: {kind}")
+
+        self.versions = versions
+
+        with app.app_context():
+            try:
+                self.warm()
+            except SQLAlchemyError:
+                # Tables not created yet (e.g. `flask db upgrade` on an
+                # empty database): entries load on first use instead
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    def warm(self):
+        self._load_roles()
+
+        companies = db.session.execute(
+            select(Company.id, Company.name, Company.industry, Company.is_active)
+        ).all()
+
+        expires_at = time.monotonic() + self.company_ttl
+
+        with self._lock:
+            for row in companies:
+                self._companies[row.id] = (
+                    expires_at,
+                    self._company_version(row.id),
+                    CompanyRef(*row)
+                )
+
+    # ---------------------------------------------------
+    # Roles
+    # ---------------------------------------------------
+    def _load_roles(self):
+        roles = db.session.execute(select(Role.id, Role.name)).all()
+
+        with self._lock:
+            self._role_ids = {name: role_id for role_id, name in roles}
+            self._role_names = {role_id: name for role_id, name in roles}
+
+    def role_id(self, name):
+        if name not in self._role_ids:
+            self._load_roles()
+
+        return self._role_ids.get(name)
+
+    def role_name(self, role_id):
+        if role_id not in self._role_names:
+            self._load_roles()
+
+        return self._role_names.get(role_id)
+
+    # ---------------------------------------------------
+    # Companies
+    # ---------------------------------------------------
+    @staticmethod
+    def _version_key(company_id):
+        return f"reference:company:{company_id}"
+
+    def _company_version(self, company_id):
+        if self.versions is None:
+            return 0
+
+        return int(self.versions.get(self._version_key(company_id)) or 0)
+
+    def company(self, company_id):
+        """
+        CompanyRef (id, name, industry, is_active) or None.
+        """
+
+        if company_id is None:
+            return None
+
+        # Read before the row: a bump racing the query below leaves the
+        # entry one version behind, so the next lookup reloads it
+        version = self._company_version(company_id)
+        entry = self._companies.get(company_id)
+
+        if (
+            entry is not None and
+            entry[0] >= time.monotonic() and
+            entry[1] == version
+        ):
+            return entry[2]
+
+        row = db.session.execute(
+            select(Company.id, Company.name, Company.industry, Company.is_active)
+            .where(Company.id == company_id)
+        ).first()
+
+        if row is None:
+            return None
+
+        company = CompanyRef(*row)
+
+        with self._lock:
+            self._companies[company_id] = (
+                time.monotonic() + self.company_ttl,
+                version,
+                company
+            )
+
+        return company
+
+    def invalidate_company(self, company_id):
+        """
+        Call after committing a change to the company row.
+        """
+
+        with self._lock:
+            self._companies.pop(company_id, None)
+
+        if self.versions is not None:
+            self.versions.incr(self._version_key(company_id))
+
+    def clear(self):
+        with self._lock:
+            self._role_ids = {}
+            self._role_names = {}
+            self._companies = {}
+
+
+reference_data = ReferenceDataCache()
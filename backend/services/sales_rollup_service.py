@@ -0,0 +1,212 @@
+import click
+import pandas as pd
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import delete, select
+
+from extensions import db
+from models import SalesData, SalesRollup, UploadedFile
+from utils.sql_helpers import upsert_increment
+
+
+# =====================================================
+# ROLLUP LAYOUT
+# =====================================================
+
+ROLLUP_DIMENSIONS = [
+    "sales_channel",
+    "category",
+    "state",
+    "product_name",
+    "payment_mode"
+]
+
+ROLLUP_MEASURES = [
+    "total_amount",
+    "quantity",
+    "order_count"
+]
+
+DEFAULT_ROLLUP_REBUILD_BATCH_SIZE = 50000
+
+
+def month_key(dates):
+    """
+    YYYYMM integers for a Series of datetimes.
+    """
+    dates = pd.to_datetime(dates)
+    return dates.dt.year * 100 + dates.dt.month
+
+
+# =====================================================
+# AGGREGATE + UPSERT
+# =====================================================
+
+def aggregate_rollup_rows(frame, company_id, uploaded_file_id, uploaded_by):
+    """
+    Collapse sales rows (cleaned chunk or rows read back from
+    sales_data) into rollup records for one file.
+    """
+
+    if frame.empty:
+        return []
+
+    grouped = pd.DataFrame({
+        "month": month_key(frame["order_date"]),
+        "total_amount": frame["total_amount"].astype(float),
+        "quantity": frame["quantity"].astype("int64"),
+        **{
+            dimension: frame[dimension].fillna("Unknown").astype(str)
+            for dimension in ROLLUP_DIMENSIONS
+        }
+    }).groupby(["month", *ROLLUP_DIMENSIONS], sort=False).agg(
+        total_amount=("total_amount", "sum"),
+        quantity=("quantity", "sum"),
+        order_count=("quantity", "size")
+    ).reset_index()
+
+    records = grouped.astype(object).to_dict("records")
+
+    for record in records:
+        record["month"] = int(record["month"])
+        record["quantity"] = int(record["quantity"])
+        record["order_count"] = int(record["order_count"])
+        record["total_amount"] = float(record["total_amount"])
+        record["company_id"] = company_id
+        record["file_id"] = uploaded_file_id
+        record["uploaded_by"] = uploaded_by
+
+    return records
+
+
+def _upsert_rows_one_by_one(records):
+    """
+    Fallback for dialects without a native upsert.
+    """
+
+    for record in records:
+        cell = SalesRollup.query.filter_by(
+            file_id=record["file_id"],
+            month=record["month"],
+            **{dimension: record[dimension] for dimension in ROLLUP_DIMENSIONS}
+        ).first()
+
+        if cell is None:
+            db.session.add(SalesRollup(**record))
+            continue
+
+        for measure in ROLLUP_MEASURES:
+            setattr(cell, measure, getattr(cell, measure) + record[measure])
+
+    db.session.flush()
+
+
+def add_to_sales_rollup(frame, company_id, uploaded_file_id, uploaded_by):
+    """
+    Add the totals of `frame` onto the file's rollup cells.
+    Runs in the caller's transaction (no commit).
+    """
+
+    records = aggregate_rollup_rows(frame, company_id, uploaded_file_id, uploaded_by)
+
+    if not records:
+        return 0
+
+    stmt = upsert_increment(
+        SalesRollup.__table__,
+        dialect_name=db.engine.dialect.name,
+        conflict_columns=["file_id", "month", *ROLLUP_DIMENSIONS],
+        increment_columns=ROLLUP_MEASURES
+    )
+
+    if stmt is not None:
+        db.session.execute(stmt, records)
+    else:
+        _upsert_rows_one_by_one(records)
+
+    return len(records)
+
+
+# =====================================================
+# REBUILD FROM sales_data
+# =====================================================
+
+def rebuild_sales_rollup(uploaded_file, batch_size=None):
+    """
+    Recompute one file's rollup from its stored sales rows, e.g. for
+    data ingested before the rollup existed.
+    """
+
+    if batch_size is None:
+        batch_size = current_app.config.get(
+            "ROLLUP_REBUILD_BATCH_SIZE",
+            DEFAULT_ROLLUP_REBUILD_BATCH_SIZE
+        )
+
+    db.session.execute(
+        delete(SalesRollup).where(SalesRollup.file_id == uploaded_file.id)
+    )
+
+    columns = [
+        SalesData.order_date,
+        SalesData.total_amount,
+        SalesData.quantity,
+        *[getattr(SalesData, dimension) for dimension in ROLLUP_DIMENSIONS]
+    ]
+
+    # Keyset batches, each fetched in full before its upsert: a streamed
+    # (yield_per) read shares the connection with the writes, and
+    # PyMySQL discards the rest of an unbuffered result on the next execute
+    last_id = 0
+
+    while True:
+        batch = db.session.execute(
+            select(SalesData.id, *columns)
+            .where(
+                SalesData.file_id == uploaded_file.id,
+                SalesData.id > last_id
+            )
+            .order_by(SalesData.id)
+            .limit(batch_size)
+        ).all()
+
+        if not batch:
+            break
+
+        last_id = batch[-1].id
+
+        add_to_sales_rollup(
+            pd.DataFrame(
+                [row[1:] for row in batch],
+                columns=[c.key for c in columns]
+            ),
+            company_id=uploaded_file.company_id,
+            uploaded_file_id=uploaded_file.id,
+            uploaded_by=uploaded_file.uploaded_by
+        )
+
+    db.session.commit()
+
+
+# =====================================================
+# CLI:  flask rebuild-sales-rollup
+# =====================================================
+
+@click.command("rebuild-sales-rollup")
+@click.option("--file-id", type=int, default=None, help="Only rebuild this uploaded file.")
+@with_appcontext
+def rebuild_sales_rollup_command(file_id):
+    """Recompute sales_rollup from sales_data (run once after upgrading)."""
+
+    query = UploadedFile.query.order_by(UploadedFile.id)
+
+    if file_id is not None:
+        query = query.filter(UploadedFile.id == file_id)
+
+    rebuilt = 0
+
+    for uploaded_file in query.all():
+        rebuild_sales_rollup(uploaded_file)
+        rebuilt += 1
+
+    click.echo(f"Rebuilt sales_rollup for {rebuilt} file(s)")
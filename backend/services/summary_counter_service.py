@@ -0,0 +1,286 @@
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, true, update
+
+from extensions import db
+from models import Company, Role, SalesData, SummaryCounter, UploadedFile, User
+from utils.sql_helpers import upsert_increment
+
+
+# =====================================================
+# COUNTER LAYOUT
+# =====================================================
+
+COUNTER_COLUMNS = [
+    "companies",
+    "active_companies",
+    "users",
+    "employees",
+    "uploads",
+    "cleaned_files",
+    "rows_stored",
+    "revenue"
+]
+
+PLATFORM_SCOPE_ID = 0
+
+
+def _scopes(company_id=None, employee_id=None):
+    scopes = [(SummaryCounter.SCOPE_PLATFORM, PLATFORM_SCOPE_ID)]
+
+    if company_id is not None:
+        scopes.append((SummaryCounter.SCOPE_COMPANY, company_id))
+
+    if employee_id is not None:
+        scopes.append((SummaryCounter.SCOPE_EMPLOYEE, employee_id))
+
+    return scopes
+
+
+def _scope_filter(scopes):
+    return or_(*[
+        and_(SummaryCounter.scope == scope, SummaryCounter.scope_id == scope_id)
+        for scope, scope_id in scopes
+    ])
+
+
+# =====================================================
+# WRITE (CALLER'S TRANSACTION, NO COMMIT)
+# =====================================================
+
+def _add_rows_one_by_one(records, columns):
+    """
+    Fallback for dialects without a native upsert.
+    """
+
+    for record in records:
+        row = SummaryCounter.query.filter_by(
+            scope=record["scope"],
+            scope_id=record["scope_id"]
+        ).first()
+
+        if row is None:
+            db.session.add(SummaryCounter(**record))
+            continue
+
+        for column in columns:
+            setattr(row, column, getattr(row, column) + record[column])
+
+    db.session.flush()
+
+
+def add_to_summary_counters(company_id=None, employee_id=None, last_upload_at=None, **deltas):
+    """
+    Add `deltas` (counter name → amount, may be negative) onto the
+    platform row and, when given, the company and employee rows.
+    Missing rows are created. `last_upload_at` moves the last upload
+    forward, never back.
+    """
+
+    unknown = set(deltas) - set(COUNTER_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown summary counters: {sorted(unknown)}")
+
+    scopes = _scopes(company_id, employee_id)
+    columns = [column for column, amount in deltas.items() if amount]
+
+    if columns:
+        records = [
+            {
+                "scope": scope,
+                "scope_id": scope_id,
+                **{column: deltas[column] for column in columns}
+            }
+            for scope, scope_id in scopes
+        ]
+
+        stmt = upsert_increment(
+            SummaryCounter.__table__,
+            dialect_name=db.engine.dialect.name,
+            conflict_columns=["scope", "scope_id"],
+            increment_columns=columns
+        )
+
+        if stmt is not None:
+            db.session.execute(stmt, records)
+        else:
+            _add_rows_one_by_one(records, columns)
+
+    if last_upload_at is not None:
+        db.session.execute(
+            update(SummaryCounter)
+            .where(
+                _scope_filter(scopes),
+                or_(
+                    SummaryCounter.last_upload_at.is_(None),
+                    SummaryCounter.last_upload_at < last_upload_at
+                )
+            )
+            .values(last_upload_at=last_upload_at)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def refresh_last_upload(company_id, employee_id):
+    """
+    Recompute last_upload_at after uploads were removed.
+    """
+
+    file_filters = {
+        SummaryCounter.SCOPE_COMPANY: UploadedFile.company_id == company_id,
+        SummaryCounter.SCOPE_EMPLOYEE: UploadedFile.uploaded_by == employee_id
+    }
+
+    for scope, scope_id in _scopes(company_id, employee_id):
+        query = select(func.max(UploadedFile.uploaded_at))
+
+        if scope in file_filters:
+            query = query.where(file_filters[scope])
+
+        db.session.execute(
+            update(SummaryCounter)
+            .where(
+                SummaryCounter.scope == scope,
+                SummaryCounter.scope_id == scope_id
+            )
+            .values(last_upload_at=query.scalar_subquery())
+            .execution_options(synchronize_session=False)
+        )
+
+
+def drop_summary_counters(scope, scope_id):
+    db.session.query(SummaryCounter).filter_by(
+        scope=scope,
+        scope_id=scope_id
+    ).delete(synchronize_session=False)
+
+
+# =====================================================
+# READ (ONE ROW)
+# =====================================================
+
+def get_summary_counters(scope, scope_id=PLATFORM_SCOPE_ID):
+    """
+    Counters of one scope as a dict; zeros when nothing was counted yet.
+    """
+
+    row = db.session.execute(
+        select(SummaryCounter).where(
+            SummaryCounter.scope == scope,
+            SummaryCounter.scope_id == scope_id
+        )
+    ).scalar()
+
+    summary = {column: 0 for column in COUNTER_COLUMNS}
+    summary["last_upload_at"] = None
+
+    if row is not None:
+        for column in summary:
+            summary[column] = getattr(row, column)
+
+    return summary
+
+
+# =====================================================
+# REBUILD FROM SOURCE TABLES
+# =====================================================
+
+def _count(model, *where):
+    return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+
+def _file_totals(*where):
+    return [
+        _count(UploadedFile, *where),
+        _count(UploadedFile, UploadedFile.cleaned_file_path.isnot(None), *where),
+        select(func.max(UploadedFile.uploaded_at)).where(*where).scalar_subquery()
+    ]
+
+
+def _sales_totals(*where):
+    # Stored rows and revenue are counted from sales_data itself, so
+    # drifted uploaded_files.rows_stored values are not carried over
+    return [
+        _count(SalesData, *where),
+        select(func.coalesce(func.sum(SalesData.total_amount), 0))
+        .where(*where).scalar_subquery()
+    ]
+
+
+def rebuild_summary_counters():
+    """
+    Recount every scope from companies / users / uploaded_files /
+    sales_data (same queries as the summary_counters migration
+    backfill) and replace the stored rows.
+    """
+
+    employee_role = (
+        select(Role.id).where(Role.name == "Employee").scalar_subquery()
+    )
+
+    uploads, cleaned, last_upload = _file_totals(true())
+    rows, revenue = _sales_totals(true())
+
+    platform = select(
+        literal(SummaryCounter.SCOPE_PLATFORM),
+        literal(PLATFORM_SCOPE_ID),
+        _count(Company, true()),
+        _count(Company, Company.is_active.is_(True)),
+        _count(User, true()),
+        _count(User, User.role_id == employee_role),
+        uploads, cleaned, rows, revenue,
+        last_upload
+    )
+
+    uploads, cleaned, last_upload = _file_totals(UploadedFile.company_id == Company.id)
+    rows, revenue = _sales_totals(SalesData.company_id == Company.id)
+
+    per_company = select(
+        literal(SummaryCounter.SCOPE_COMPANY),
+        Company.id,
+        literal(0),
+        literal(0),
+        _count(User, User.company_id == Company.id),
+        _count(User, User.company_id == Company.id, User.role_id == employee_role),
+        uploads, cleaned, rows, revenue,
+        last_upload
+    )
+
+    uploads, cleaned, last_upload = _file_totals(UploadedFile.uploaded_by == User.id)
+    rows, revenue = _sales_totals(SalesData.uploaded_by == User.id)
+
+    per_employee = select(
+        literal(SummaryCounter.SCOPE_EMPLOYEE),
+        User.id,
+        literal(0),
+        literal(0),
+        literal(0),
+        literal(0),
+        uploads, cleaned, rows, revenue,
+        last_upload
+    ).where(User.role_id == employee_role)
+
+    columns = ["scope", "scope_id", *COUNTER_COLUMNS, "last_upload_at"]
+
+    db.session.execute(delete(SummaryCounter))
+
+    for query in (platform, per_company, per_employee):
+        db.session.execute(insert(SummaryCounter).from_select(columns, query))
+
+    db.session.commit()
+
+
+# =====================================================
+# CLI:  flask rebuild-summary-counters
+# =====================================================
+
+@click.command("rebuild-summary-counters")
+@with_appcontext
+def rebuild_summary_counters_command():
+    """Recompute summary_counters from the source tables (repairs drift)."""
+
+    rebuild_summary_counters()
+
+    scopes = db.session.execute(select(func.count(SummaryCounter.id))).scalar()
+
+    click.echo(f"Rebuilt summary_counters for {scopes} scope(s)")
@@ -0,0 +1,211 @@
+import threading
+import time
+
+from sqlalchemy import bindparam, delete, func, select, update
+
+from extensions import db
+from models import SalesData, SalesValue
+from utils.sql_helpers import upsert_increment
+from utils.value_index import ValueIndex
+
+
+# =====================================================
+# WRITE (CALLER'S TRANSACTION, NO COMMIT)
+# =====================================================
+
+def _value_counts(frame, company_id, uploaded_by):
+    records = []
+
+    for dimension in SalesValue.DIMENSIONS:
+        if dimension not in frame:
+            continue
+
+        values = frame[dimension]
+        counts = values[values.notna() & (values != "Unknown")].astype(str).value_counts()
+
+        records += [
+            {
+                "company_id": company_id,
+                "uploaded_by": uploaded_by,
+                "dimension": dimension,
+                "value": value,
+                "row_count": int(count)
+            }
+            for value, count in counts.items()
+        ]
+
+    return records
+
+
+def _add_rows_one_by_one(records):
+    """
+    Fallback for dialects without a native upsert.
+    """
+
+    for record in records:
+        row = SalesValue.query.filter_by(
+            uploaded_by=record["uploaded_by"],
+            dimension=record["dimension"],
+            value=record["value"]
+        ).first()
+
+        if row is None:
+            db.session.add(SalesValue(**record))
+            continue
+
+        row.row_count += record["row_count"]
+
+    db.session.flush()
+
+
+def add_to_value_dictionary(frame, company_id, uploaded_by):
+    """
+    Count the chunk's product / category / state / city values into the
+    uploader's dictionary. Runs in the caller's transaction (no commit).
+    """
+
+    records = _value_counts(frame, company_id, uploaded_by)
+
+    if not records:
+        return 0
+
+    stmt = upsert_increment(
+        SalesValue.__table__,
+        dialect_name=db.engine.dialect.name,
+        conflict_columns=["uploaded_by", "dimension", "value"],
+        increment_columns=["row_count"]
+    )
+
+    if stmt is not None:
+        db.session.execute(stmt, records)
+    else:
+        _add_rows_one_by_one(records)
+
+    value_dictionary.invalidate(uploaded_by)
+
+    return len(records)
+
+
+def remove_file_values(file_id, uploaded_by):
+    """
+    Take a file's stored rows off the dictionary counts, dropping values
+    no row carries any more. Call before the rows are deleted.
+    """
+
+    for dimension in SalesValue.DIMENSIONS:
+        column = getattr(SalesData, dimension)
+
+        counts = db.session.execute(
+            select(column, func.count())
+            .where(
+                SalesData.file_id == file_id,
+                column.isnot(None),
+                column != "Unknown"
+            )
+            .group_by(column)
+        ).all()
+
+        if not counts:
+            continue
+
+        # Core executemany: one statement for all of the file's values
+        table = SalesValue.__table__
+
+        db.session.execute(
+            update(table)
+            .where(
+                table.c.uploaded_by == uploaded_by,
+                table.c.dimension == dimension,
+                table.c.value == bindparam("file_value")
+            )
+            .values(row_count=table.c.row_count - bindparam("file_rows")),
+            [{"file_value": value, "file_rows": count} for value, count in counts]
+        )
+
+    db.session.execute(
+        delete(SalesValue).where(
+            SalesValue.uploaded_by == uploaded_by,
+            SalesValue.row_count <= 0
+        )
+    )
+
+    value_dictionary.invalidate(uploaded_by)
+
+
+# =====================================================
+# IN-PROCESS INDEX PER EMPLOYEE
+# =====================================================
+
+DEFAULT_VALUE_DICTIONARY_TTL = 60
+
+
+class ValueDictionary:
+    """
+    Each employee's sales_values held as a ValueIndex, for autocomplete
+    and for resolving names in NLP questions without touching
+    sales_data. Scoped like the charts: only values of rows the
+    employee uploaded, never a co-worker's.
+
+    Ingest runs in the worker process, so an index is revalidated after
+    VALUE_DICTIONARY_TTL seconds: one count / sum over the employee's
+    dictionary rows, and a rebuild only when that changed. Writes in
+    this process drop the employee's index immediately.
+    """
+
+    def __init__(self):
+        self.ttl = DEFAULT_VALUE_DICTIONARY_TTL
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get(
+            "VALUE_DICTIONARY_TTL",
+            DEFAULT_VALUE_DICTIONARY_TTL
+        )
+
+    def _signature(self, employee_id):
+        return tuple(db.session.execute(
+            select(
+                func.count(SalesValue.id),
+                func.coalesce(func.sum(SalesValue.row_count), 0)
+            ).where(SalesValue.uploaded_by == employee_id)
+        ).one())
+
+    def index(self, employee_id):
+        entry = self._indexes.get(employee_id)
+        now = time.monotonic()
+
+        if entry is not None and entry[0] >= now:
+            return entry[2]
+
+        signature = self._signature(employee_id)
+
+        if entry is not None and entry[1] == signature:
+            index = entry[2]
+        else:
+            index = ValueIndex(db.session.execute(
+                select(SalesValue.dimension, SalesValue.value, SalesValue.row_count)
+                .where(SalesValue.uploaded_by == employee_id)
+            ).all())
+
+        with self._lock:
+            self._indexes[employee_id] = (now + self.ttl, signature, index)
+
+        return index
+
+    def complete(self, employee_id, prefix, dimension=None, limit=10):
+        return self.index(employee_id).complete(prefix, dimension, limit)
+
+    def resolve(self, employee_id, text, dimension=None, **options):
+        return self.index(employee_id).resolve(text, dimension, **options)
+
+    def invalidate(self, employee_id):
+        with self._lock:
+            self._indexes.pop(employee_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes = {}
+
+
+value_dictionary = ValueDictionary()
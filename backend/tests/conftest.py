@@ -0,0 +1,137 @@
+import fnmatch
+import os
+import sys
+import time
+
+import pytest
+
+# Tests import the backend modules the way app.py does (flat, from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Never touch the database configured in .env: config.py reads this at import
+os.environ["DATABASE_URI"] = "sqlite://"
+
+
+@pytest.fixture
+def app():
+    from app import create_app
+    from extensions import db
+    from models import Role
+
+    app = create_app()
+    app.config["TESTING"] = True
+
+    with app.app_context():
+        db.create_all()
+
+        for name in ["Admin", "Company Manager", "Employee"]:
+            db.session.add(Role(name=name))
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def company(app):
+    from extensions import db
+    from models import Company
+
+    company = Company(name="Acme", industry="Retail", is_active=True)
+    db.session.add(company)
+    db.session.commit()
+    return company
+
+
+@pytest.fixture
+def employee(app, company):
+    from extensions import db
+    from models import Role, User
+
+    employee = User(
+        username="employee",
+        email="employee@example.com",
+        role_id=Role.query.filter_by(name="Employee").first().id,
+        company_id=company.id,
+        is_verified=True
+    )
+    employee.set_password("password123")
+    db.session.add(employee)
+    db.session.commit()
+    return employee
+
+
+@pytest.fixture
+def uploaded_file(app, company, employee):
+    from extensions import db
+    from models import UploadedFile
+
+    uploaded_file = UploadedFile(
+        filename="sales.csv",
+        file_path="sales.csv",
+        file_type="csv",
+        uploaded_by=employee.id,
+        company_id=company.id
+    )
+    db.session.add(uploaded_file)
+    db.session.commit()
+    return uploaded_file
+
+
+@pytest.fixture
+def employee_headers(employee):
+    from flask_jwt_extended import create_access_token
+
+    token = create_access_token(
+        identity=employee.email,
+        additional_claims={
+            "user_id": employee.id,
+            "role": "Employee",
+            "company_id": employee.company_id
+        }
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+class FakeRedis:
+    """
+    Dict-backed stand-in for the redis.Redis calls the caches make.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def _live(self, key):
+        entry = self.data.get(key)
+
+        if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+            del self.data[key]
+            return None
+
+        return entry
+
+    def get(self, key):
+        entry = self._live(key)
+        return None if entry is None else entry[1]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = (time.monotonic() + ttl, str(value).encode("utf-8"))
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = (None, str(value).encode("utf-8"))
+        return value
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
@@ -0,0 +1,82 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from services.data_cleaning_service import (
+    clean_sale_date,
+    parse_sale_date_column,
+    sniff_date_format
+)
+
+
+def per_value(values):
+    # Reference: the row-wise parser (dateutil, dayfirst=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return pd.to_datetime(values.map(clean_sale_date))
+
+
+def assert_matches_per_value(values):
+    parsed = parse_sale_date_column(values)
+
+    expected = per_value(values)
+
+    assert parsed.isna().tolist() == expected.isna().tolist()
+    assert (parsed.dropna() == expected.dropna()).all(), pd.DataFrame({
+        "value": values, "parsed": parsed, "expected": expected
+    })
+
+
+def test_ambiguous_column_sniffs_day_first():
+    values = pd.Series(["03/04/2024", "01/02/2023", "11/12/2024"])
+
+    assert sniff_date_format(values) == "%d/%m/%Y"
+    assert parse_sale_date_column(values).tolist() == [
+        pd.Timestamp("2024-04-03"),
+        pd.Timestamp("2023-02-01"),
+        pd.Timestamp("2024-12-11")
+    ]
+
+
+def test_month_first_column_reads_ambiguous_dates_day_first():
+    # 12/25 only parses month-first, so that format wins the sniff;
+    # 03/04 parses both ways and must still come out day-first
+    values = pd.Series(["12/25/2024", "03/04/2024", "01/31/2024", "06/07/2023"])
+
+    assert sniff_date_format(values) == "%m/%d/%Y"
+
+    parsed = parse_sale_date_column(values)
+
+    assert parsed[1] == pd.Timestamp("2024-04-03")
+    assert parsed[3] == pd.Timestamp("2023-07-06")
+    assert parsed[0] == pd.Timestamp("2024-12-25")
+    assert_matches_per_value(values)
+
+
+@pytest.mark.parametrize("values", [
+    ["03-04-2024", "25-12-2024", "31-01-2023"],
+    ["12-25-2024 10:30", "03-04-2024 08:00", "01-31-2024 23:59"],
+    ["03/04/2024 10:30:00", "12/25/2024 08:00:00"],
+    ["4 Mar 2024", "25 Dec 2024"],
+    ["03/04/2024", None, "", "not a date", " 12/25/2024 "]
+])
+def test_column_matches_row_wise_parser(values):
+    assert_matches_per_value(pd.Series(values, dtype=object))
+
+
+def test_iso_dates_stay_year_month_day():
+    # dateutil with dayfirst=True would read 2024-03-04 as 3 April
+    values = pd.Series(["2024-03-04", "2024-12-25"])
+
+    assert parse_sale_date_column(values).tolist() == [
+        pd.Timestamp("2024-03-04"),
+        pd.Timestamp("2024-12-25")
+    ]
+
+
+def test_empty_column():
+    values = pd.Series([None, ""], dtype=object)
+
+    assert sniff_date_format(values) is None
+    assert parse_sale_date_column(values).isna().all()
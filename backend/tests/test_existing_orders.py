@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pandas as pd
+
+from extensions import db
+from models import SalesData, UploadedFile
+from services.data_cleaning_service import drop_existing_orders
+
+
+def store_order(uploaded_file, order_id):
+    db.session.add(SalesData(
+        order_id=order_id,
+        order_date=datetime(2024, 3, 5),
+        product_id="P-1",
+        quantity=1,
+        unit_price=10.0,
+        total_amount=10.0,
+        payment_mode="UPI",
+        file_id=uploaded_file.id,
+        company_id=uploaded_file.company_id,
+        uploaded_by=uploaded_file.uploaded_by
+    ))
+    db.session.commit()
+
+
+def second_file(uploaded_file):
+    other = UploadedFile(
+        filename="more.csv",
+        file_path="more.csv",
+        file_type="csv",
+        uploaded_by=uploaded_file.uploaded_by,
+        company_id=uploaded_file.company_id
+    )
+    db.session.add(other)
+    db.session.commit()
+    return other
+
+
+def test_orders_differing_only_in_case_are_kept(uploaded_file):
+    store_order(uploaded_file, "A1")
+
+    chunk = pd.DataFrame({"order_id": ["A1", "a1", " A1", "B2"]})
+    remaining, cross_file, stored_earlier = drop_existing_orders(
+        chunk,
+        company_id=uploaded_file.company_id,
+        uploaded_file_id=second_file(uploaded_file).id
+    )
+
+    assert remaining["order_id"].tolist() == ["a1", " A1", "B2"]
+    assert (cross_file, stored_earlier) == (1, 0)
+
+
+def test_own_rows_are_not_counted_as_duplicates(uploaded_file):
+    store_order(uploaded_file, "A1")
+
+    other = second_file(uploaded_file)
+    store_order(other, "B2")
+
+    chunk = pd.DataFrame({"order_id": ["A1", "B2", "C3"]})
+    remaining, cross_file, stored_earlier = drop_existing_orders(
+        chunk,
+        company_id=uploaded_file.company_id,
+        uploaded_file_id=other.id
+    )
+
+    assert remaining["order_id"].tolist() == ["C3"]
+    assert (cross_file, stored_earlier) == (1, 1)
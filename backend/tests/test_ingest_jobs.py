@@ -0,0 +1,103 @@
+import pandas as pd
+from sqlalchemy import func, select
+
+import services.data_cleaning_service as data_cleaning_service
+from extensions import db
+from models import IngestJob, SalesData, SalesRollup, UploadedFile
+from services.data_cleaning_service import clean_and_store_sales_data
+
+COLUMN_MAPPING = {
+    "order_id": "order_no",
+    "order_date": "order_dt",
+    "product_id": "item_id",
+    "quantity": "units_sold",
+    "unit_price": "price_per_unit",
+    "payment_mode": "payment_type"
+}
+
+
+def map_columns(client, headers, uploaded_file):
+    return client.post("/employee/map-columns", headers=headers, json={
+        "uploaded_file_id": uploaded_file.id,
+        "required_mapping": COLUMN_MAPPING
+    })
+
+
+def test_map_columns_rejects_a_second_active_job(app, uploaded_file, employee_headers):
+    client = app.test_client()
+
+    first = map_columns(client, employee_headers, uploaded_file)
+    second = map_columns(client, employee_headers, uploaded_file)
+
+    assert first.status_code == 202
+    assert second.status_code == 409
+    assert second.get_json()["job_id"] == first.get_json()["job_id"]
+
+
+def test_map_columns_accepts_a_retry_once_the_job_finished(app, uploaded_file, employee_headers):
+    client = app.test_client()
+
+    first = map_columns(client, employee_headers, uploaded_file)
+
+    job = db.session.get(IngestJob, first.get_json()["job_id"])
+    job.status = IngestJob.STATUS_FAILED
+    db.session.commit()
+
+    assert map_columns(client, employee_headers, uploaded_file).status_code == 202
+
+
+def test_retried_ingest_counts_rows_stored_by_the_failed_attempt(
+    app, uploaded_file, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    app.config["CLEANING_CHUNK_SIZE"] = 4
+
+    csv_path = tmp_path / "sales.csv"
+    pd.DataFrame({
+        "order_no": [f"ORD-{n}" for n in range(10)],
+        "order_dt": ["2024-03-05"] * 10,
+        "item_id": ["P-1"] * 10,
+        "units_sold": [2] * 10,
+        "price_per_unit": [50] * 10,
+        "payment_type": ["UPI"] * 10
+    }).to_csv(csv_path, index=False)
+
+    def run():
+        return clean_and_store_sales_data(
+            file_path=str(csv_path),
+            company_id=uploaded_file.company_id,
+            uploaded_file_id=uploaded_file.id,
+            column_mapping=COLUMN_MAPPING
+        )
+
+    # First attempt dies after its first chunk was committed
+    insert = data_cleaning_service.bulk_insert_sales_data
+    calls = []
+
+    def insert_then_crash(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("worker lost its connection")
+        return insert(*args, **kwargs)
+
+    monkeypatch.setattr(data_cleaning_service, "bulk_insert_sales_data", insert_then_crash)
+    assert run()[1] == 500
+
+    monkeypatch.setattr(data_cleaning_service, "bulk_insert_sales_data", insert)
+    report, status = run()
+
+    assert status == 201
+    assert report["stats"]["new_rows_inserted"] == 10
+    assert report["stats"]["cross_file_duplicates"] == 0
+
+    stored = db.session.execute(
+        select(func.count()).where(SalesData.file_id == uploaded_file.id)
+    ).scalar()
+    rolled_up = db.session.execute(
+        select(func.sum(SalesRollup.order_count))
+        .where(SalesRollup.file_id == uploaded_file.id)
+    ).scalar()
+
+    assert stored == 10
+    assert rolled_up == 10
+    assert db.session.get(UploadedFile, uploaded_file.id).rows_stored == 10
@@ -0,0 +1,23 @@
+from extensions import nlp_cache
+from services.nlp_services import parse_query, process_nlp_batch
+
+
+def test_top_n_questions_share_one_cache_key(app, employee):
+    top_3 = parse_query("top 3 selling products in 2024", employee.id)
+
+    assert top_3[0] == "top_products"
+    assert top_3 == parse_query("top 5 selling products in 2024", employee.id)
+    assert top_3 == parse_query("best selling products 2024", employee.id)
+    assert top_3 != parse_query("top 3 selling products in 2023", employee.id)
+
+
+def test_top_n_variants_are_answered_from_one_entry(app, employee):
+    nlp_cache.clear()
+
+    first, second = process_nlp_batch(
+        ["top 3 selling products in 2024", "top 5 selling products in 2024"],
+        employee.id
+    )
+
+    assert first == second
+    assert len(nlp_cache.backend) == 1
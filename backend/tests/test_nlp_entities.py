@@ -0,0 +1,109 @@
+import pytest
+
+from utils.nlp_utils import extract_entities
+
+
+def period(query):
+    entities = extract_entities(query)
+    assert "period" in entities, entities
+    return entities["period"]["start"], entities["period"]["end"]
+
+
+# ----------------------------------------
+# RANGES
+# ----------------------------------------
+
+def test_yearless_month_range_wraps_over_new_year():
+    entities = extract_entities("revenue in nov to feb")
+
+    assert entities["months"]["values"] == [11, 12, 1, 2]
+    assert "period" not in entities
+
+
+def test_yearless_quarter_range_wraps_over_new_year():
+    assert extract_entities("orders in q4 to q1")["months"]["values"] == [10, 11, 12, 1, 2, 3]
+
+
+def test_yearless_month_range_in_order():
+    assert extract_entities("revenue from jan to mar")["months"]["values"] == [1, 2, 3]
+
+
+def test_wrapping_range_dated_at_the_end_starts_the_year_before():
+    assert period("revenue from nov to feb 2024") == ("2023-11-01", "2024-02-29")
+
+
+def test_wrapping_range_dated_at_the_start_ends_the_year_after():
+    assert period("revenue nov 2024 to feb") == ("2024-11-01", "2025-02-28")
+
+
+@pytest.mark.parametrize("query", [
+    "revenue of 2024 and 2023",
+    "revenue of 2023 and 2024",
+    "revenue from 2024 to 2023"
+])
+def test_year_range_in_either_order(query):
+    assert period(query) == ("2023-01-01", "2024-12-31")
+
+
+def test_reversed_day_range():
+    assert period("revenue 2024-02-01 to 2024-01-05") == ("2024-01-05", "2024-02-01")
+
+
+def test_dashed_year_range():
+    entities = extract_entities("revenue 2024-2025")
+
+    assert entities["period"]["start"] == "2024-01-01"
+    assert entities["period"]["end"] == "2025-12-31"
+    assert "terms" not in entities
+
+
+def test_dashed_month_range_with_year():
+    assert period("revenue jan-mar 2024") == ("2024-01-01", "2024-03-31")
+
+
+def test_iso_date_keeps_its_dashes():
+    assert period("revenue on 2024-03-15") == ("2024-03-15", "2024-03-15")
+
+
+# ----------------------------------------
+# SINGLE EXPRESSIONS
+# ----------------------------------------
+
+def test_year():
+    assert period("revenue in 2024") == ("2024-01-01", "2024-12-31")
+
+
+def test_standalone_year_dates_a_quarter():
+    assert period("revenue in q1 of 2024") == ("2024-01-01", "2024-03-31")
+
+
+def test_yearless_month_is_a_month_filter():
+    assert extract_entities("revenue in march")["months"]["values"] == [3]
+
+
+def test_may_needs_a_year():
+    assert "period" not in extract_entities("may i see revenue")
+    assert period("revenue in may 2024") == ("2024-05-01", "2024-05-31")
+
+
+# ----------------------------------------
+# FILTERS / COMPARE / LIMIT
+# ----------------------------------------
+
+def test_dimension_filter_and_terms():
+    entities = extract_entities("revenue for state gujarat")
+    assert entities["filters"] == {"state": "gujarat"}
+
+    assert extract_entities("revenue in gujarat")["terms"] == ["gujarat"]
+
+
+def test_compare_takes_missing_year_from_other_side():
+    left, right = extract_entities("compare march vs april 2024")["compare"]
+
+    assert left["period"]["start"] == "2024-03-01"
+    assert right["period"]["end"] == "2024-04-30"
+
+
+def test_top_limit():
+    assert extract_entities("top 3 products")["limit"] == 3
+    assert extract_entities("top products")["limit"] == 5
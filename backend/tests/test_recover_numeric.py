@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.data_cleaning_service import recover_numeric_columns
+
+NUMERIC_COLUMNS = ["quantity", "unit_price", "total_amount"]
+
+
+def recover_numeric(row):
+    # Row-wise version the pipeline used before recover_numeric_columns
+    qty = row["quantity"]
+    price = row["unit_price"]
+    total = row["total_amount"]
+
+    if pd.isna(qty) and pd.notna(price) and pd.notna(total) and price > 0:
+        row["quantity"] = total / price
+
+    if pd.isna(price) and pd.notna(qty) and pd.notna(total) and qty > 0:
+        row["unit_price"] = total / qty
+
+    if pd.notna(row["quantity"]) and pd.notna(row["unit_price"]):
+        row["total_amount"] = row["quantity"] * row["unit_price"]
+
+    return row
+
+
+def random_column(rng, size, kind):
+    values = rng.uniform(-5, 500, size).round(rng.integers(0, 4))
+    values[rng.random(size) < 0.05] = 0
+
+    column = pd.Series(values, dtype=object)
+    column[rng.random(size) < 0.25] = np.nan
+
+    if kind == "mixed":
+        # Numbers, numeric strings and junk in one object column
+        strings = rng.random(size) < 0.2
+        column[strings] = [str(value) for value in column[strings]]
+        column[rng.random(size) < 0.1] = rng.choice(["abc", "", "n/a", "1,200", " 7 "])
+    elif kind == "string":
+        column = column.map(lambda value: "" if pd.isna(value) else str(value))
+    elif kind == "empty":
+        column = pd.Series([None] * size, dtype=object)
+    else:
+        column = column.astype(float)
+
+    return column
+
+
+def random_frame(seed, size=300):
+    rng = np.random.default_rng(seed)
+    kinds = ["float", "mixed", "string", "empty"]
+
+    return pd.DataFrame({
+        column: random_column(rng, size, rng.choice(kinds, p=[0.5, 0.25, 0.15, 0.1]))
+        for column in NUMERIC_COLUMNS
+    })
+
+
+def coerce(df):
+    # clean_sales_frame parses the columns before recovering them
+    df = df.copy()
+    for column in NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+def assert_same(expected, actual):
+    for column in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(
+            expected[column].to_numpy(dtype=float),
+            actual[column].to_numpy(dtype=float),
+            err_msg=column
+        )
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_row_wise_recovery(seed):
+    raw = random_frame(seed)
+
+    expected = coerce(raw).apply(recover_numeric, axis=1)
+    actual = recover_numeric_columns(raw.copy())
+
+    assert_same(expected, actual)
+
+
+def test_recovery_rules():
+    df = pd.DataFrame({
+        "quantity": [np.nan, 2, np.nan, 0, 3, np.nan],
+        "unit_price": [10, np.nan, 0, np.nan, 4, np.nan],
+        "total_amount": [50, 30, 20, 10, np.nan, 5]
+    })
+
+    result = recover_numeric_columns(df)
+
+    # qty from total / price, price from total / qty, total from qty * price
+    assert result["quantity"].tolist()[:2] == [5, 2]
+    assert result["unit_price"].tolist()[:2] == [10, 15]
+    assert result["total_amount"].tolist()[4] == 12
+
+    # Zero divisors and rows with a single value stay unrecovered
+    assert np.isnan(result["quantity"][2])
+    assert np.isnan(result["unit_price"][3])
+    assert result[["quantity", "unit_price"]].iloc[5].isna().all()
@@ -0,0 +1,67 @@
+import time
+
+from sqlalchemy import event
+
+from extensions import db
+from models import Company
+from services import reference_data_service
+from services.reference_data_service import ReferenceDataCache
+
+
+def worker_cache(app, versions=None):
+    # One ReferenceDataCache per simulated worker process
+    cache = ReferenceDataCache()
+    cache.init_app(app, versions=versions)
+    return cache
+
+
+def suspend(company_id, cache):
+    db.session.get(Company, company_id).is_active = False
+    db.session.commit()
+    cache.invalidate_company(company_id)
+
+
+def test_cached_lookups_skip_the_database(app, company, fake_redis):
+    cache = worker_cache(app, versions=fake_redis)
+    cache.company(company.id)
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for _ in range(5):
+            assert cache.company(company.id).is_active
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+    assert statements == []
+
+
+def test_suspend_reaches_other_workers_through_the_shared_version(app, company, fake_redis):
+    admin_worker = worker_cache(app, versions=fake_redis)
+    upload_worker = worker_cache(app, versions=fake_redis)
+
+    assert upload_worker.company(company.id).is_active
+
+    suspend(company.id, admin_worker)
+
+    assert not upload_worker.company(company.id).is_active
+
+
+def test_without_a_shared_backend_other_workers_wait_for_the_ttl(app, company, monkeypatch):
+    admin_worker = worker_cache(app)
+    upload_worker = worker_cache(app)
+
+    assert upload_worker.company(company.id).is_active
+
+    suspend(company.id, admin_worker)
+
+    assert upload_worker.company(company.id).is_active
+
+    expired = time.monotonic() + upload_worker.company_ttl + 1
+    monkeypatch.setattr(reference_data_service.time, "monotonic", lambda: expired)
+
+    assert not upload_worker.company(company.id).is_active
@@ -0,0 +1,126 @@
+import time
+
+import pytest
+
+from extensions import chart_cache, db
+from services.data_version_service import bump_data_version
+from utils import result_cache
+from utils.result_cache import (
+    MemoryCacheBackend,
+    NullCacheBackend,
+    RedisCacheBackend,
+    ResultCache
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Controllable time.monotonic for TTL checks
+    now = [time.monotonic()]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def bound_cache(app, backend):
+    cache = ResultCache("test")
+    cache.init_app(app, backend=backend)
+    return cache
+
+
+def test_redis_backend_miss_then_hit(app, fake_redis):
+    cache = bound_cache(app, RedisCacheBackend(fake_redis, prefix="test:"))
+    key = cache.make_key(1, "revenue", {"b": 2, "a": 1})
+
+    assert cache.get(key) is None
+
+    cache.set(key, {"labels": ["Jan"], "values": [10.5]})
+
+    assert cache.get(key) == {"labels": ["Jan"], "values": [10.5]}
+    assert cache.stats() == {
+        "backend": "RedisCacheBackend",
+        "hits": 1,
+        "misses": 1,
+        "hit_rate": 0.5
+    }
+
+
+def test_make_key_ignores_dict_order():
+    assert ResultCache.make_key({"a": 1, "b": 2}) == ResultCache.make_key({"b": 2, "a": 1})
+    assert ResultCache.make_key(1, 2) != ResultCache.make_key(2, 1)
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert len(backend) == 2
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+
+
+def test_memory_backend_expires_entries(clock):
+    backend = MemoryCacheBackend(ttl=30)
+    backend.set("a", 1)
+
+    clock[0] += 29
+    assert backend.get("a") == 1
+
+    clock[0] += 2
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_redis_backend_expires_entries(fake_redis, clock):
+    backend = RedisCacheBackend(fake_redis, ttl=30, prefix="test:")
+    backend.set("a", [1, 2])
+
+    clock[0] += 31
+    assert backend.get("a") is None
+
+
+def test_redis_backend_clear_keeps_other_prefixes(fake_redis):
+    charts = RedisCacheBackend(fake_redis, prefix="chart:")
+    answers = RedisCacheBackend(fake_redis, prefix="nlp:")
+
+    charts.set("a", 1)
+    answers.set("a", 2)
+    charts.clear()
+
+    assert charts.get("a") is None
+    assert answers.get("a") == 2
+
+
+def test_null_backend_always_misses(app):
+    cache = bound_cache(app, NullCacheBackend())
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["hit_rate"] == 0.0
+
+
+def test_data_version_bump_moves_charts_to_a_new_key(
+    app, uploaded_file, employee, employee_headers, fake_redis
+):
+    chart_cache.init_app(app, backend=RedisCacheBackend(fake_redis, prefix="chart:"))
+    client = app.test_client()
+
+    def generate():
+        response = client.post("/employee/generate-charts", headers=employee_headers, json={
+            "charts": ["payment_mode_distribution"]
+        })
+        assert response.status_code == 200
+        return response.headers["X-Cache"]
+
+    assert generate() == "MISS"
+    assert generate() == "HIT"
+
+    bump_data_version(employee.id)
+    db.session.commit()
+
+    assert generate() == "MISS"
+    assert generate() == "HIT"
+    assert len(fake_redis.scan_iter("chart:*")) == 2
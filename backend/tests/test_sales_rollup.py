@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from extensions import db
+from models import SalesData, SalesRollup
+from services.sales_rollup_service import rebuild_sales_rollup
+
+
+def store_sales_rows(uploaded_file, count):
+    for n in range(count):
+        db.session.add(SalesData(
+            order_id=f"ORD-{n}",
+            order_date=datetime(2024, 1 + n % 3, 10),
+            product_id=f"P-{n % 4}",
+            product_name=f"Product {n % 4}",
+            category="Toys",
+            quantity=1 + n % 5,
+            unit_price=10.0,
+            total_amount=10.0 * (1 + n % 5),
+            payment_mode="UPI",
+            sales_channel="Online",
+            state="Kerala",
+            city="Kochi",
+            file_id=uploaded_file.id,
+            company_id=uploaded_file.company_id,
+            uploaded_by=uploaded_file.uploaded_by
+        ))
+    db.session.commit()
+
+
+def rollup_totals(uploaded_file):
+    return db.session.execute(
+        select(
+            func.sum(SalesRollup.order_count),
+            func.sum(SalesRollup.quantity),
+            func.sum(SalesRollup.total_amount)
+        ).where(SalesRollup.file_id == uploaded_file.id)
+    ).one()
+
+
+def test_rebuild_covers_every_batch(uploaded_file):
+    store_sales_rows(uploaded_file, 23)
+
+    rebuild_sales_rollup(uploaded_file, batch_size=5)
+
+    orders, quantity, revenue = rollup_totals(uploaded_file)
+
+    assert orders == 23
+    assert quantity == sum(1 + n % 5 for n in range(23))
+    assert revenue == 10.0 * quantity
+
+
+def test_rebuild_replaces_existing_rollup(uploaded_file):
+    store_sales_rows(uploaded_file, 12)
+
+    rebuild_sales_rollup(uploaded_file, batch_size=4)
+    rebuild_sales_rollup(uploaded_file, batch_size=7)
+
+    assert rollup_totals(uploaded_file)[0] == 12
@@ -1,18 +1,155 @@
+import json
 import re
+from datetime import date, timedelta
 
 # ----------------------------------------
 # INTENT KEYWORDS
 # ----------------------------------------
 
+# Default table; NLP_INTENT_KEYWORDS_FILE (JSON, same shape) replaces
+# it. A phrase list weighs each phrase by its word count, a
+# {phrase: weight} dict sets weights explicitly.
 INTENT_KEYWORDS = {
     "revenue": ["revenue", "earnings", "income"],
     "orders": ["orders", "transactions", "sales count"],
-    "top_products": ["top product", "best product", "top selling"],
+    "top_products": ["top product", "best product", "top selling", "best selling", "selling products"],
     "state_sales": ["sales by state", "state wise sales"],
     "payment_mode": ["payment mode", "payment method", "payment distribution"]
 }
 
 
+# ----------------------------------------
+# COMPILED INTENT MATCHER
+# ----------------------------------------
+
+def _trie_pattern(phrases):
+    """
+    Regex matching any of `phrases`, factored as a prefix trie so
+    shared prefixes are tried once however many phrases there are.
+    Greedy optional suffixes make the longest phrase win ("sales by
+    state" over "sales"). Spaces match any whitespace run.
+    """
+
+    trie = {}
+
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        terminal = "" in node
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+        if terminal:
+            return "(?:" + body + ")?"
+
+        return body
+
+    return build(trie)
+
+
+class IntentMatcher:
+    """
+    All keyword phrases of all intents compiled into one alternation
+    regex: a single left-to-right pass finds every phrase in the query.
+
+    Scoring is deterministic: an intent scores the summed weight of its
+    matched phrases; ties go to the intent matched first in the query,
+    then to the earlier intent in the table.
+    """
+
+    def __init__(self, keywords):
+        self.intents = list(keywords)
+        self._phrases = {}
+
+        for priority, (intent, phrases) in enumerate(keywords.items()):
+            if not isinstance(phrases, dict):
+                phrases = {phrase: len(phrase.split()) for phrase in phrases}
+
+            for phrase, weight in phrases.items():
+                key = self._normalize(phrase)
+
+                # First intent listing a phrase keeps it
+                self._phrases.setdefault(key, (intent, weight, priority))
+
+        self.pattern = re.compile(
+            r"\b" + _trie_pattern(self._phrases)
+        ) if self._phrases else None
+
+    @staticmethod
+    def _normalize(phrase):
+        return " ".join(phrase.lower().split())
+
+    def scores(self, query):
+        """
+        {intent: (score, first position, priority)} for matched intents.
+        """
+
+        found = {}
+
+        if self.pattern is None:
+            return found
+
+        for match in self.pattern.finditer(query):
+            intent, weight, priority = self._phrases[self._normalize(match.group())]
+
+            if intent in found:
+                score, position, _ = found[intent]
+                found[intent] = (score + weight, position, priority)
+            else:
+                found[intent] = (weight, match.start(), priority)
+
+        return found
+
+    def match(self, query):
+        found = self.scores(query)
+
+        if not found:
+            return None
+
+        return min(
+            found,
+            key=lambda intent: (-found[intent][0], found[intent][1], found[intent][2])
+        )
+
+
+def load_intent_keywords(path):
+    with open(path, encoding="utf-8") as f:
+        keywords = json.load(f)
+
+    if not isinstance(keywords, dict):
+        raise ValueError("Intent keyword file must map intent -> phrases")
+
+    return keywords
+
+
+_intent_matcher = IntentMatcher(INTENT_KEYWORDS)
+
+
+def configure_intent_matcher(app):
+    """
+    Rebuild the matcher from NLP_INTENT_KEYWORDS_FILE when configured.
+    """
+
+    global _intent_matcher
+
+    path = app.config.get("NLP_INTENT_KEYWORDS_FILE")
+
+    if path:
+        _intent_matcher = IntentMatcher(load_intent_keywords(path))
+
+
 # ----------------------------------------
 # PREPROCESS QUERY
 # ----------------------------------------
@@ -29,27 +166,443 @@ def preprocess_query(query: str) -> str:
 # ----------------------------------------
 
 def detect_intent(query: str):
+    return _intent_matcher.match(query)
+
+
+# ----------------------------------------
+# ENTITY GRAMMAR
+# ----------------------------------------
+
+MONTH_NAMES = {
+    "january": 1, "february": 2, "march": 3, "april": 4,
+    "may": 5, "june": 6, "july": 7, "august": 8,
+    "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7,
+    "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12
+}
+
+MONTH_LABELS = [
+    None, "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+QUARTER_WORDS = {
+    "q1": 1, "q2": 2, "q3": 3, "q4": 4,
+    "first": 1, "second": 2, "third": 3, "fourth": 4,
+    "1st": 1, "2nd": 2, "3rd": 3, "4th": 4
+}
+
+# Question word → sales_data column it filters
+DIMENSION_WORDS = {
+    "state": "state",
+    "city": "city",
+    "category": "category",
+    "product": "product_name"
+}
+
+RANGE_WORDS = {"to", "till", "until", "through", "and"}
+
+COMPARE_WORDS = {"vs", "versus", "against"}
+
+# Words that end (or never start) a named value such as "state gujarat"
+STOP_WORDS = {
+    "a", "all", "an", "and", "are", "at", "best", "between", "by",
+    "categories", "cities", "compare", "compared", "count", "did",
+    "distribution", "do", "does", "during", "each", "earnings", "for",
+    "from", "generated", "give", "highest", "how", "in", "income", "is",
+    "lowest", "made", "many", "me", "method", "mode", "month", "most",
+    "much", "my", "of", "on", "or", "order", "orders", "our", "over",
+    "payment", "per", "please", "products", "quarter", "revenue", "sale",
+    "sales", "selling", "show", "sold", "states", "tell", "than", "that",
+    "the", "this", "top", "total", "transactions", "used", "was", "were",
+    "what", "which", "wise", "with", "year", "named", "called", "i",
+    "you", "can", "get", "find", "know", "number", "amount", "value",
+    "data", "it", "we", "us", "there", "have", "has", "about", "now",
+    *RANGE_WORDS, *COMPARE_WORDS, *DIMENSION_WORDS
+}
+
+VALUE_PREFIXES = {"in", "for", "from", "of", "at"}
+VALUE_FILLERS = {"is", "of", "named", "called"}
+
+MAX_VALUE_WORDS = 3
+
+_DATE_PATTERNS = [
+    (re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$"), ("year", "month", "day")),
+    # Day first, like clean_sale_date(dayfirst=True)
+    (re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$"), ("day", "month", "year"))
+]
+
+_YEAR_TOKEN = re.compile(r"^20\d{2}$")
+
+
+_YEAR_RANGE = re.compile(r"\b(20\d{2})-(20\d{2})\b")
+
+
+def _tokenize(query):
+    # Keep "-" and "/" inside dates; a dash between words or between
+    # two years ("2024-2025") is a range
+    query = re.sub(r"[^\w\s/-]", " ", query.lower())
+    query = _YEAR_RANGE.sub(r"\1 to \2", query)
+    query = re.sub(r"(?<!\d)-|-(?!\d)", " to ", query)
+    return query.split()
+
+
+def _parse_date(token):
+    for pattern, fields in _DATE_PATTERNS:
+        found = pattern.match(token)
+        if found:
+            parts = dict(zip(fields, map(int, found.groups())))
+            try:
+                return date(parts["year"], parts["month"], parts["day"])
+            except ValueError:
+                return None
+    return None
+
+
+def _month_end(year, month):
+    return date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+
+
+class _TimeAtom:
+    """
+    One time expression of a question: a year, a month, a quarter or a
+    day. Month / quarter atoms may lack a year.
+    """
+
+    def __init__(self, kind, value, year=None):
+        self.kind = kind
+        self.value = value
+        self.year = year
+
+    @property
+    def months(self):
+        if self.kind == "month":
+            return [self.value]
+        if self.kind == "quarter":
+            return [3 * self.value - 2, 3 * self.value - 1, 3 * self.value]
+        return None
+
+    @property
+    def label(self):
+        if self.kind == "year":
+            return str(self.value)
+        if self.kind == "date":
+            return self.value.isoformat()
+
+        label = MONTH_LABELS[self.value] if self.kind == "month" else f"Q{self.value}"
+
+        return label if self.year is None else f"{label} {self.year}"
 
-    for intent, keywords in INTENT_KEYWORDS.items():
-        for word in keywords:
-            if word in query:
-                return intent
+    @property
+    def known_year(self):
+        if self.kind == "year":
+            return self.value
+        if self.kind == "date":
+            return self.value.year
+        return self.year
+
+    def bounds(self):
+        if self.kind == "year":
+            return date(self.value, 1, 1), date(self.value, 12, 31)
+        if self.kind == "date":
+            return self.value, self.value
+
+        months = self.months
+        return date(self.year, months[0], 1), _month_end(self.year, months[-1])
+
+
+def _time_atoms(tokens):
+    """
+    [(first token index, last token index, atom)] in question order.
+    """
+
+    atoms = []
+    i = 0
+
+    while i < len(tokens):
+        token = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else ""
+        year = int(following) if _YEAR_TOKEN.match(following) else None
+
+        day = _parse_date(token)
+
+        if day is not None:
+            atoms.append((i, i, _TimeAtom("date", day)))
+
+        elif _YEAR_TOKEN.match(token):
+            atoms.append((i, i, _TimeAtom("year", int(token))))
+
+        # "may" is only a month next to a year ("may 2024")
+        elif token in MONTH_NAMES and (token != "may" or year):
+            end = i + 1 if year else i
+            atoms.append((i, end, _TimeAtom("month", MONTH_NAMES[token], year)))
+            i = end
+
+        elif token in QUARTER_WORDS and (token.startswith("q") or following == "quarter"):
+            end = i if token.startswith("q") else i + 1
+            after = tokens[end + 1] if end + 1 < len(tokens) else ""
+            year = int(after) if _YEAR_TOKEN.match(after) else None
+            end += 1 if year else 0
+            atoms.append((i, end, _TimeAtom("quarter", QUARTER_WORDS[token], year)))
+            i = end
+
+        elif token == "quarter" and following in {"1", "2", "3", "4"}:
+            after = tokens[i + 2] if i + 2 < len(tokens) else ""
+            year = int(after) if _YEAR_TOKEN.match(after) else None
+            end = i + 2 if year else i + 1
+            atoms.append((i, end, _TimeAtom("quarter", int(following), year)))
+            i = end
+
+        i += 1
+
+    return atoms
+
+
+def _time_entities(tokens, default_year=None):
+    """
+    {"period": {"label", "start", "end"}} for a calendar span, or
+    {"months": {"label", "values"}} for month-of-year filters without a
+    year ("in march", "q1"); {} when the tokens name no time.
+    """
+
+    atoms = _time_atoms(tokens)
+
+    if not atoms:
+        return {}
+
+    # "march ... 2024": a standalone year dates yearless months / quarters
+    years = [atom.value for _, _, atom in atoms if atom.kind == "year"]
+    dated = [atom for _, _, atom in atoms if atom.months and atom.year is None]
+
+    if dated and years:
+        atoms = [entry for entry in atoms if entry[2].kind != "year"]
+        default_year = years[0]
+
+    for _, _, atom in atoms:
+        if atom.months and atom.year is None:
+            atom.year = default_year
+
+    first = atoms[0][2]
+    last = first
+
+    # Range: two atoms joined by to / till / and / "-"
+    if len(atoms) > 1:
+        gap = tokens[atoms[0][1] + 1:atoms[1][0]]
+        if gap and all(word in RANGE_WORDS for word in gap):
+            last = atoms[1][2]
+
+            # "november to february" runs over the new year
+            wraps = bool(first.months and last.months) and first.months[0] > last.months[-1]
+
+            if first.months and first.year is None and last.known_year is not None:
+                first.year = last.known_year - wraps
+            if last.months and last.year is None and first.known_year is not None:
+                last.year = first.known_year + wraps
+
+    if last is first:
+        label = first.label
+    elif first.months and last.months and first.year == last.year:
+        # "January to March 2024" rather than "January 2024 to March 2024"
+        label = f"{_TimeAtom(first.kind, first.value).label} to {last.label}"
+    else:
+        label = f"{first.label} to {last.label}"
+
+    if first.months and first.year is None:
+        start = first.months[0]
+        end = last.months[-1] if last.months else first.months[-1]
+
+        if start <= end:
+            values = list(range(start, end + 1))
+        else:
+            values = list(range(start, 13)) + list(range(1, end + 1))
+
+        return {"months": {"label": label, "values": values}}
+
+    # Either order ("2024 and 2023") covers both ends
+    start = min(first.bounds()[0], last.bounds()[0])
+    end = max(first.bounds()[1], last.bounds()[1])
+
+    return {
+        "period": {
+            "label": label,
+            "start": start.isoformat(),
+            "end": end.isoformat()
+        }
+    }
+
+
+def _is_value_word(token):
+    return (
+        token not in STOP_WORDS
+        and not token.isdigit()
+        and token not in MONTH_NAMES
+        and token not in QUARTER_WORDS
+        and _parse_date(token) is None
+    )
+
+
+def _dimension_entities(tokens):
+    """
+    ({column: value}, leftover value words) for "state gujarat",
+    "product of blue shirt", "in gujarat state", ...
+    """
+
+    filters = {}
+    used = set()
+
+    for i, token in enumerate(tokens):
+        column = DIMENSION_WORDS.get(token)
+
+        if column is None or column in filters:
+            continue
+
+        # Forward: state gujarat / product is blue shirt
+        j = i + 1
+        while j < len(tokens) and tokens[j] in VALUE_FILLERS:
+            j += 1
+
+        words = []
+        while j < len(tokens) and len(words) < MAX_VALUE_WORDS and _is_value_word(tokens[j]):
+            words.append(j)
+            j += 1
+
+        # Backward, after a preposition: in gujarat state
+        if not words:
+            j = i - 1
+            while j >= 0 and len(words) < MAX_VALUE_WORDS and _is_value_word(tokens[j]):
+                words.insert(0, j)
+                j -= 1
+
+            if j < 0 or tokens[j] not in VALUE_PREFIXES:
+                words = []
+
+        if words:
+            filters[column] = " ".join(tokens[k] for k in words)
+            used.update(words)
+
+    leftover = [
+        token for k, token in enumerate(tokens)
+        if k not in used and _is_value_word(token)
+    ]
+
+    return filters, leftover
+
+
+def _scope_entities(tokens, default_year=None):
+    scope = _time_entities(tokens, default_year)
+    filters, leftover = _dimension_entities(tokens)
+
+    if filters:
+        scope["filters"] = filters
+
+    # Words that may still name a value ("revenue in gujarat"),
+    # resolved against the company's value dictionary
+    if leftover:
+        scope["terms"] = leftover
+
+    return scope, leftover
+
+
+def _period_year(scope):
+    period = scope.get("period")
+
+    if period and period["start"][:4] == period["end"][:4]:
+        return int(period["start"][:4])
 
     return None
 
 
+def _compare_split(tokens):
+    for i, token in enumerate(tokens):
+        if token in COMPARE_WORDS:
+            return i, i + 1
+        if token == "compared" and i + 1 < len(tokens) and tokens[i + 1] in {"to", "with"}:
+            return i, i + 2
+    return None
+
+
+def _compare_entities(tokens):
+    """
+    Two scopes for "compare X vs Y"; whatever one side leaves out
+    (the year, a state, ...) is taken from the other side.
+    """
+
+    split = _compare_split(tokens)
+
+    if split is None:
+        return None
+
+    left = [token for token in tokens[:split[0]] if token != "compare"]
+    right = tokens[split[1]:]
+
+    sides = [_scope_entities(left), _scope_entities(right)]
+
+    # "march vs april 2024": date the yearless side with the other's year
+    for index in (0, 1):
+        scope = sides[index][0]
+        other_year = _period_year(sides[1 - index][0])
+
+        if "months" in scope and other_year:
+            sides[index] = _scope_entities([left, right][index], other_year)
+
+    scopes = [scope for scope, _ in sides]
+
+    # "state gujarat vs maharashtra": a bare value names the other side's dimension
+    for index in (0, 1):
+        scope, leftover = sides[index]
+        other_filters = scopes[1 - index].get("filters", {})
+
+        if not scope.get("filters") and leftover and len(other_filters) == 1:
+            column = next(iter(other_filters))
+            scope["filters"] = {column: " ".join(leftover[:MAX_VALUE_WORDS])}
+            scope.pop("terms", None)
+
+    for index in (0, 1):
+        scope, other = scopes[index], scopes[1 - index]
+
+        if "period" not in scope and "months" not in scope:
+            for name in ("period", "months"):
+                if name in other:
+                    scope[name] = other[name]
+
+        for column, value in other.get("filters", {}).items():
+            scope.setdefault("filters", {}).setdefault(column, value)
+
+    if scopes[0] == scopes[1] or not all(scopes):
+        return None
+
+    return scopes
+
+
 # ----------------------------------------
 # EXTRACT ENTITIES
 # ----------------------------------------
 
 def extract_entities(query: str):
+    """
+    Entities of a question:
+
+    - period: {"label", "start", "end"} (ISO dates, end inclusive) for
+      years, months, quarters, days and ranges between them
+    - months: {"label", "values"} for months / quarters without a year
+    - filters: {column: value} for state, city, category and product
+    - terms: leftover words that may name such a value without saying
+      which kind ("revenue in gujarat")
+    - compare: [scope, scope] for "compare X vs Y", each scope holding
+      its own period / months / filters
+    - limit: N of "top N" (default 5)
+    """
+
+    tokens = _tokenize(query)
 
     entities = {}
 
-    # Detect year
-    year_match = re.search(r"\b(20\d{2})\b", query)
-    if year_match:
-        entities["year"] = int(year_match.group())
+    compare = _compare_entities(tokens)
+
+    if compare:
+        entities["compare"] = compare
+    else:
+        entities.update(_scope_entities(tokens)[0])
 
     # Detect top N
     top_match = re.search(r"top\s+(\d+)", query)
@@ -58,4 +611,4 @@ def extract_entities(query: str):
     else:
         entities["limit"] = 5
 
-    return entities
\ No newline at end of file
+    return entities
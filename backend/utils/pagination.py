@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+
+
+# ==========================================================
+# KEYSET PAGINATION CURSORS
+# ==========================================================
+# A cursor is the (sort value, id) of the last row of a page,
+# opaque to clients: url-safe base64 of a small JSON array.
+
+def encode_cursor(sort_value, row_id):
+    if isinstance(sort_value, datetime):
+        sort_value = {"dt": sort_value.isoformat()}
+
+    raw = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    (sort value, id) from a cursor; raises ValueError when malformed.
+    """
+
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if isinstance(sort_value, dict):
+        sort_value = datetime.fromisoformat(sort_value["dt"])
+
+    if not isinstance(row_id, int):
+        raise ValueError("Invalid cursor")
+
+    return sort_value, row_id
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+# ==========================================================
+# BACKENDS
+# ==========================================================
+
+class MemoryCacheBackend:
+    """
+    In-process LRU with a TTL. Each worker process has its own copy.
+    """
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Shared cache for multi-worker deployments. `client` is anything
+    with Redis' get / setex / scan_iter / delete (redis.Redis, or a
+    local stand-in such as fakeredis in tests). Values are stored as JSON.
+    """
+
+    def __init__(self, client, ttl=300, prefix="cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+
+        if raw is None:
+            return None
+
+        return json.loads(raw)
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, self.ttl, json.dumps(value, default=str))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class NullCacheBackend:
+    """
+    Caching disabled: every lookup is a miss.
+    """
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def clear(self):
+        pass
+
+
+# ==========================================================
+# CACHE (FLASK EXTENSION STYLE)
+# ==========================================================
+
+class ResultCache:
+    """
+    Named result cache with hit / miss counters.
+
+    Created unbound in extensions.py; init_app() picks the backend from
+    <NAME>_CACHE_BACKEND (memory | redis | none), <NAME>_CACHE_TTL,
+    <NAME>_CACHE_MAX_ENTRIES and REDIS_URL. `backend=` overrides it.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.backend = NullCacheBackend()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, backend=None):
+        prefix = self.name.upper()
+
+        if backend is None:
+            kind = app.config.get(f"{prefix}_CACHE_BACKEND", "memory")
+            ttl = app.config.get(f"{prefix}_CACHE_TTL", 300)
+
+            if kind == "memory":
+                backend = MemoryCacheBackend(
+                    max_entries=app.config.get(f"{prefix}_CACHE_MAX_ENTRIES", 1024),
+                    ttl=ttl
+                )
+            elif kind == "redis":
+                # Optional dependency, only needed for the shared backend
+                import redis
+
+                backend = RedisCacheBackend(
+                    redis.Redis.from_url(app.config["REDIS_URL"]),
+                    ttl=ttl,
+                    prefix=f"{self.name}:"
+                )
+            elif kind == "none":
+                backend = NullCacheBackend()
+            else:
+                raise ValueError(f"Unknown {prefix}_CACHE_BACKEND: {kind}")
+
+        self.backend = backend
+        app.extensions[f"{self.name}_cache"] = self
+
+    @staticmethod
+    def make_key(*parts):
+        """
+        Stable key for JSON-serializable parts (dict order ignored).
+        """
+        raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        value = self.backend.get(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
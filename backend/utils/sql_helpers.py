@@ -0,0 +1,73 @@
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+
+# ==========================================================
+# DIALECT-AWARE "INSERT, SKIP DUPLICATES"
+# ==========================================================
+def insert_skip_duplicates(table, dialect_name, conflict_columns):
+    """
+    Build an INSERT for `table` that silently skips rows violating
+    the unique key made of `conflict_columns`.
+
+    - MySQL / MariaDB : INSERT ... ON DUPLICATE KEY UPDATE id = id
+    - PostgreSQL      : INSERT ... ON CONFLICT (...) DO NOTHING
+    - SQLite          : INSERT ... ON CONFLICT (...) DO NOTHING
+
+    Returns None for dialects without native support, callers
+    must then fall back to row-by-row inserts.
+    """
+
+    if dialect_name in ("mysql", "mariadb"):
+        # No-op update on the primary key: only duplicate keys are
+        # skipped, every other error (bad data, FK) still raises
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({
+            col.name: col for col in table.primary_key.columns
+        })
+
+    if dialect_name == "postgresql":
+        stmt = postgresql.insert(table)
+        return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+    if dialect_name == "sqlite":
+        stmt = sqlite.insert(table)
+        return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+    return None
+
+
+# ==========================================================
+# DIALECT-AWARE "INSERT, OR ADD ONTO EXISTING ROW"
+# ==========================================================
+def upsert_increment(table, dialect_name, conflict_columns, increment_columns):
+    """
+    Build an INSERT for `table` that, when the unique key made of
+    `conflict_columns` already exists, adds the new values of
+    `increment_columns` onto the stored row instead.
+
+    - MySQL / MariaDB : ON DUPLICATE KEY UPDATE col = col + VALUES(col)
+    - PostgreSQL      : ON CONFLICT (...) DO UPDATE SET col = col + excluded.col
+    - SQLite          : ON CONFLICT (...) DO UPDATE SET col = col + excluded.col
+
+    Returns None for dialects without native support.
+    """
+
+    if dialect_name in ("mysql", "mariadb"):
+        stmt = mysql.insert(table)
+        return stmt.on_duplicate_key_update({
+            col: table.c[col] + stmt.inserted[col]
+            for col in increment_columns
+        })
+
+    if dialect_name in ("postgresql", "sqlite"):
+        module = postgresql if dialect_name == "postgresql" else sqlite
+        stmt = module.insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={
+                col: table.c[col] + stmt.excluded[col]
+                for col in increment_columns
+            }
+        )
+
+    return None
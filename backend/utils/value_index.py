@@ -0,0 +1,179 @@
+import re
+from bisect import bisect_left, insort
+
+# ----------------------------------------
+# NORMALIZATION
+# ----------------------------------------
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_value(text):
+    # "Blue  T-Shirt" → "blue t shirt"
+    return _NON_WORD.sub(" ", str(text).lower()).strip()
+
+
+def trigrams(normalized):
+    """
+    Trigrams of each word padded like pg_trgm ("  ab", " abc", ...).
+    """
+
+    grams = set()
+
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    return grams
+
+
+# ----------------------------------------
+# PREFIX + TRIGRAM INDEX
+# ----------------------------------------
+
+class ValueIndex:
+    """
+    In-memory lookup over (dimension, value) pairs, each with a weight
+    (rows carrying the value):
+
+    - complete(): values with a word starting with the typed prefix
+      ("shi" → "Blue Shirt"), via a sorted list of word suffixes
+    - similar(): misspelled names ("gujrat" → "Gujarat"), ranked by
+      shared trigrams (Dice coefficient)
+    - resolve(): the single best value for a name
+
+    Values are only ever added; callers rebuild the index to drop some.
+    """
+
+    def __init__(self, entries=()):
+        self._values = []       # id → (dimension, value)
+        self._normalized = []   # id → normalized value
+        self._weights = []      # id → weight
+        self._gram_counts = []  # id → number of trigrams
+        self._ids = {}          # (dimension, value) → id
+        self._exact = {}        # normalized value → [id]
+        self._prefixes = []     # sorted (word suffix, id)
+        self._postings = {}     # trigram → {id}
+
+        # Bulk load: append the word suffixes, sort them once
+        self._bulk = True
+
+        for dimension, value, weight in entries:
+            self.add(dimension, value, weight)
+
+        self._prefixes.sort()
+        self._bulk = False
+
+    def __len__(self):
+        return len(self._values)
+
+    def add(self, dimension, value, weight=1):
+        existing = self._ids.get((dimension, value))
+
+        if existing is not None:
+            self._weights[existing] += weight
+            return
+
+        normalized = normalize_value(value)
+
+        if not normalized:
+            return
+
+        value_id = len(self._values)
+        grams = trigrams(normalized)
+
+        self._values.append((dimension, value))
+        self._normalized.append(normalized)
+        self._weights.append(weight)
+        self._gram_counts.append(len(grams))
+        self._ids[(dimension, value)] = value_id
+        self._exact.setdefault(normalized, []).append(value_id)
+
+        words = normalized.split()
+        for i in range(len(words)):
+            suffix = (" ".join(words[i:]), value_id)
+
+            if self._bulk:
+                self._prefixes.append(suffix)
+            else:
+                insort(self._prefixes, suffix)
+
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(value_id)
+
+    # ---------------------------------------------------
+    # Lookups → [(dimension, value, score)]
+    # ---------------------------------------------------
+    def _ranked(self, scored, dimension, limit):
+        matches = [
+            (self._values[value_id], score, self._weights[value_id])
+            for value_id, score in scored.items()
+            if dimension is None or self._values[value_id][0] == dimension
+        ]
+
+        # Best score, then most used, then alphabetical
+        matches.sort(key=lambda match: (-match[1], -match[2], match[0][1]))
+
+        return [
+            (value_dimension, value, score)
+            for (value_dimension, value), score, _ in matches[:limit]
+        ]
+
+    def exact(self, text, dimension=None):
+        value_ids = self._exact.get(normalize_value(text), [])
+        return self._ranked(dict.fromkeys(value_ids, 1.0), dimension, len(value_ids))
+
+    def complete(self, prefix, dimension=None, limit=10):
+        prefix = normalize_value(prefix)
+
+        if not prefix:
+            return []
+
+        scored = {}
+        i = bisect_left(self._prefixes, (prefix,))
+
+        while i < len(self._prefixes) and self._prefixes[i][0].startswith(prefix):
+            value_id = self._prefixes[i][1]
+            # Whole-value prefixes rank above word prefixes
+            starts_value = self._prefixes[i][0] == self._normalized[value_id]
+            scored[value_id] = max(scored.get(value_id, 0), 1.0 if starts_value else 0.5)
+            i += 1
+
+        return self._ranked(scored, dimension, limit)
+
+    def similar(self, text, dimension=None, limit=5, min_similarity=0.4):
+        grams = trigrams(normalize_value(text))
+
+        if not grams:
+            return []
+
+        shared = {}
+        for gram in grams:
+            for value_id in self._postings.get(gram, ()):
+                shared[value_id] = shared.get(value_id, 0) + 1
+
+        scored = {}
+        for value_id, count in shared.items():
+            score = 2 * count / (len(grams) + self._gram_counts[value_id])
+            if score >= min_similarity:
+                scored[value_id] = round(score, 3)
+
+        return self._ranked(scored, dimension, limit)
+
+    def resolve(self, text, dimension=None, min_similarity=0.4, prefixes=True):
+        """
+        (dimension, value) best matching `text`: an exact match, else
+        (with `prefixes`) the most used value starting with it, else
+        the most similar one; None when nothing is close enough.
+        """
+
+        for lookup in (
+            lambda: self.exact(text, dimension),
+            lambda: self.complete(text, dimension, limit=1) if prefixes else [],
+            lambda: self.similar(text, dimension, limit=1, min_similarity=min_similarity)
+        ):
+            matches = lookup()
+            if matches:
+                return matches[0][:2]
+
+        return None